@@ -0,0 +1,50 @@
+
+# Simulation Checkpoints for Dynasty Geopolitical Game
+# Long simulations periodically write their full state (countries, groups, rebellions, day
+# counter and RNG state) to a compressed snapshot so an interrupted run can be resumed.
+
+import gzip
+import os
+import pickle
+from typing import Any, Dict, Optional
+
+class Snapshot:
+    def __init__(self, kind: str, day: int, days: int, state: Dict[str, Any], rng_state: Any):
+        self.kind = kind  # Which simulation wrote the snapshot
+        self.day = day  # Days already simulated
+        self.days = days  # Length of the whole run
+        self.state = state
+        self.rng_state = rng_state
+
+def save_snapshot(path: str, snapshot: Snapshot) -> None:
+    # Write to a temporary file first so a crash never leaves a truncated snapshot behind
+    temporary_path = f"{path}.tmp"
+    with gzip.open(temporary_path, "wb", compresslevel=6) as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, path)
+
+def load_snapshot(path: str, kind: Optional[str] = None) -> Snapshot:
+    with gzip.open(path, "rb") as f:
+        snapshot = pickle.load(f)
+    if kind is not None and snapshot.kind != kind:
+        raise ValueError(f"{path} holds a {snapshot.kind} snapshot, not {kind}")
+    return snapshot
+
+# Writes a snapshot every `interval` simulated days
+class Checkpointer:
+    def __init__(self, path: str, interval: int):
+        self.path = path
+        self.interval = interval
+        self._last_day: Optional[int] = None
+
+    def due(self, day: int) -> bool:
+        # Fast-forwarding runs skip days, so compare interval buckets rather than exact days
+        if self.interval <= 0:
+            return False
+        if self._last_day is None:
+            self._last_day = day - day % self.interval
+        return day - self._last_day >= self.interval
+
+    def save(self, snapshot: Snapshot) -> None:
+        save_snapshot(self.path, snapshot)
+        self._last_day = snapshot.day
@@ -0,0 +1,38 @@
+
+# Simulation Clock for Dynasty Geopolitical Game
+# Simulations count time in whole days from day 0 instead of reading the wall clock, so
+# rebellion ages and group founding days follow simulated time however fast a run goes.
+
+from datetime import datetime, timedelta
+
+# Calendar date of day 0, only used when a simulation day is shown as a date
+SIMULATION_START = datetime.now()
+
+def simulation_date(day: int) -> datetime:
+    return SIMULATION_START + timedelta(days=day)
+
+# Current simulation day; one clock can be shared by several simulations of the same world
+class SimulationClock:
+    __slots__ = ("day",)
+
+    def __init__(self, day: int = 0):
+        self.day = day
+
+    def tick(self, days: int = 1) -> int:
+        self.day += days
+        return self.day
+
+    def advance_to(self, day: int) -> None:
+        if day < self.day:
+            raise ValueError(f"Cannot move the clock back from day {self.day} to day {day}")
+        self.day = day
+
+    def age(self, since_day: int) -> int:
+        return self.day - since_day
+
+    @property
+    def date(self) -> datetime:
+        return simulation_date(self.day)
+
+    def __repr__(self):
+        return f"SimulationClock(day={self.day})"
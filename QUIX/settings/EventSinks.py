@@ -0,0 +1,104 @@
+
+# Event Sinks for Dynasty Geopolitical Game
+# Simulations hand their event records to a sink instead of printing them directly.
+# Records provide __slots__ for their fields, to_dict() for serialization and __str__ for text.
+
+import json
+import sys
+from typing import Any, Callable, Dict, IO, List, Optional, Union
+
+class EventSink:
+    def emit(self, event: Any) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'EventSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+# Discards everything; simulations skip building event records entirely for this sink
+class NullSink(EventSink):
+    def emit(self, event: Any) -> None:
+        pass
+
+# Writes the text form of every event, buffered to keep terminal I/O out of the hot loop
+class PrintSink(EventSink):
+    def __init__(self, stream: Optional[IO[str]] = None, buffer_size: int = 1024):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._lines: List[str] = []
+
+    def emit(self, event: Any) -> None:
+        self.write_line(str(event))
+
+    def write_line(self, line: str) -> None:
+        self._lines.append(line)
+        if len(self._lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+            stream.flush()
+
+# Writes one compact JSON object per event
+class JsonLinesSink(EventSink):
+    def __init__(self, target: Union[str, IO[str]], buffer_size: int = 4096):
+        self._owns_file = isinstance(target, str)
+        self.file = open(target, "a", encoding="utf-8") if self._owns_file else target
+        self.buffer_size = buffer_size
+        self._lines: List[str] = []
+
+    def emit(self, event: Any) -> None:
+        self._lines.append(json.dumps(event.to_dict(), separators=(",", ":")))
+        if len(self._lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            self.file.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+            self.file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns_file:
+            self.file.close()
+
+# Collects events in memory as one list per field
+class ColumnarSink(EventSink):
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {}
+
+    def emit(self, event: Any) -> None:
+        columns = self.columns
+        if not columns:
+            for field in type(event).__slots__:
+                columns[field] = []
+        for field, column in columns.items():
+            column.append(getattr(event, field))
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def column(self, name: str) -> List[Any]:
+        return self.columns.get(name, [])
+
+    def rows(self) -> List[Dict[str, Any]]:
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+# Callable that forwards records to the sink, or None when nothing should be recorded
+def emitter(sink: Optional[EventSink]) -> Optional[Callable[[Any], None]]:
+    if sink is None or isinstance(sink, NullSink):
+        return None
+    return sink.emit
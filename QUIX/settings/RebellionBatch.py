@@ -0,0 +1,54 @@
+
+# Batch Rebellion Generation for Dynasty Geopolitical Game
+# Creates many rebels and rebellions at once from vectorized draws instead of several scalar
+# random calls per leader. Leaders keep name indices, so name strings are only built on display.
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from Rebellions import (FIRST_NAMES, IDEOLOGY_TYPES, LAST_NAMES, REBELLION_TRIGGERS,
+                        Country, Rebel, Rebellion, daily_rebellion_chance)
+
+def create_rebels(count: int, rng: np.random.Generator) -> List[Rebel]:
+    first_names = rng.integers(0, len(FIRST_NAMES), size=count).tolist()
+    last_names = rng.integers(0, len(LAST_NAMES), size=count).tolist()
+    ideologies = rng.integers(0, len(IDEOLOGY_TYPES), size=count).tolist()
+    charisma = rng.integers(1, 101, size=count).tolist()
+    military_exp = rng.integers(1, 101, size=count).tolist()
+    return [Rebel(None, IDEOLOGY_TYPES[ideology], leader_charisma, leader_exp, first_name, last_name)
+            for first_name, last_name, ideology, leader_charisma, leader_exp
+            in zip(first_names, last_names, ideologies, charisma, military_exp)]
+
+# One rebellion per entry of `countries`; repeat a country to start several rebellions there.
+# Strength follows calculate_rebellion_strength.
+def create_rebellions(countries: Sequence[Country], rng: np.random.Generator, day: int = 0) -> List[Rebellion]:
+    count = len(countries)
+    if not count:
+        return []
+    leaders = create_rebels(count, rng)
+    base_strength = rng.integers(10, 51, size=count)
+    triggers = rng.integers(0, len(REBELLION_TRIGGERS), size=count).tolist()
+
+    leader_factor = np.array([(leader.charisma + leader.military_exp) / 2 for leader in leaders])
+    country_weakness = 100 - np.array([country.stability for country in countries], dtype=float)
+    strengths = (base_strength * (1 + leader_factor / 100) * (1 + country_weakness / 100)).astype(np.int64).tolist()
+
+    return [Rebellion(leader.ideology, leader, strength, REBELLION_TRIGGERS[trigger], day)
+            for leader, strength, trigger in zip(leaders, strengths, triggers)]
+
+# Daily new-rebellion check for many countries at once, with the chances of check_rebellion_chance.
+# New rebellions are added to their country's active set; returns them by position in `countries`.
+def spawn_rebellions(countries: Sequence[Country], rng: np.random.Generator, day: int = 0) -> Dict[int, Rebellion]:
+    if not countries:
+        return {}
+    stability = np.array([country.stability for country in countries], dtype=float)
+    daily_chance = daily_rebellion_chance(stability)
+    positions = np.flatnonzero(rng.random(len(countries)) < daily_chance).tolist()
+
+    rebellions = create_rebellions([countries[position] for position in positions], rng, day)
+    started = {}
+    for position, rebellion in zip(positions, rebellions):
+        countries[position].active_rebellions.append(rebellion)
+        started[position] = rebellion
+    return started
@@ -0,0 +1,201 @@
+
+# Rebellion Event Log for Dynasty Geopolitical Game
+# Stores rebellion events as typed columns instead of formatted strings, with per-value indexes
+# for filtered and grouped queries. Messages are only rendered when they are asked for.
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from Rebellions import (FIRST_NAMES, IDEOLOGY_TYPES, LAST_NAMES, REBELLION_TRIGGERS, Country, Rebellion,
+                        resolved_message, started_message)
+
+# Event kinds
+STARTED = 0
+RESOLVED = 1
+EVENT_KINDS = ["started", "resolved"]
+
+# Outcomes; events of rebellions that have not been resolved yet are pending
+PENDING = -1
+CRUSHED = 0
+SUCCEEDED = 1
+OUTCOMES = {PENDING: "pending", CRUSHED: "crushed", SUCCEEDED: "succeeded"}
+
+DAYS_PER_YEAR = 365
+
+# Columns with a per-value index of the rows that hold each value
+INDEXED_COLUMNS = ("kind", "country", "ideology", "trigger", "outcome")
+
+# Names stored once and referred to by id
+class _NameTable:
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for name in names:
+            self.id(name)
+
+    def id(self, name: str) -> int:
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def __getitem__(self, name_id: int) -> str:
+        return self.names[name_id]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+class RebellionLog:
+    # Events must be recorded in day order, which lets day ranges be found by bisection
+    def __init__(self):
+        self.kind = array("b")
+        self.day = array("l")
+        self.country = array("l")
+        self.ideology = array("h")
+        self.trigger = array("h")
+        self.strength = array("l")
+        self.outcome = array("b")
+        self.first_name = array("b")  # Index into FIRST_NAMES, -1 for explicitly named leaders
+        self.last_name = array("b")
+        self.countries = _NameTable()
+        self.ideologies = _NameTable(IDEOLOGY_TYPES)
+        self.triggers = _NameTable(REBELLION_TRIGGERS)
+        self._leader_names: Dict[int, str] = {}  # Rows whose leader has an explicit name
+        self._indexes: Dict[str, Dict[int, array]] = {column: {} for column in INDEXED_COLUMNS}
+
+    def record_started(self, day: int, country: Country, rebellion: Rebellion) -> None:
+        self._append(STARTED, day, country, rebellion, PENDING)
+
+    def record_resolved(self, day: int, country: Country, rebellion: Rebellion, success: bool) -> None:
+        self._append(RESOLVED, day, country, rebellion, SUCCEEDED if success else CRUSHED)
+
+    def _append(self, kind: int, day: int, country: Country, rebellion: Rebellion, outcome: int) -> None:
+        if self.day and day < self.day[-1]:
+            raise ValueError(f"Event on day {day} recorded after day {self.day[-1]}")
+        row = len(self.day)
+        leader = rebellion.leader
+        values = {
+            "kind": kind,
+            "country": self.countries.id(country.name),
+            "ideology": self.ideologies.id(rebellion.ideology),
+            "trigger": self.triggers.id(rebellion.trigger),
+            "outcome": outcome,
+        }
+        for column, value in values.items():
+            getattr(self, column).append(value)
+            postings = self._indexes[column].get(value)
+            if postings is None:
+                postings = self._indexes[column][value] = array("l")
+            postings.append(row)
+        self.day.append(day)
+        self.strength.append(rebellion.strength)
+        self.first_name.append(leader.first_name)
+        self.last_name.append(leader.last_name)
+        if leader.first_name < 0:
+            self._leader_names[row] = leader.name
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def _value_id(self, column: str, value: Union[int, str]) -> Optional[int]:
+        # Country, ideology and trigger filters take names; unknown names match nothing
+        if not isinstance(value, str):
+            return value
+        table = {"country": self.countries, "ideology": self.ideologies, "trigger": self.triggers}.get(column)
+        if table is None:
+            raise ValueError(f"{column} cannot be filtered by name")
+        return table.ids.get(value)
+
+    # Rows matching every given filter, in day order. Day bounds are inclusive.
+    def select(self, kind: Optional[int] = None, country: Union[int, str, None] = None,
+               ideology: Union[int, str, None] = None, trigger: Union[int, str, None] = None,
+               outcome: Optional[int] = None, first_day: Optional[int] = None,
+               last_day: Optional[int] = None) -> List[int]:
+        start = 0 if first_day is None else bisect_left(self.day, first_day)
+        end = len(self.day) if last_day is None else bisect_right(self.day, last_day)
+
+        filters = []
+        for column, value in (("kind", kind), ("country", country), ("ideology", ideology),
+                              ("trigger", trigger), ("outcome", outcome)):
+            if value is None:
+                continue
+            value_id = self._value_id(column, value)
+            postings = self._indexes[column].get(value_id) if value_id is not None else None
+            if postings is None:
+                return []
+            filters.append((len(postings), column, value_id, postings))
+        if not filters:
+            return list(range(start, end))
+
+        # Walk the shortest index within the day range and check the other filters per row
+        filters.sort(key=lambda entry: entry[0])
+        _, _, _, postings = filters[0]
+        checks = [(getattr(self, column), value_id) for _, column, value_id, _ in filters[1:]]
+        rows = postings[bisect_left(postings, start):bisect_left(postings, end)]
+        if not checks:
+            return rows.tolist()
+        return [row for row in rows if all(values[row] == value_id for values, value_id in checks)]
+
+    def count(self, **filters) -> int:
+        return len(self.select(**filters))
+
+    # Number of matching events per value of `by` (kind, country, ideology, trigger, outcome or day)
+    def group_counts(self, by: str, **filters) -> Dict[Union[str, int], int]:
+        values = getattr(self, by)
+        counts = Counter(values[row] for row in self.select(**filters))
+        return {self._label(by, value): count for value, count in counts.most_common()}
+
+    def _label(self, column: str, value: int) -> Union[str, int]:
+        if column == "kind":
+            return EVENT_KINDS[value]
+        if column == "outcome":
+            return OUTCOMES[value]
+        if column == "country":
+            return self.countries[value]
+        if column == "ideology":
+            return self.ideologies[value]
+        if column == "trigger":
+            return self.triggers[value]
+        return value
+
+    def leader_name(self, row: int) -> str:
+        name = self._leader_names.get(row)
+        if name is not None:
+            return name
+        return f"{FIRST_NAMES[self.first_name[row]]} {LAST_NAMES[self.last_name[row]]}"
+
+    # Message of one event, identical to what update_rebellions returns without a log
+    def render(self, row: int) -> str:
+        ideology = self.ideologies[self.ideology[row]]
+        if self.kind[row] == STARTED:
+            return started_message(ideology, self.countries[self.country[row]], self.leader_name(row),
+                                   self.triggers[self.trigger[row]])
+        return resolved_message(ideology, self.leader_name(row), self.outcome[row] == SUCCEEDED)
+
+    def messages(self, rows: Optional[Sequence[int]] = None) -> Iterator[str]:
+        for row in (rows if rows is not None else range(len(self))):
+            yield self.render(row)
+
+# Example usage
+if __name__ == "__main__":
+    import random
+    from Rebellions import update_rebellions
+
+    rng = random.Random(11)
+    world = [Country(f"Country {i}", stability=60, military_strength=60) for i in range(20)]
+    log = RebellionLog()
+    for day in range(100 * DAYS_PER_YEAR):
+        for country in world:
+            update_rebellions(country, rng, day, log)
+
+    years = {"first_day": 50 * DAYS_PER_YEAR, "last_day": 81 * DAYS_PER_YEAR - 1}
+    print(f"Recorded {len(log)} events")
+    print("Fascist rebellions triggered by an Economic Crisis that succeeded in years 50-80:",
+          log.count(kind=RESOLVED, ideology="Fascist", trigger="Economic Crisis", outcome=SUCCEEDED, **years))
+    print("Successful rebellions by ideology in years 50-80:",
+          log.group_counts("ideology", outcome=SUCCEEDED, **years))
+    for message in log.messages(log.select(country="Country 0")[:3]):
+        print(message)
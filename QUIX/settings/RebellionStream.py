@@ -0,0 +1,179 @@
+
+# Streaming Rebellion Simulation for Dynasty Geopolitical Game
+# Long-horizon counterpart of simulate_country: events are yielded or sent to a sink as they
+# happen and only rolling aggregates are kept, so memory stays flat however many days are run.
+
+import random
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from Checkpoint import Checkpointer, Snapshot, load_snapshot
+from Clock import SimulationClock
+from EventSinks import EventSink, emitter
+from Rebellions import Country, Rebel, Rebellion, resolved_message, started_message, update_rebellions
+
+# Event kinds
+REBELLION_STARTED = "rebellion_started"
+REBELLION_CRUSHED = "rebellion_crushed"
+REBELLION_SUCCEEDED = "rebellion_succeeded"
+
+class RebellionEvent:
+    __slots__ = ("kind", "day", "country", "ideology", "trigger", "leader", "strength")
+
+    def __init__(self, kind: str, day: int, country: str, rebellion: Rebellion):
+        self.kind = kind
+        self.day = day
+        self.country = country
+        self.ideology = rebellion.ideology
+        self.trigger = rebellion.trigger
+        self.leader: Rebel = rebellion.leader  # Name is only built when the event is shown
+        self.strength = rebellion.strength
+
+    def to_dict(self) -> Dict:
+        record = {field: getattr(self, field) for field in self.__slots__}
+        record["leader"] = self.leader.name
+        return record
+
+    def __str__(self):
+        if self.kind == REBELLION_STARTED:
+            return started_message(self.ideology, self.country, self.leader.name, self.trigger)
+        return resolved_message(self.ideology, self.leader.name, self.kind == REBELLION_SUCCEEDED)
+
+# Rolling aggregates of a run; every part has a fixed upper size
+class RebellionSummary:
+    def __init__(self, resolution: int = 512, recent: int = 100):
+        self.days = 0
+        self.started: Dict[str, int] = {}
+        self.crushed: Dict[str, int] = {}
+        self.succeeded: Dict[str, int] = {}
+        # Mean stability per bucket of `bucket_days` days. When the series outgrows the resolution,
+        # neighbouring buckets are merged and the bucket length doubles.
+        self.resolution = resolution
+        self.bucket_days = 1
+        self.stability_series: List[float] = []
+        self._bucket_total = 0.0
+        self._bucket_count = 0
+        self.min_stability: Optional[float] = None
+        self.max_stability: Optional[float] = None
+        self.recent_events: Deque[RebellionEvent] = deque(maxlen=recent)
+
+    def add_event(self, event: RebellionEvent) -> None:
+        counts = self.started if event.kind == REBELLION_STARTED else (
+            self.succeeded if event.kind == REBELLION_SUCCEEDED else self.crushed)
+        counts[event.ideology] = counts.get(event.ideology, 0) + 1
+        self.recent_events.append(event)
+
+    def observe_day(self, stability: float) -> None:
+        self.days += 1
+        if self.min_stability is None or stability < self.min_stability:
+            self.min_stability = stability
+        if self.max_stability is None or stability > self.max_stability:
+            self.max_stability = stability
+        self._bucket_total += stability
+        self._bucket_count += 1
+        if self._bucket_count == self.bucket_days:
+            self.stability_series.append(self._bucket_total / self._bucket_count)
+            self._bucket_total = 0.0
+            self._bucket_count = 0
+            if len(self.stability_series) > self.resolution:
+                self._halve_series()
+
+    def _halve_series(self) -> None:
+        series = self.stability_series
+        merged = [(series[i] + series[i + 1]) / 2 for i in range(0, len(series) - 1, 2)]
+        if len(series) % 2:
+            # The odd bucket out becomes the partial first half of the next, longer bucket
+            self._bucket_total = series[-1] * self.bucket_days
+            self._bucket_count = self.bucket_days
+        self.stability_series = merged
+        self.bucket_days *= 2
+
+    def success_rate(self, ideology: Optional[str] = None) -> float:
+        if ideology is None:
+            succeeded = sum(self.succeeded.values())
+            resolved = succeeded + sum(self.crushed.values())
+        else:
+            succeeded = self.succeeded.get(ideology, 0)
+            resolved = succeeded + self.crushed.get(ideology, 0)
+        return succeeded / resolved if resolved else 0.0
+
+    def __str__(self):
+        return (f"{self.days} days - Rebellions started: {sum(self.started.values())}, "
+                f"succeeded: {sum(self.succeeded.values())}, crushed: {sum(self.crushed.values())}")
+
+# Receives events from update_rebellions (through its log argument) and turns them into records
+class _EventRecorder:
+    def __init__(self, handle: Callable[[RebellionEvent], None]):
+        self.handle = handle
+
+    def record_started(self, day: int, country: Country, rebellion: Rebellion) -> None:
+        self.handle(RebellionEvent(REBELLION_STARTED, day, country.name, rebellion))
+
+    def record_resolved(self, day: int, country: Country, rebellion: Rebellion, success: bool) -> None:
+        self.handle(RebellionEvent(REBELLION_SUCCEEDED if success else REBELLION_CRUSHED, day, country.name, rebellion))
+
+# Generator of the events of a rebellion simulation, day by day, without keeping any of them
+def iter_country_events(country: Country, days: int, rng: Optional[random.Random] = None,
+                        clock: Optional[SimulationClock] = None) -> Iterator[RebellionEvent]:
+    rng = rng or random
+    clock = clock or SimulationClock()
+    pending: List[RebellionEvent] = []
+    recorder = _EventRecorder(pending.append)
+    while clock.day < days:
+        update_rebellions(country, rng, clock.day, recorder)
+        clock.tick()
+        if pending:
+            yield from pending
+            pending.clear()
+
+# Memory-bounded simulate_country: events go to the sink (if any) and into the summary's aggregates.
+# Runs from the clock's current day (day 0 without a clock) until the clock reaches `days`.
+def stream_country(country: Country, days: int, rng: Optional[random.Random] = None,
+                   sink: Optional[EventSink] = None, summary: Optional[RebellionSummary] = None,
+                   checkpoint: Optional[Checkpointer] = None,
+                   clock: Optional[SimulationClock] = None) -> RebellionSummary:
+    rng = rng or random
+    clock = clock or SimulationClock()
+    summary = summary or RebellionSummary()
+    emit = emitter(sink)
+    if emit is None:
+        recorder = _EventRecorder(summary.add_event)
+    else:
+        def handle(event: RebellionEvent) -> None:
+            summary.add_event(event)
+            emit(event)
+        recorder = _EventRecorder(handle)
+
+    while clock.day < days:
+        update_rebellions(country, rng, clock.day, recorder)
+        summary.observe_day(country.stability)
+        clock.tick()
+        if checkpoint and checkpoint.due(clock.day):
+            if sink is not None:
+                sink.flush()
+            state = {"country": country, "summary": summary}
+            checkpoint.save(Snapshot("rebellion_stream", clock.day, days, state, rng.getstate()))
+    if sink is not None:
+        sink.flush()
+    return summary
+
+# Continue a stream_country run from its last checkpoint
+def resume_stream(path: str, sink: Optional[EventSink] = None,
+                  checkpoint: Optional[Checkpointer] = None) -> Tuple[Country, RebellionSummary]:
+    snapshot = load_snapshot(path, "rebellion_stream")
+    rng = random.Random()
+    rng.setstate(snapshot.rng_state)
+    country = snapshot.state["country"]
+    summary = stream_country(country, snapshot.days, rng, sink, snapshot.state["summary"], checkpoint,
+                             SimulationClock(snapshot.day))
+    return country, summary
+
+# Example usage
+if __name__ == "__main__":
+    example_country = Country("Exampleland", stability=70, military_strength=80)
+    result = stream_country(example_country, 1000000, random.Random(3))
+    print(result)
+    print(f"Success rate: {result.success_rate():.1%}")
+    print(f"Stability series: {len(result.stability_series)} points of {result.bucket_days} days")
+    for recent_event in list(result.recent_events)[-3:]:
+        print(f"Day {recent_event.day}: {recent_event}")
@@ -0,0 +1,190 @@
+
+# Rebellion Parameter Sweep for Dynasty Geopolitical Game
+# Evaluates a grid of rebellion tuning constants in one vectorized run. Every grid point replays
+# the same random draws (common random numbers), so differences between points reflect the
+# parameters rather than sampling noise.
+#
+# The model is the one of update_rebellions: each day a new rebellion starts with the daily
+# chance, and every rebellion comes to a head once, after a geometric number of days, where it is
+# either crushed (costing stability) or overthrows the government.
+
+import itertools
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from Rebellions import REBELLION_BASE_CHANCE, RESOLUTION_CHANCE, daily_rebellion_chance
+
+# Tunable constants and their values in Rebellions
+PARAMETERS: Dict[str, float] = {
+    "base_chance": REBELLION_BASE_CHANCE,  # check_rebellion_chance
+    "resolution_chance": RESOLUTION_CHANCE,
+    "min_strength": 10,  # calculate_rebellion_strength base strength range
+    "max_strength": 50,
+    "crush_penalty": 5,  # resolve_rebellion stability loss
+    "growth_days": 365,  # Days for a rebellion to double its strength
+    "stability": 70,  # Starting country
+    "military_strength": 80,
+}
+
+class SweepResult:
+    def __init__(self, points: List[Dict[str, float]], runs: int, days: int, started: np.ndarray,
+                 succeeded: np.ndarray, crushed: np.ndarray, final_stability: np.ndarray):
+        self.points = points
+        self.runs = runs
+        self.days = days
+        # Per point and run
+        self.started = started
+        self.succeeded = succeeded
+        self.crushed = crushed
+        self.final_stability = final_stability
+
+    def overthrow_rate(self) -> np.ndarray:
+        # Share of runs in which at least one rebellion succeeded
+        return (self.succeeded > 0).mean(axis=1)
+
+    def mean_rebellions(self) -> np.ndarray:
+        return self.started.mean(axis=1)
+
+    def mean_successes(self) -> np.ndarray:
+        return self.succeeded.mean(axis=1)
+
+    def mean_crushed(self) -> np.ndarray:
+        return self.crushed.mean(axis=1)
+
+    def mean_final_stability(self) -> np.ndarray:
+        return self.final_stability.mean(axis=1)
+
+    def rows(self) -> List[Dict[str, float]]:
+        columns = {
+            "overthrow_rate": self.overthrow_rate(),
+            "mean_rebellions": self.mean_rebellions(),
+            "mean_successes": self.mean_successes(),
+            "mean_crushed": self.mean_crushed(),
+            "final_stability": self.mean_final_stability(),
+        }
+        return [{**point, **{name: float(values[i]) for name, values in columns.items()}}
+                for i, point in enumerate(self.points)]
+
+    def format_table(self, limit: Optional[int] = None) -> str:
+        rows = self.rows()[:limit]
+        if not rows:
+            return ""
+        names = list(rows[0])
+        lines = ["  ".join(f"{name:>17s}" for name in names)]
+        for row in rows:
+            lines.append("  ".join(f"{row[name]:>17.4g}" for name in names))
+        return "\n".join(lines)
+
+    def __str__(self):
+        return f"Sweep of {len(self.points)} points x {self.runs} runs over {self.days} days"
+
+def grid_points(grid: Dict[str, Sequence[float]]) -> List[Dict[str, float]]:
+    unknown = set(grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    names = list(grid)
+    points = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        point = dict(PARAMETERS)
+        point.update(zip(names, values))
+        points.append(point)
+    return points
+
+# Simulate every grid point `runs` times for `days` days. Run r draws the same uniforms at every
+# point; each day of a run owns the draws of the rebellion that may start that day.
+def sweep(grid: Dict[str, Sequence[float]], days: int = 365, runs: int = 200,
+          seed: Optional[int] = None) -> SweepResult:
+    points = grid_points(grid)
+    if any(not 0 <= point["resolution_chance"] <= 1 for point in points):
+        raise ValueError("resolution_chance must be between 0 and 1")
+    column = {name: np.array([point[name] for point in points], dtype=float)[:, None] for name in PARAMETERS}
+    count = len(points)
+
+    rng = np.random.default_rng(seed)
+    start_draws = rng.random((runs, days))
+    strength_draws = rng.random((runs, days))
+    lifetime_draws = rng.random((runs, days))
+    leader_factor = (rng.integers(1, 101, size=(runs, days)) + rng.integers(1, 101, size=(runs, days))) / 2
+
+    shape = (count, runs)
+    stability = np.broadcast_to(column["stability"], shape).copy()
+    started = np.zeros(shape, dtype=np.int64)
+    succeeded = np.zeros(shape, dtype=np.int64)
+    crushed = np.zeros(shape, dtype=np.int64)
+
+    # Pending rebellions, one slot per concurrent rebellion; grows when a run needs more slots
+    never = np.iinfo(np.int64).max
+    due_day = np.full(shape + (4,), never, dtype=np.int64)
+    start_day = np.zeros(shape + (4,), dtype=np.int64)
+    strength = np.zeros(shape + (4,), dtype=float)
+
+    strength_range = column["max_strength"] - column["min_strength"] + 1
+    # Log of the daily chance to stay unresolved; 0 for points whose rebellions never resolve
+    log_stay = np.log1p(-np.minimum(column["resolution_chance"], 1 - 1e-12))
+
+    for day in range(days):
+        # New rebellions, with the chance of check_rebellion_chance
+        chance = daily_rebellion_chance(stability, column["base_chance"])
+        new = start_draws[:, day] < chance
+        if new.any():
+            lanes = np.nonzero(new)
+            free = due_day[lanes] == never
+            if not free.any(axis=1).all():
+                due_day = np.concatenate([due_day, np.full_like(due_day, never)], axis=2)
+                start_day = np.concatenate([start_day, np.zeros_like(start_day)], axis=2)
+                strength = np.concatenate([strength, np.zeros_like(strength)], axis=2)
+                free = due_day[lanes] == never
+            slot = free.argmax(axis=1)
+            point_index, run_index = lanes
+
+            base = column["min_strength"][point_index, 0] + np.floor(
+                strength_draws[run_index, day] * strength_range[point_index, 0])
+            weakness = 100 - stability[lanes]
+            strength[point_index, run_index, slot] = np.floor(
+                base * (1 + leader_factor[run_index, day] / 100) * (1 + weakness / 100))
+            # Days until the rebellion comes to a head; it can do so on its first day. Waits past the
+            # end of the run are cut short, and a zero resolution chance means it never does.
+            stay = log_stay[point_index, 0]
+            resolves = stay < 0
+            wait = np.divide(np.log1p(-lifetime_draws[run_index, day]), stay, out=np.zeros(len(stay)), where=resolves)
+            wait = np.minimum(np.floor(wait), days).astype(np.int64)
+            due_day[point_index, run_index, slot] = np.where(resolves, day + wait, never)
+            start_day[point_index, run_index, slot] = day
+            started[lanes] += 1
+
+        # Resolutions due today, oldest rebellion first since each one changes stability
+        due = due_day == day
+        while due.any():
+            lanes = np.nonzero(due.any(axis=2))
+            point_index, run_index = lanes
+            slot = np.where(due[lanes], start_day[lanes], never).argmin(axis=1)
+
+            government = column["military_strength"][point_index, 0] * (stability[lanes] / 100)
+            age = day - start_day[point_index, run_index, slot]
+            rebellion = strength[point_index, run_index, slot] * (1 + age / column["growth_days"][point_index, 0])
+            crushed_now = government > rebellion
+            stability[lanes] = np.where(crushed_now,
+                                        np.maximum(stability[lanes] - column["crush_penalty"][point_index, 0], 0),
+                                        stability[lanes])
+            crushed[lanes] += crushed_now
+            succeeded[lanes] += ~crushed_now
+
+            due_day[point_index, run_index, slot] = never
+            due[point_index, run_index, slot] = False
+
+    return SweepResult(points, runs, days, started, succeeded, crushed, stability)
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    result = sweep({
+        "base_chance": np.linspace(0.005, 0.05, 10),
+        "resolution_chance": np.linspace(0.02, 0.2, 10),
+        "crush_penalty": [2, 5, 8, 11, 14],
+        "military_strength": [40, 80],
+    }, days=365, runs=100, seed=1)
+    print(f"{result} in {time.perf_counter() - start:.1f}s")
+    print(result.format_table(limit=10))
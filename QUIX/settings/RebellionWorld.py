@@ -0,0 +1,204 @@
+
+# Sharded World Rebellion Simulation for Dynasty Geopolitical Game
+# Splits the countries of a world into shards that advance update_rebellions in parallel worker
+# processes, each with its own random stream. At every sync point the driver merges the shards'
+# events in simulated-day order and refreshes the per-country stats.
+
+import heapq
+import multiprocessing
+import os
+import random
+import weakref
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import Rebellions
+from Clock import SimulationClock
+from RebellionBatch import spawn_rebellions
+from Rebellions import Country, rebellion_started_message, resolve_active_rebellions
+
+# (simulation day, index of the country in the world, event message)
+WorldEvent = Tuple[int, int, str]
+# (index of the country in the world, stability, active rebellions)
+CountryStats = Tuple[int, int, int]
+
+# Merge key; events of one country on one day keep the order they happened in
+def _event_order(event: WorldEvent) -> Tuple[int, int]:
+    return event[0], event[1]
+
+def shard_seeds(shards: int, seed: Optional[int] = None) -> List[int]:
+    # One independent stream per shard, derived only from the world seed and the shard index
+    children = np.random.SeedSequence(seed).spawn(shards)
+    return [int.from_bytes(child.generate_state(4).tobytes(), "little") for child in children]
+
+# A contiguous block of the world's countries together with the random streams that drive them.
+# New rebellions of the whole shard are generated in one batch per day.
+class _Shard:
+    def __init__(self, first_index: int, countries: List[Country], seed: int):
+        self.first_index = first_index
+        self.countries = countries
+        self.rng = random.Random(seed)
+        self.generator = np.random.default_rng(seed)
+
+    def advance(self, start_day: int, days: int) -> Tuple[List[WorldEvent], List[CountryStats]]:
+        # Day-major, countries in index order, so the events come out sorted by (day, index)
+        events: List[WorldEvent] = []
+        if not Rebellions.Rebelling_Enabled:
+            return events, self.stats()
+        rng = self.rng
+        messages: List[str] = []
+        for day in range(start_day, start_day + days):
+            started = spawn_rebellions(self.countries, self.generator, day)
+            for offset, country in enumerate(self.countries):
+                rebellion = started.get(offset)
+                if rebellion is not None:
+                    messages.append(rebellion_started_message(country, rebellion))
+                resolve_active_rebellions(country, rng, day, messages)
+                if messages:
+                    index = self.first_index + offset
+                    events.extend((day, index, message) for message in messages)
+                    messages.clear()
+        return events, self.stats()
+
+    def stats(self) -> List[CountryStats]:
+        return [(self.first_index + offset, country.stability, len(country.active_rebellions))
+                for offset, country in enumerate(self.countries)]
+
+# Worker process loop; the shard stays in the process between sync points
+def _shard_worker(connection, shard: _Shard) -> None:
+    try:
+        while True:
+            command, *args = connection.recv()
+            if command == "advance":
+                connection.send(shard.advance(*args))
+            elif command == "shard":
+                connection.send(shard)
+            elif command == "stop":
+                break
+    finally:
+        connection.close()
+
+def _stop_workers(connections: list, workers: list) -> None:
+    for connection in connections:
+        connection.send(("stop",))
+        connection.close()
+    for worker in workers:
+        worker.join()
+    connections.clear()
+    workers.clear()
+
+class RebellionWorld:
+    # Results depend only on the countries, the seed and the shard count, not on timing or processes.
+    # Worker processes are started by the first run and stopped by close(), or when the world is
+    # garbage collected; closing brings the shards back, so a later run restarts them where they were.
+    def __init__(self, countries: Sequence[Country], shards: Optional[int] = None, seed: Optional[int] = None,
+                 processes: bool = True):
+        self._countries = list(countries)
+        shards = max(1, min(shards or os.cpu_count() or 1, len(self._countries)))
+        self.clock = SimulationClock()
+        self.stability = [country.stability for country in self._countries]
+        self.active_rebellions = [len(country.active_rebellions) for country in self._countries]
+
+        bounds = np.linspace(0, len(self._countries), shards + 1).astype(int)
+        self._shards = [_Shard(int(start), self._countries[start:end], shard_seed)
+                        for start, end, shard_seed in zip(bounds[:-1], bounds[1:], shard_seeds(shards, seed))]
+        self._processes = processes and shards > 1
+        self._connections = []
+        self._workers = []
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def _start_workers(self) -> None:
+        for shard in self._shards:
+            parent_end, child_end = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_shard_worker, args=(child_end, shard), daemon=True)
+            worker.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._workers.append(worker)
+        self._finalizer = weakref.finalize(self, _stop_workers, self._connections, self._workers)
+
+    def _fetch_shards(self) -> List[_Shard]:
+        for connection in self._connections:
+            connection.send(("shard",))
+        return [connection.recv() for connection in self._connections]
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def day(self) -> int:
+        return self.clock.day
+
+    # Advance the whole world by `days`, syncing the shards every `sync_interval` days.
+    # Events are passed to on_event in (day, country index) order as each sync completes.
+    def run(self, days: int, sync_interval: int = 30,
+            on_event: Optional[Callable[[WorldEvent], None]] = None) -> List[WorldEvent]:
+        events: List[WorldEvent] = []
+        end_day = self.clock.day + days
+        while self.clock.day < end_day:
+            step = min(sync_interval, end_day - self.clock.day)
+            shard_events = self._advance_shards(self.clock.day, step)
+            for event in heapq.merge(*shard_events, key=_event_order):
+                events.append(event)
+                if on_event:
+                    on_event(event)
+            self.clock.tick(step)
+        return events
+
+    def _advance_shards(self, start_day: int, days: int) -> List[List[WorldEvent]]:
+        if self._processes and not self._connections:
+            self._start_workers()
+        if self._connections:
+            for connection in self._connections:
+                connection.send(("advance", start_day, days))
+            results = [connection.recv() for connection in self._connections]
+        else:
+            results = [shard.advance(start_day, days) for shard in self._shards]
+
+        for _, stats in results:
+            for index, stability, rebellions in stats:
+                self.stability[index] = stability
+                self.active_rebellions[index] = rebellions
+        return [shard_events for shard_events, _ in results]
+
+    def country_name(self, index: int) -> str:
+        return self._countries[index].name
+
+    def format_event(self, event: WorldEvent) -> str:
+        day, index, message = event
+        return f"Day {day} - {self.country_name(index)}: {message}"
+
+    # Full country objects, fetched back from the worker processes
+    def countries(self) -> List[Country]:
+        shards = self._fetch_shards() if self._connections else self._shards
+        return [country for shard in shards for country in shard.countries]
+
+    def close(self) -> None:
+        if self._connections:
+            self._shards = self._fetch_shards()
+            self._countries = [country for shard in self._shards for country in shard.countries]
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+
+    def __enter__(self) -> 'RebellionWorld':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+# Example usage
+if __name__ == "__main__":
+    world_rng = random.Random(7)
+    world = [Country(f"Country {i}", stability=world_rng.randint(30, 90), military_strength=world_rng.randint(40, 100))
+             for i in range(10000)]
+    with RebellionWorld(world, seed=7) as simulation:
+        world_events = simulation.run(365, sync_interval=30)
+        print(f"Simulated {len(world)} countries in {simulation.shard_count} shards for {simulation.day} days")
+        print(f"Events: {len(world_events)}")
+        for world_event in world_events[:5]:
+            print(simulation.format_event(world_event))
+        print(f"Mean stability: {np.mean(simulation.stability):.1f}")
+        print(f"Active rebellions: {sum(simulation.active_rebellions)}")
@@ -2,9 +2,14 @@
 # Rebellions Module for Dynasty Geopolitical Game
 # This module handles the generation and management of rebellions within a country
 
+import heapq
+import math
 import random
-from typing import List, Dict, Tuple
-from datetime import datetime, timedelta
+from typing import List, Dict, Tuple, Optional, Iterator
+from datetime import datetime
+
+from Checkpoint import Checkpointer, Snapshot, load_snapshot
+from Clock import SimulationClock, simulation_date
 
 # Configuration
 Rebelling_Enabled = True  # Set to False to disable rebellions
@@ -21,108 +26,314 @@ REBELLION_TRIGGERS = [
     "Technological Disruption", "Climate Change", "Corruption Scandal"
 ]
 
+FIRST_NAMES = ["John", "Emma", "Liu", "Mohammed", "Olga", "Carlos", "Fatima", "Raj", "Yuki", "Kwame"]
+LAST_NAMES = ["Smith", "Zhang", "Patel", "Müller", "Garcia", "Nguyen", "Kim", "Okafor", "Silva", "Tanaka"]
+
+RESOLUTION_CHANCE = 0.1  # Daily chance that a rebellion comes to a head
+REBELLION_BASE_CHANCE = 0.01  # Daily chance of a new rebellion in a fully stable country
+
+# Event messages, also used by RebellionLog and RebellionStream to render structured events on
+# demand. f-strings rather than str.format templates, since messages are built on the daily path.
+def started_message(ideology: str, country: str, leader: str, trigger: str) -> str:
+    return f"A new {ideology} rebellion has started in {country}, led by {leader}. Trigger: {trigger}"
+
+def resolved_message(ideology: str, leader: str, success: bool) -> str:
+    if success:
+        return f"The {ideology} rebellion led by {leader} has succeeded. The government has been overthrown."
+    return f"The {ideology} rebellion led by {leader} has been crushed."
+
+# Generated leaders keep indices into FIRST_NAMES and LAST_NAMES; the name string is only
+# built when it is read
 class Rebel:
-    def __init__(self, name: str, ideology: str, charisma: int, military_exp: int):
-        self.name = name
+    __slots__ = ("_name", "first_name", "last_name", "ideology", "charisma", "military_exp")
+
+    def __init__(self, name: Optional[str], ideology: str, charisma: int, military_exp: int,
+                 first_name: int = -1, last_name: int = -1):
+        self._name = name
+        self.first_name = first_name
+        self.last_name = last_name
         self.ideology = ideology
         self.charisma = charisma
         self.military_exp = military_exp
 
+    @property
+    def name(self) -> str:
+        if self._name is not None:
+            return self._name
+        return f"{FIRST_NAMES[self.first_name]} {LAST_NAMES[self.last_name]}"
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
 class Rebellion:
-    def __init__(self, ideology: str, leader: Rebel, strength: int, trigger: str):
+    def __init__(self, ideology: str, leader: Rebel, strength: int, trigger: str, start_day: int = 0):
         self.ideology = ideology
         self.leader = leader
         self.strength = strength
         self.trigger = trigger
-        self.start_date = datetime.now()
+        self.start_day = start_day  # Simulation day the rebellion broke out
         self.active = True
 
+    @property
+    def start_date(self) -> datetime:
+        return simulation_date(self.start_day)
+
+# Ongoing rebellions of a country, resolved in one batched pass per day.
+# A list subclass, so the common checks (empty, length, iteration) cost no Python-level calls.
+class ActiveRebellions(list):
+    __slots__ = ()
+
+    def discard(self, rebellions: List[Rebellion]) -> None:
+        # Remove several rebellions in one pass, keeping the order of the rest
+        removed = {id(rebellion) for rebellion in rebellions}
+        self[:] = [rebellion for rebellion in self if id(rebellion) not in removed]
+
+    def take_resolving(self, rng: random.Random, chance: float = RESOLUTION_CHANCE) -> List[Rebellion]:
+        # Roll every rebellion once, then take the selected ones out.
+        # Order is kept, since resolutions change the country and are applied in list order.
+        roll = rng.random
+        resolving = []
+        for rebellion in self:
+            if roll() < chance:
+                resolving.append(rebellion)
+        if not resolving:
+            return resolving
+        if len(resolving) == len(self):
+            self.clear()
+        elif len(resolving) <= 8:
+            # A few removals only shift the tail, which is cheaper than rebuilding the list
+            for rebellion in resolving:
+                self.remove(rebellion)
+        else:
+            self.discard(resolving)
+        return resolving
+
 class Country:
     def __init__(self, name: str, stability: int, military_strength: int):
         self.name = name
         self.stability = stability
         self.military_strength = military_strength
-        self.active_rebellions: List[Rebellion] = []
+        self.active_rebellions: List[Rebellion] = ActiveRebellions()
 
-def generate_rebel_name() -> str:
-    first_names = ["John", "Emma", "Liu", "Mohammed", "Olga", "Carlos", "Fatima", "Raj", "Yuki", "Kwame"]
-    last_names = ["Smith", "Zhang", "Patel", "Müller", "Garcia", "Nguyen", "Kim", "Okafor", "Silva", "Tanaka"]
-    return f"{random.choice(first_names)} {random.choice(last_names)}"
+def generate_rebel_name(rng: Optional[random.Random] = None) -> str:
+    rng = rng or random
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
 
-def create_rebel() -> Rebel:
+def create_rebel(rng: Optional[random.Random] = None) -> Rebel:
+    rng = rng or random
+    first_name = rng.randrange(len(FIRST_NAMES))
+    last_name = rng.randrange(len(LAST_NAMES))
     return Rebel(
-        name=generate_rebel_name(),
-        ideology=random.choice(IDEOLOGY_TYPES),
-        charisma=random.randint(1, 100),
-        military_exp=random.randint(1, 100)
+        name=None,
+        ideology=rng.choice(IDEOLOGY_TYPES),
+        charisma=rng.randint(1, 100),
+        military_exp=rng.randint(1, 100),
+        first_name=first_name,
+        last_name=last_name
     )
 
-def calculate_rebellion_strength(leader: Rebel, country: Country) -> int:
-    base_strength = random.randint(10, 50)
+def calculate_rebellion_strength(leader: Rebel, country: Country, rng: Optional[random.Random] = None) -> int:
+    base_strength = (rng or random).randint(10, 50)
     leader_factor = (leader.charisma + leader.military_exp) / 2
     country_weakness = 100 - country.stability
     
     return int(base_strength * (1 + leader_factor / 100) * (1 + country_weakness / 100))
 
-def create_rebellion(country: Country) -> Rebellion:
-    leader = create_rebel()
-    strength = calculate_rebellion_strength(leader, country)
-    trigger = random.choice(REBELLION_TRIGGERS)
+def create_rebellion(country: Country, rng: Optional[random.Random] = None, day: int = 0) -> Rebellion:
+    rng = rng or random
+    leader = create_rebel(rng)
+    strength = calculate_rebellion_strength(leader, country, rng)
+    trigger = rng.choice(REBELLION_TRIGGERS)
     
-    return Rebellion(leader.ideology, leader, strength, trigger)
+    return Rebellion(leader.ideology, leader, strength, trigger, day)
 
-def check_rebellion_chance(country: Country) -> bool:
-    base_chance = 0.01  # 1% daily chance
-    stability_factor = 1 - (country.stability / 100)
-    daily_chance = base_chance * (1 + stability_factor)
-    
-    return random.random() < daily_chance
+# Daily chance of a new rebellion; `stability` may be a number or a numpy array of them.
+# Instability raises the base chance by up to 100%.
+def daily_rebellion_chance(stability, base_chance: float = REBELLION_BASE_CHANCE):
+    stability_factor = 1 - (stability / 100)
+    return base_chance * (1 + stability_factor)
+
+def rebellion_chance(country: Country) -> float:
+    return daily_rebellion_chance(country.stability)
 
-def resolve_rebellion(rebellion: Rebellion, country: Country) -> Tuple[bool, str]:
+def check_rebellion_chance(country: Country, rng: Optional[random.Random] = None) -> bool:
+    return (rng or random).random() < rebellion_chance(country)
+
+# Rebellions grow stronger the longer they last; `day` is the current simulation day.
+# A crushed rebellion still costs the country stability.
+def rebellion_succeeds(rebellion: Rebellion, country: Country, day: int = 0) -> bool:
     government_strength = country.military_strength * (country.stability / 100)
-    rebellion_strength = rebellion.strength * (1 + (datetime.now() - rebellion.start_date).days / 365)
+    rebellion_strength = rebellion.strength * (1 + (day - rebellion.start_day) / 365)
     
     if government_strength > rebellion_strength:
         country.stability = max(country.stability - 5, 0)
-        return False, f"The {rebellion.ideology} rebellion led by {rebellion.leader.name} has been crushed."
-    else:
-        new_ideology = rebellion.ideology
-        return True, f"The {rebellion.ideology} rebellion led by {rebellion.leader.name} has succeeded. The government has been overthrown."
+        return False
+    return True
 
-def update_rebellions(country: Country) -> List[str]:
+def resolve_rebellion(rebellion: Rebellion, country: Country, day: int = 0) -> Tuple[bool, str]:
+    success = rebellion_succeeds(rebellion, country, day)
+    return success, rebellion_resolved_message(rebellion, success)
+
+# With a log the events are recorded there as structured rows and no messages are returned
+def update_rebellions(country: Country, rng: Optional[random.Random] = None, day: int = 0,
+                      log: Optional['RebellionLog'] = None) -> List[str]:
     if not Rebelling_Enabled:
         return []
 
+    rng = rng or random
     events = []
 
     # Check for new rebellions
-    if check_rebellion_chance(country):
-        new_rebellion = create_rebellion(country)
+    if rng.random() < daily_rebellion_chance(country.stability):
+        new_rebellion = create_rebellion(country, rng, day)
         country.active_rebellions.append(new_rebellion)
-        events.append(f"A new {new_rebellion.ideology} rebellion has started in {country.name}, led by {new_rebellion.leader.name}. Trigger: {new_rebellion.trigger}")
-
-    # Resolve ongoing rebellions
-    for rebellion in country.active_rebellions:
-        if random.random() < 0.1:  # 10% daily chance of resolution attempt
-            success, message = resolve_rebellion(rebellion, country)
-            events.append(message)
-            if success:
-                country.active_rebellions.remove(rebellion)
-                # Implement government change logic here
-            else:
-                rebellion.active = False
-                country.active_rebellions.remove(rebellion)
+        _report_started(day, country, new_rebellion, events, log)
 
+    if country.active_rebellions:
+        resolve_active_rebellions(country, rng, day, events, log)
     return events
 
-def simulate_country(country: Country, days: int) -> List[str]:
-    all_events = []
-    for _ in range(days):
-        daily_events = update_rebellions(country)
-        all_events.extend(daily_events)
-    
+def _report_started(day: int, country: Country, rebellion: Rebellion, events: List[str],
+                    log: Optional['RebellionLog']) -> None:
+    if log is not None:
+        log.record_started(day, country, rebellion)
+    else:
+        events.append(started_message(rebellion.ideology, country.name, rebellion.leader.name, rebellion.trigger))
+
+def _report_resolved(day: int, country: Country, rebellion: Rebellion, success: bool, events: List[str],
+                     log: Optional['RebellionLog']) -> None:
+    if log is not None:
+        log.record_resolved(day, country, rebellion, success)
+    else:
+        events.append(resolved_message(rebellion.ideology, rebellion.leader.name, success))
+    if not success:
+        rebellion.active = False
+    # Implement government change logic here for successful rebellions
+
+def rebellion_started_message(country: Country, rebellion: Rebellion) -> str:
+    return started_message(rebellion.ideology, country.name, rebellion.leader.name, rebellion.trigger)
+
+def rebellion_resolved_message(rebellion: Rebellion, success: bool) -> str:
+    return resolved_message(rebellion.ideology, rebellion.leader.name, success)
+
+# Resolve ongoing rebellions; every one that comes to a head leaves the active set
+def resolve_active_rebellions(country: Country, rng: random.Random, day: int, events: List[str],
+                              log: Optional['RebellionLog'] = None) -> None:
+    for rebellion in country.active_rebellions.take_resolving(rng):
+        success = rebellion_succeeds(rebellion, country, day)
+        _report_resolved(day, country, rebellion, success, events, log)
+
+# Number of daily trials with chance p up to and including the first success
+def _geometric(rng: random.Random, p: float) -> int:
+    if p >= 1.0:
+        return 1
+    return int(math.log(1.0 - rng.random()) / math.log(1.0 - p)) + 1
+
+# Queued resolution attempts and the next new-rebellion day of an event-driven run
+class _RebellionSchedule:
+    def __init__(self):
+        self.attempts: List[Tuple[int, int, Rebellion]] = []  # (attempt day, order of arrival, rebellion)
+        self.next_rebellion_day: Optional[int] = None
+        self._arrivals = 0
+
+    def schedule_attempt(self, rebellion: Rebellion, day: int, rng: random.Random) -> None:
+        # A rebellion can come to a head on the day it is scheduled from
+        attempt_day = day + _geometric(rng, RESOLUTION_CHANCE) - 1
+        heapq.heappush(self.attempts, (attempt_day, self._arrivals, rebellion))
+        self._arrivals += 1
+
+# Event-driven counterpart of the daily loop. Each rebellion's resolution attempt day is drawn
+# ahead of time and queued; the next new-rebellion day is drawn from the daily chance and redrawn
+# whenever stability changes. Only days on which something happens are processed, with the same
+# outcome distribution as the daily loop. Yields after each processed day.
+def _event_driven_rebellions(country: Country, days: int, rng: random.Random, clock: SimulationClock,
+                             events: List[str], log: Optional['RebellionLog'],
+                             schedule: _RebellionSchedule) -> Iterator[None]:
+    if schedule.next_rebellion_day is None:
+        for rebellion in country.active_rebellions:
+            schedule.schedule_attempt(rebellion, clock.day, rng)
+        schedule.next_rebellion_day = clock.day + _geometric(rng, rebellion_chance(country)) - 1
+
+    attempts = schedule.attempts
+    while True:
+        day = schedule.next_rebellion_day
+        if attempts and attempts[0][0] < day:
+            day = attempts[0][0]
+        if day >= days:
+            break
+
+        stability = country.stability
+        if day == schedule.next_rebellion_day:
+            new_rebellion = create_rebellion(country, rng, day)
+            country.active_rebellions.append(new_rebellion)
+            _report_started(day, country, new_rebellion, events, log)
+            schedule.schedule_attempt(new_rebellion, day, rng)
+            schedule.next_rebellion_day = day + _geometric(rng, rebellion_chance(country))
+
+        # Same-day attempts resolve in the order the rebellions arrived, as in the daily loop
+        resolved = []
+        while attempts and attempts[0][0] == day:
+            _, _, rebellion = heapq.heappop(attempts)
+            success = rebellion_succeeds(rebellion, country, day)
+            _report_resolved(day, country, rebellion, success, events, log)
+            resolved.append(rebellion)
+        if resolved:
+            country.active_rebellions.discard(resolved)
+        if country.stability != stability:
+            schedule.next_rebellion_day = day + _geometric(rng, rebellion_chance(country))
+
+        clock.advance_to(day + 1)
+        yield
+    clock.advance_to(max(clock.day, days))
+
+# Runs from the clock's current day (day 0 without a clock) until the clock reaches `days`
+# With a log the events are recorded there instead of being returned as messages.
+# event_driven jumps between new rebellions and resolution attempts instead of stepping every day;
+# it samples the same distribution of outcomes but not the same random sequence.
+# With a checkpointer the country, the events so far and the RNG state are saved periodically
+def simulate_country(country: Country, days: int, rng: Optional[random.Random] = None,
+                     checkpoint: Optional[Checkpointer] = None, clock: Optional[SimulationClock] = None,
+                     all_events: Optional[List[str]] = None, log: Optional['RebellionLog'] = None,
+                     event_driven: bool = False, schedule: Optional[_RebellionSchedule] = None) -> List[str]:
+    rng = rng or random
+    clock = clock or SimulationClock()
+    all_events = all_events if all_events is not None else []
+    if event_driven or schedule is not None:
+        if not Rebelling_Enabled:
+            return all_events
+        schedule = schedule or _RebellionSchedule()
+        for _ in _event_driven_rebellions(country, days, rng, clock, all_events, log, schedule):
+            if checkpoint and checkpoint.due(clock.day):
+                state = {"country": country, "events": all_events, "log": log, "schedule": schedule}
+                checkpoint.save(Snapshot("rebellions", clock.day, days, state, rng.getstate()))
+        return all_events
+
+    # The daily loop is the unrest engine with only the rebellion half; imported here since
+    # Unrest itself builds on this module. A plain import, as a from-import costs a lookup
+    # through the import machinery on every call.
+    import Unrest
+
+    def save(day: int):
+        state = {"country": country, "events": all_events, "log": log}
+        checkpoint.save(Snapshot("rebellions", day, days, state, rng.getstate()))
+    Unrest.run_unrest(days, rng, clock, rebellion_country=country, events=all_events, log=log,
+                      checkpoint=checkpoint, on_checkpoint=save)
     return all_events
 
+# Continue a simulate_country run from its last checkpoint
+# Returns the country, the event messages and the event log (None for runs without a log)
+def resume_country(path: str, checkpoint: Optional[Checkpointer] = None
+                   ) -> Tuple[Country, List[str], Optional['RebellionLog']]:
+    snapshot = load_snapshot(path, "rebellions")
+    rng = random.Random()
+    rng.setstate(snapshot.rng_state)
+    country = snapshot.state["country"]
+    log = snapshot.state.get("log")
+    events = simulate_country(country, snapshot.days, rng, checkpoint, SimulationClock(snapshot.day),
+                              snapshot.state["events"], log, schedule=snapshot.state.get("schedule"))
+    return country, events, log
+
 # Example usage
 if __name__ == "__main__":
     example_country = Country("Exampleland", stability=70, military_strength=80)
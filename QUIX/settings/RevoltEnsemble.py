@@ -0,0 +1,93 @@
+
+# Monte Carlo Ensemble Runner for Dynasty Geopolitical Game
+# Repeats run_revolt_simulation many times across a process pool and aggregates the outcomes
+
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Revolts import Country, initialize_revolt_system, advance_revolt_day
+
+# Outcome of a single run: day of the first revolution (None if the government held),
+# final government type and final stability
+RunOutcome = Tuple[Optional[int], str, float]
+
+class EnsembleResult:
+    def __init__(self, outcomes: Sequence[RunOutcome]):
+        self.runs = len(outcomes)
+        self.first_revolution_days: List[Optional[int]] = [outcome[0] for outcome in outcomes]
+        self.government_counts: Dict[str, int] = dict(Counter(outcome[1] for outcome in outcomes))
+        self.final_stabilities = np.array([outcome[2] for outcome in outcomes])
+
+    def revolution_probability(self) -> float:
+        # Share of runs in which the government fell at least once
+        fallen = sum(1 for day in self.first_revolution_days if day is not None)
+        return fallen / self.runs if self.runs else 0.0
+
+    def time_to_first_revolution(self, percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[float, float]:
+        days = [day for day in self.first_revolution_days if day is not None]
+        if not days:
+            return {}
+        return dict(zip(percentiles, np.percentile(days, percentiles).tolist()))
+
+    def government_frequencies(self) -> Dict[str, float]:
+        return {government: count / self.runs for government, count in self.government_counts.items()}
+
+    def stability_percentiles(self, percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[float, float]:
+        if not self.runs:
+            return {}
+        return dict(zip(percentiles, np.percentile(self.final_stabilities, percentiles).tolist()))
+
+    def __str__(self):
+        return f"Ensemble of {self.runs} runs - Revolution probability: {self.revolution_probability():.2%}"
+
+def run_seeds(runs: int, seed: Optional[int] = None) -> List[int]:
+    # One independent seed per run, derived only from the ensemble seed and the run index
+    children = np.random.SeedSequence(seed).spawn(runs)
+    return [int.from_bytes(child.generate_state(4).tobytes(), "little") for child in children]
+
+def _run_single(args: Tuple[int, str, int, float, int]) -> RunOutcome:
+    seed, country_name, population, initial_stability, simulation_days = args
+    rng = random.Random(seed)
+    country = Country(country_name, population, initial_stability)
+    initialize_revolt_system(country, rng)
+
+    first_revolution = None
+    for day in range(simulation_days):
+        overthrown_by = advance_revolt_day(country, rng, day=day)
+        if overthrown_by is not None and first_revolution is None:
+            first_revolution = day
+    return first_revolution, country.government_type, country.stability
+
+# Run N independently seeded simulations, spread over a pool of worker processes
+def run_revolt_ensemble(country_name: str, population: int, initial_stability: float, simulation_days: int,
+                        runs: int, seed: Optional[int] = None, workers: Optional[int] = None) -> EnsembleResult:
+    tasks = [(run_seed, country_name, population, initial_stability, simulation_days)
+             for run_seed in run_seeds(runs, seed)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or runs < 2:
+        outcomes = [_run_single(task) for task in tasks]
+    else:
+        chunksize = max(1, runs // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_run_single, tasks, chunksize=chunksize))
+    return EnsembleResult(outcomes)
+
+# Example usage
+if __name__ == "__main__":
+    result = run_revolt_ensemble("Exampleland", 10000000, 0.7, 365, runs=500, seed=2024)
+    print(result)
+    print("Time to first revolution (days):")
+    for percentile, day in result.time_to_first_revolution().items():
+        print(f"  p{percentile:g}: {day:.1f}")
+    print("Final government types:")
+    for government, frequency in sorted(result.government_frequencies().items(), key=lambda item: -item[1]):
+        print(f"  {government}: {frequency:.1%}")
+    print("Final stability:")
+    for percentile, stability in result.stability_percentiles().items():
+        print(f"  p{percentile:g}: {stability:.3f}")
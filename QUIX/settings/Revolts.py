@@ -4,37 +4,233 @@
 # Global flag to enable/disable revolts
 Revolts_Enabled = True
 
+import heapq
+import math
 import random
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+import sys
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import datetime
+from itertools import accumulate
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Callable
+
+from Checkpoint import Checkpointer, Snapshot, load_snapshot
+from Clock import SimulationClock, simulation_date
+from EventSinks import EventSink, PrintSink, emitter
 
 # Ideology class to represent different revolutionary ideologies
+# Ideologies are registered once and referenced by their index; strings are interned
 class Ideology:
+    __slots__ = ("name", "description", "popularity", "index")
+
     def __init__(self, name: str, description: str, popularity: float):
-        self.name = name
-        self.description = description
+        self.name = sys.intern(name)
+        self.description = sys.intern(description)
         self.popularity = popularity  # 0.0 to 1.0
+        self.index = -1  # Position in the ideology registry, -1 until registered
 
     def __str__(self):
         return f"{self.name} - {self.description}"
 
 # Revolutionary group class
+# Slotted to keep millions of live groups small: the ideology is a registry index, the
+# founding date an integer simulation day, and generated names are only built when read.
 class RevolutionaryGroup:
-    def __init__(self, name: str, ideology: Ideology, strength: float):
-        self.name = name
-        self.ideology = ideology
-        self.strength = strength  # 0.0 to 1.0
-        self.members = random.randint(100, 10000)
-        self.founded_date = datetime.now() - timedelta(days=random.randint(30, 3650))
+    __slots__ = ("_name", "_suffix", "_ideology", "_strength", "members", "founded_day", "_store", "_key")
+
+    def __init__(self, name: Optional[str], ideology: Ideology, strength: float,
+                 members: Optional[int] = None, founded_day: Optional[int] = None, suffix: int = -1):
+        self._name = name
+        self._suffix = suffix  # Index into GROUP_NAME_SUFFIXES for generated names
+        self._ideology = register_ideology(ideology)
+        self._store: Optional['GroupStore'] = None
+        self._key = -1
+        self._strength = strength  # 0.0 to 1.0
+        self.members = members if members is not None else random.randint(100, 10000)
+        self.founded_day = founded_day if founded_day is not None else -random.randint(30, 3650)
+
+    @property
+    def name(self) -> str:
+        if self._name is not None:
+            return self._name
+        return f"{ideologies[self._ideology].name}ist {GROUP_NAME_SUFFIXES[self._suffix]}"
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def custom_name(self) -> Optional[str]:
+        # Name given explicitly, None for groups with a generated name
+        return self._name
+
+    @property
+    def ideology(self) -> Ideology:
+        return ideologies[self._ideology]
+
+    @ideology.setter
+    def ideology(self, value: Ideology):
+        self._ideology = register_ideology(value)
 
-    def recruit_members(self):
-        new_members = random.randint(10, 500)
+    @property
+    def ideology_index(self) -> int:
+        return self._ideology
+
+    @property
+    def suffix_index(self) -> int:
+        return self._suffix
+
+    @property
+    def founded_date(self) -> datetime:
+        return simulation_date(self.founded_day)
+
+    @property
+    def strength(self) -> float:
+        return self._strength
+
+    @strength.setter
+    def strength(self, value: float):
+        old = self._strength
+        self._strength = value
+        if self._store is not None and value != old:
+            self._store.strength_changed(self, old, value)
+
+    def recruit_members(self, rng: Optional[random.Random] = None):
+        new_members = (rng or random).randint(10, 500)
         self.members += new_members
         self.strength = min(1.0, self.strength + (new_members / 10000))
 
     def __str__(self):
         return f"{self.name} ({self.ideology.name}) - Strength: {self.strength:.2f}, Members: {self.members}"
 
+# Indexed store of a country's revolutionary groups
+# Keeps a running strength total and a max-heap of group strengths, so the revolt risk
+# and the strongest group are available without scanning every group. Groups report
+# strength changes to their store; outdated heap entries are skipped lazily.
+class GroupStore:
+    def __init__(self, groups: Iterable[RevolutionaryGroup] = ()):
+        self._groups: Dict[int, RevolutionaryGroup] = {}
+        self._heap: List[Tuple[float, int, RevolutionaryGroup]] = []
+        self._next_key = 0
+        self.total_strength = 0.0
+        for group in groups:
+            self.add(group)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __iter__(self) -> Iterator[RevolutionaryGroup]:
+        return iter(self._groups.values())
+
+    def __contains__(self, group: RevolutionaryGroup) -> bool:
+        return group._store is self
+
+    def add(self, group: RevolutionaryGroup):
+        if group._store is not None:
+            group._store.remove(group)
+        group._store = self
+        group._key = self._next_key
+        self._next_key += 1
+        self._groups[group._key] = group
+        self.total_strength += group.strength
+        heapq.heappush(self._heap, (-group.strength, group._key, group))
+
+    def remove(self, group: RevolutionaryGroup):
+        if group._store is not self:
+            raise ValueError(f"{group.name} does not belong to this country")
+        del self._groups[group._key]
+        group._store = None
+        if self._groups:
+            self.total_strength -= group.strength
+        else:
+            self.total_strength = 0.0
+            self._heap.clear()
+
+    def clear(self):
+        for group in self._groups.values():
+            group._store = None
+        self._groups.clear()
+        self._heap.clear()
+        self.total_strength = 0.0
+
+    def strength_changed(self, group: RevolutionaryGroup, old: float, new: float):
+        self.total_strength += new - old
+        heapq.heappush(self._heap, (-new, group._key, group))
+        if len(self._heap) > 2 * len(self._groups) + 32:
+            self._rebuild()
+
+    def _rebuild(self):
+        # Drop outdated heap entries and resynchronise the running total
+        self._heap = [(-group.strength, key, group) for key, group in self._groups.items()]
+        heapq.heapify(self._heap)
+        self.total_strength = math.fsum(group.strength for group in self._groups.values())
+
+    def strongest(self) -> Optional[RevolutionaryGroup]:
+        # Ties go to the earliest added group, like max() over the group list
+        heap = self._heap
+        while heap:
+            negative_strength, key, group = heap[0]
+            if self._groups.get(key) is group and group.strength == -negative_strength:
+                return group
+            heapq.heappop(heap)
+        return None
+
+    def mean_strength(self) -> float:
+        return self.total_strength / len(self._groups) if self._groups else 0.0
+
+    def recruit(self, new_members: List[int]):
+        # Members recruited by every group, in iteration order; the heap and total are rebuilt once
+        heap = []
+        for (key, group), members in zip(self._groups.items(), new_members):
+            group.members += members
+            strength = group._strength = min(1.0, group._strength + members / 10000)
+            heap.append((-strength, key, group))
+        heapq.heapify(heap)
+        self._heap = heap
+        self.total_strength = -math.fsum([entry[0] for entry in heap])
+
+# List-like view of a country's groups, in the order they were added
+# Mutations go through the store so its strength total and heap stay in step; positional
+# changes such as insert or item assignment are not supported, since the store keeps no positions.
+class GroupsView(Sequence):
+    __slots__ = ("_store",)
+
+    def __init__(self, store: GroupStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __iter__(self) -> Iterator[RevolutionaryGroup]:
+        return iter(self._store)
+
+    def __contains__(self, group) -> bool:
+        return isinstance(group, RevolutionaryGroup) and group in self._store
+
+    def __getitem__(self, index):
+        return list(self._store)[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (GroupsView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, group: RevolutionaryGroup):
+        self._store.add(group)
+
+    def extend(self, groups: Iterable[RevolutionaryGroup]):
+        for group in list(groups):
+            self._store.add(group)
+
+    def remove(self, group: RevolutionaryGroup):
+        self._store.remove(group)
+
+    def clear(self):
+        self._store.clear()
+
 # Country class to represent the user's country
 class Country:
     def __init__(self, name: str, population: int, stability: float):
@@ -42,19 +238,82 @@ class Country:
         self.population = population
         self.stability = stability  # 0.0 to 1.0
         self.government_type = "Democracy"  # Can be changed based on game mechanics
-        self.revolutionary_groups: List[RevolutionaryGroup] = []
+        self.groups = GroupStore()
+
+    @property
+    def revolutionary_groups(self) -> GroupsView:
+        return GroupsView(self.groups)
+
+    @revolutionary_groups.setter
+    def revolutionary_groups(self, groups: Iterable[RevolutionaryGroup]):
+        groups = list(groups)
+        self.groups.clear()
+        for group in groups:
+            self.groups.add(group)
 
     def add_revolutionary_group(self, group: RevolutionaryGroup):
-        self.revolutionary_groups.append(group)
+        self.groups.add(group)
+
+    def remove_revolutionary_group(self, group: RevolutionaryGroup):
+        self.groups.remove(group)
+
+    def strongest_group(self) -> Optional[RevolutionaryGroup]:
+        return self.groups.strongest()
 
     def calculate_revolt_risk(self) -> float:
-        return sum(group.strength for group in self.revolutionary_groups) / len(self.revolutionary_groups)
+        # Average group strength; a country without groups carries no risk
+        return self.groups.mean_strength()
 
     def __str__(self):
         return f"{self.name} - Population: {self.population}, Stability: {self.stability:.2f}"
 
-# List of possible ideologies
-ideologies = [
+# Kinds of events reported by the revolt simulation
+GROUP_FORMED = "group_formed"
+REVOLT = "revolt"
+REVOLUTION = "revolution"
+SUPPRESSION = "suppression"
+
+# Record of a single revolt simulation event
+class RevoltEvent:
+    __slots__ = ("kind", "day", "country", "group", "ideology", "group_strength", "government_strength", "members")
+
+    def __init__(self, kind: str, day: int, country: str, group: RevolutionaryGroup,
+                 government_strength: Optional[float] = None):
+        self.kind = kind
+        self.day = day
+        self.country = country
+        self.group = group.name
+        self.ideology = group.ideology.name
+        self.group_strength = group.strength
+        self.government_strength = government_strength
+        self.members = group.members
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __str__(self):
+        if self.kind == GROUP_FORMED:
+            return (f"New revolutionary group formed: {self.group} ({self.ideology}) - "
+                    f"Strength: {self.group_strength:.2f}, Members: {self.members}")
+        if self.kind == REVOLT:
+            return f"Revolt by {self.group}!"
+        if self.kind == REVOLUTION:
+            return f"The {self.group} has successfully overthrown the government!"
+        return f"The government has suppressed the revolt by {self.group}."
+
+# Callback receiving event records as they happen
+Emit = Optional[Callable[[RevoltEvent], None]]
+
+# Add an ideology to the registry (once) and return its index
+def register_ideology(ideology: Ideology) -> int:
+    if ideology.index < 0:
+        ideology.index = len(ideologies)
+        ideologies.append(ideology)
+    return ideology.index
+
+# Registry of possible ideologies
+ideologies: List[Ideology] = []
+for _ideology in [
     Ideology("Communism", "Advocates for a classless society and common ownership of the means of production", 0.3),
     Ideology("Fascism", "Ultranationalist, authoritarian political ideology", 0.2),
     Ideology("Anarchism", "Believes in the abolition of all government and the organization of society on a voluntary, cooperative basis", 0.1),
@@ -64,79 +323,291 @@ ideologies = [
     Ideology("Socialism", "A political and economic theory of social organization which advocates that the means of production, distribution, and exchange should be owned or regulated by the community as a whole", 0.35),
     Ideology("Oligarchy", "A small group of people having control of a country or organization", 0.2),
     Ideology("Technocracy", "The government or control of society or industry by an elite of technical experts", 0.1),
-]
+]:
+    register_ideology(_ideology)
+del _ideology
+
+# Suffixes used when naming newly formed revolutionary groups
+GROUP_NAME_SUFFIXES = ['Front', 'Movement', 'Party', 'Alliance', 'Coalition']
 
 # Function to generate a new revolutionary group
-def generate_revolutionary_group(country: Country) -> RevolutionaryGroup:
-    ideology = random.choice(ideologies)
-    name = f"{ideology.name}ist {random.choice(['Front', 'Movement', 'Party', 'Alliance', 'Coalition'])}"
-    strength = random.uniform(0.1, 0.5)
-    return RevolutionaryGroup(name, ideology, strength)
+def generate_revolutionary_group(country: Country, rng: Optional[random.Random] = None, day: int = 0) -> RevolutionaryGroup:
+    rng = rng or random
+    ideology = rng.choice(ideologies)
+    suffix = rng.randrange(len(GROUP_NAME_SUFFIXES))
+    strength = rng.uniform(0.1, 0.5)
+    members = rng.randint(100, 10000)
+    founded_day = day - rng.randint(30, 3650)
+    return RevolutionaryGroup(None, ideology, strength, members, founded_day, suffix)
+
+# Function to advance the revolt simulation by a single day
+# Returns the group that overthrew the government that day, if any
+def advance_revolt_day(country: Country, rng: Optional[random.Random] = None, sink: Optional[EventSink] = None,
+                       day: int = 0) -> Optional[RevolutionaryGroup]:
+    return _run_revolt_day(country, rng or random, emitter(sink), day)
+
+def _run_revolt_day(country: Country, rng: random.Random, emit: Emit, day: int) -> Optional[RevolutionaryGroup]:
+    # Simulate daily events
+    for group in country.groups:
+        group.recruit_members(rng)
+    return _finish_revolt_day(country, rng, emit, day, rng.random() < 0.05)  # 5% chance of a new group each day
+
+# The rest of a day once its recruitment is done: group formation, the revolt roll and stability
+# drift. risk_bound thins the revolt roll when the day was picked as a candidate by the
+# fast-forward mode.
+def _finish_revolt_day(country: Country, rng: random.Random, emit: Emit, day: int, form_group: bool,
+                       risk_bound: float = 1.0) -> Optional[RevolutionaryGroup]:
+    # Check for new revolutionary groups
+    if form_group:
+        new_group = generate_revolutionary_group(country, rng, day)
+        country.add_revolutionary_group(new_group)
+        if emit:
+            emit(RevoltEvent(GROUP_FORMED, day, country.name, new_group))
+
+    # Check for revolts
+    revolution = None
+    revolt_risk = country.calculate_revolt_risk()
+    if revolt_risk > 0 and rng.random() < revolt_risk / risk_bound:
+        # Revolt occurs
+        revolting_group = country.strongest_group()
+        government_strength = country.stability * rng.uniform(0.8, 1.2)
+        if emit:
+            emit(RevoltEvent(REVOLT, day, country.name, revolting_group, government_strength))
+
+        # Simulate revolt outcome
+        if revolting_group.strength > government_strength:
+            # Successful revolution
+            if emit:
+                emit(RevoltEvent(REVOLUTION, day, country.name, revolting_group, government_strength))
+            country.government_type = revolting_group.ideology.name
+            country.stability = max(0.1, country.stability - 0.3)
+            country.remove_revolutionary_group(revolting_group)
+            revolution = revolting_group
+        else:
+            # Failed revolt
+            revolting_group.strength *= 0.7
+            if emit:
+                emit(RevoltEvent(SUPPRESSION, day, country.name, revolting_group, government_strength))
+            country.stability = min(1.0, country.stability + 0.1)
+
+    # Update country stability
+    country.stability = max(0.1, min(1.0, country.stability + rng.uniform(-0.05, 0.05)))
+    return revolution
+
+# Number of daily trials up to and including the first success
+def _geometric(rng: random.Random, p: float) -> int:
+    if p >= 1.0:
+        return 1
+    return int(math.log(1.0 - rng.random()) / math.log(1.0 - p)) + 1
+
+# Ways for the daily recruitment above the minimum of 10, 0 to 490, to add up to each total over
+# as many days as the index, and the cumulative distributions sampled by _recruitment_totals
+_recruitment_counts: List[List[int]] = [[1]]
+_recruitment_cdfs: Dict[int, List[float]] = {}
+
+def _recruitment_cdf(days: int) -> List[float]:
+    cdf = _recruitment_cdfs.get(days)
+    if cdf is None:
+        while len(_recruitment_counts) <= days:
+            previous = _recruitment_counts[-1]
+            prefix = [0, *accumulate(previous)]
+            _recruitment_counts.append([prefix[min(total + 1, len(previous))] - prefix[max(0, total - 490)]
+                                        for total in range(len(previous) + 490)])
+        cumulative = list(accumulate(_recruitment_counts[days]))
+        cdf = _recruitment_cdfs[days] = [count / cumulative[-1] for count in cumulative]
+    return cdf
+
+# Total members recruited over several days by each of `groups` groups
+def _recruitment_totals(rng: random.Random, days: int, groups: int) -> List[int]:
+    draw = rng.random
+    if days == 1:
+        return [10 + int(draw() * 491) for _ in range(groups)]  # randint(10, 500) from one random() call
+    if days <= 8:
+        # Exact distribution of the sum of the daily draws, sampled by inversion
+        cdf = _recruitment_cdf(days)
+        return [10 * days + bisect_right(cdf, draw()) for _ in range(groups)]
+    # Sum of many uniform draws, sampled from its normal limit
+    mean = 255 * days
+    deviation = math.sqrt(days * (491 ** 2 - 1) / 12)
+    return [min(500 * days, max(10 * days, round(rng.gauss(mean, deviation)))) for _ in range(groups)]
+
+# Stability after several days of clamped daily drift
+def _stability_drift(rng: random.Random, stability: float, days: int) -> float:
+    if days <= 64:
+        draw = rng.random
+        for _ in range(days):
+            stability = max(0.1, min(1.0, stability - 0.05 + 0.1 * draw()))  # uniform(-0.05, 0.05)
+        return stability
+    # Over many days the clamped walk behaves like a normal walk reflected at 0.1 and 1.0
+    stability += rng.gauss(0.0, math.sqrt(days / 1200))
+    stability = (stability - 0.1) % 1.8
+    return 0.1 + (1.8 - stability if stability > 0.9 else stability)
+
+# Apply `days` days of recruitment, and the stability drift of all but the last `recruit_only`
+# of them, for days known to have no group formation or revolt
+def _skip_revolt_days(country: Country, days: int, rng: random.Random, recruit_only: int = 0):
+    if days <= 0:
+        return
+    groups = country.groups
+    if groups:
+        groups.recruit(_recruitment_totals(rng, days, len(groups)))
+    if days > recruit_only:
+        country.stability = _stability_drift(rng, country.stability, days - recruit_only)
+
+# First day from `day` on, before `horizon`, that is a candidate revolt day, and the risk bound
+# it was drawn against; (horizon, 1.0) when there is none, as a formation day at the horizon rolls
+# with the full risk. Recruitment adds at most 0.05 strength per group per day, so `day + k` has a
+# risk of at most risk + 0.05 * (k + 1). The bound is held constant over blocks of doubling length,
+# [day, day + 1), [day + 1, day + 2), [day + 2, day + 4)..., at its value for the last day of each
+# block, so a whole span costs a handful of draws.
+def _next_revolt_candidate(rng: random.Random, risk: float, day: int, horizon: int) -> Tuple[int, float]:
+    start, end = day, day + 1
+    while start < horizon:
+        end = min(end, horizon)
+        bound = min(1.0, risk + 0.05 * (end - day))
+        candidate = start + _geometric(rng, bound) - 1
+        if candidate < end:
+            return candidate, bound
+        start, end = end, day + 2 * (end - day)
+    return horizon, 1.0
+
+# Event-skipping counterpart of the daily loop. The next group-formation day is drawn from a
+# geometric distribution; revolts are found by thinning: candidate days up to the next formation
+# are drawn against an upper bound of the revolt risk and accepted with probability risk / bound.
+# The days before an event day, and the event day's own recruitment, are applied in one aggregated
+# step, so the cost of a run follows its events rather than its days. Yields (days simulated, next
+# formation day) after every processed event day; the pair together with the RNG state is enough
+# to resume the run.
+def _fast_forward_revolts(country: Country, days: int, rng: random.Random, emit: Emit,
+                          day: int = 0, next_formation: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    if next_formation is None:
+        next_formation = day + _geometric(rng, 0.05) - 1
+    while day < days:
+        horizon = min(next_formation, days)
+        if country.groups:
+            candidate, bound = _next_revolt_candidate(rng, country.calculate_revolt_risk(), day, horizon)
+        else:
+            candidate, bound = horizon, 1.0  # Nothing can revolt until the next group forms
+        if candidate == days:
+            _skip_revolt_days(country, days - day, rng)
+            break
+
+        forming = candidate == next_formation
+        _skip_revolt_days(country, candidate - day + 1, rng, recruit_only=1)
+        _finish_revolt_day(country, rng, emit, candidate, forming, bound)
+        if forming:
+            next_formation = candidate + _geometric(rng, 0.05)
+        day = candidate + 1
+        yield day, next_formation
+
+# Generator of the events of a revolt simulation, in the order they happen
+def iter_revolt_events(country: Country, days: int, rng: Optional[random.Random] = None,
+                       fast_forward: bool = False) -> Iterator[RevoltEvent]:
+    if not Revolts_Enabled:
+        return
+    rng = rng or random
+    pending: List[RevoltEvent] = []
+    if fast_forward:
+        for _ in _fast_forward_revolts(country, days, rng, pending.append):
+            yield from pending
+            pending.clear()
+        return
+
+    for day in range(days):
+        _run_revolt_day(country, rng, pending.append, day)
+        if pending:
+            yield from pending
+            pending.clear()
 
 # Function to simulate revolts and revolutions
-def simulate_revolts(country: Country, days: int):
+# Events go to the given sink, printed to stdout by default; pass a NullSink to skip them entirely.
+# fast_forward jumps between group formations and revolts instead of stepping every day;
+# it samples the same distribution of outcomes but not the same random sequence.
+# Runs from the clock's current day (day 0 without a clock) until the clock reaches `days`.
+# With a checkpointer the full run state is saved periodically; see resume_revolts.
+def simulate_revolts(country: Country, days: int, rng: Optional[random.Random] = None,
+                     sink: Optional[EventSink] = None, fast_forward: bool = False,
+                     checkpoint: Optional[Checkpointer] = None, clock: Optional[SimulationClock] = None,
+                     next_formation: Optional[int] = None):
+    sink = sink if sink is not None else PrintSink()
     if not Revolts_Enabled:
-        print("Revolts are currently disabled.")
+        if isinstance(sink, PrintSink):
+            sink.write_line("Revolts are currently disabled.")
+            sink.flush()
         return
 
-    for _ in range(days):
-        # Simulate daily events
-        for group in country.revolutionary_groups:
-            group.recruit_members()
-
-        # Check for new revolutionary groups
-        if random.random() < 0.05:  # 5% chance each day
-            new_group = generate_revolutionary_group(country)
-            country.add_revolutionary_group(new_group)
-            print(f"New revolutionary group formed: {new_group}")
-
-        # Check for revolts
-        revolt_risk = country.calculate_revolt_risk()
-        if random.random() < revolt_risk:
-            # Revolt occurs
-            revolting_group = max(country.revolutionary_groups, key=lambda g: g.strength)
-            print(f"Revolt by {revolting_group.name}!")
-            
-            # Simulate revolt outcome
-            government_strength = country.stability * random.uniform(0.8, 1.2)
-            if revolting_group.strength > government_strength:
-                # Successful revolution
-                print(f"The {revolting_group.name} has successfully overthrown the government!")
-                country.government_type = revolting_group.ideology.name
-                country.stability = max(0.1, country.stability - 0.3)
-                country.revolutionary_groups = [g for g in country.revolutionary_groups if g != revolting_group]
-            else:
-                # Failed revolt
-                print(f"The government has suppressed the revolt by {revolting_group.name}.")
-                revolting_group.strength *= 0.7
-                country.stability = min(1.0, country.stability + 0.1)
-
-        # Update country stability
-        country.stability = max(0.1, min(1.0, country.stability + random.uniform(-0.05, 0.05)))
+    rng = rng or random
+    clock = clock or SimulationClock()
+    emit = emitter(sink)
+    if fast_forward:
+        for day, next_formation in _fast_forward_revolts(country, days, rng, emit, clock.day, next_formation):
+            clock.advance_to(day)
+            if checkpoint and checkpoint.due(day):
+                sink.flush()
+                _save_revolt_checkpoint(checkpoint, country, day, days, rng, next_formation)
+        clock.advance_to(max(clock.day, days))
+    else:
+        # The daily loop is the unrest engine with only the revolt half; imported here since
+        # Unrest itself builds on this module. A plain import, as a from-import costs a lookup
+        # through the import machinery on every call.
+        import Unrest
+
+        def save(day: int):
+            sink.flush()
+            _save_revolt_checkpoint(checkpoint, country, day, days, rng)
+        Unrest.run_unrest(days, rng, clock, revolt_country=country, emit=emit, checkpoint=checkpoint,
+                          on_checkpoint=save)
+    sink.flush()
+
+def _save_revolt_checkpoint(checkpoint: Checkpointer, country: Country, day: int, days: int,
+                            rng: random.Random, next_formation: Optional[int] = None):
+    state = {"country": country, "fast_forward": next_formation is not None, "next_formation": next_formation}
+    checkpoint.save(Snapshot("revolts", day, days, state, rng.getstate()))
+
+# Continue a simulate_revolts run from its last checkpoint. The resumed run draws the same random
+# numbers as an uninterrupted one, so it ends in exactly the same state.
+def resume_revolts(path: str, sink: Optional[EventSink] = None,
+                   checkpoint: Optional[Checkpointer] = None) -> Country:
+    snapshot = load_snapshot(path, "revolts")
+    state = snapshot.state
+    rng = random.Random()
+    rng.setstate(snapshot.rng_state)
+    simulate_revolts(state["country"], snapshot.days, rng, sink, state["fast_forward"], checkpoint,
+                     SimulationClock(snapshot.day), state["next_formation"])
+    return state["country"]
 
 # Function to initialize the revolt system for a country
-def initialize_revolt_system(country: Country):
-    num_initial_groups = random.randint(2, 5)
+def initialize_revolt_system(country: Country, rng: Optional[random.Random] = None):
+    rng = rng or random
+    num_initial_groups = rng.randint(2, 5)
     for _ in range(num_initial_groups):
-        country.add_revolutionary_group(generate_revolutionary_group(country))
+        country.add_revolutionary_group(generate_revolutionary_group(country, rng))
 
 # Main function to run the revolt simulation
-def run_revolt_simulation(country_name: str, population: int, initial_stability: float, simulation_days: int):
+# With the default sink the initial and final state are reported along with the events
+def run_revolt_simulation(country_name: str, population: int, initial_stability: float, simulation_days: int,
+                          sink: Optional[EventSink] = None, rng: Optional[random.Random] = None) -> Country:
     country = Country(country_name, population, initial_stability)
-    initialize_revolt_system(country)
+    initialize_revolt_system(country, rng)
 
-    print(f"Initial state of {country}")
-    print("Initial revolutionary groups:")
-    for group in country.revolutionary_groups:
-        print(f"- {group}")
+    report = sink is None
+    sink = sink if sink is not None else PrintSink()
+    if report:
+        sink.write_line(f"Initial state of {country}")
+        sink.write_line("Initial revolutionary groups:")
+        for group in country.groups:
+            sink.write_line(f"- {group}")
+        sink.write_line(f"\nSimulating {simulation_days} days of potential revolts and revolutions...")
 
-    print(f"\nSimulating {simulation_days} days of potential revolts and revolutions...")
-    simulate_revolts(country, simulation_days)
+    simulate_revolts(country, simulation_days, rng, sink)
 
-    print(f"\nFinal state of {country}")
-    print("Final revolutionary groups:")
-    for group in country.revolutionary_groups:
-        print(f"- {group}")
+    if report:
+        sink.write_line(f"\nFinal state of {country}")
+        sink.write_line("Final revolutionary groups:")
+        for group in country.groups:
+            sink.write_line(f"- {group}")
+        sink.flush()
+    return country
 
 # Example usage
 if __name__ == "__main__":
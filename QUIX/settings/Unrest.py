@@ -0,0 +1,116 @@
+
+# Unrest Engine for Dynasty Geopolitical Game
+# Advances the revolutionary groups of Revolts and the rebellions of Rebellions for a country in
+# one daily pass over shared state: a single stability value and a single random stream.
+# simulate_revolts and simulate_country run on this engine with only their own half enabled.
+
+import random
+from typing import Callable, List, Optional, Tuple, Union
+
+import Revolts
+from Checkpoint import Checkpointer, Snapshot, load_snapshot
+from Clock import SimulationClock
+from EventSinks import EventSink, PrintSink, emitter
+from RebellionLog import RebellionLog
+from Rebellions import ActiveRebellions, Country as RebellionCountry, update_rebellions
+from Revolts import Country as RevoltCountry, Emit, _run_revolt_day
+
+# A country with both revolutionary groups and rebellions. Stability is kept once, on the
+# 0.0 to 1.0 scale of Revolts; Rebellions works on it through rebellion_view.
+class UnrestCountry(RevoltCountry):
+    def __init__(self, name: str, population: int, stability: float, military_strength: int):
+        super().__init__(name, population, stability)
+        self.military_strength = military_strength
+        self.active_rebellions = ActiveRebellions()
+        self.rebellion_view = RebellionView(self)
+
+# The country as the Rebellions functions see it, with stability on their 0 to 100 scale
+class RebellionView:
+    __slots__ = ("country",)
+
+    def __init__(self, country: UnrestCountry):
+        self.country = country
+
+    @property
+    def name(self) -> str:
+        return self.country.name
+
+    @property
+    def military_strength(self) -> int:
+        return self.country.military_strength
+
+    @property
+    def active_rebellions(self) -> ActiveRebellions:
+        return self.country.active_rebellions
+
+    @property
+    def stability(self) -> float:
+        return self.country.stability * 100
+
+    @stability.setter
+    def stability(self, value: float):
+        self.country.stability = value / 100
+
+# Run both halves day by day until the clock reaches `days`; either half can be left out.
+# Revolt events go to `emit`, rebellion messages to `events` (or to `log` when given).
+# on_checkpoint(day) is called whenever the checkpointer is due.
+def run_unrest(days: int, rng: random.Random, clock: SimulationClock,
+               revolt_country: Optional[RevoltCountry] = None, emit: Emit = None,
+               rebellion_country: Union[RebellionCountry, RebellionView, None] = None,
+               events: Optional[List[str]] = None, log: Optional[RebellionLog] = None,
+               checkpoint: Optional[Checkpointer] = None,
+               on_checkpoint: Optional[Callable[[int], None]] = None) -> None:
+    events = events if events is not None else []
+    due = checkpoint.due if checkpoint else None
+    for day in range(clock.day, days):
+        if revolt_country is not None:
+            _run_revolt_day(revolt_country, rng, emit, day)
+        if rebellion_country is not None:
+            events.extend(update_rebellions(rebellion_country, rng, day, log))
+        clock.day = day + 1  # Same as clock.tick(), without a method call on every day
+        if due is not None and due(day + 1):
+            on_checkpoint(day + 1)
+
+# Simulate revolts and rebellions of a country together. Revolt events go to the sink (printed by
+# default); rebellion messages are returned, or recorded in the log when one is given.
+def simulate_unrest(country: UnrestCountry, days: int, rng: Optional[random.Random] = None,
+                    sink: Optional[EventSink] = None, log: Optional[RebellionLog] = None,
+                    checkpoint: Optional[Checkpointer] = None,
+                    clock: Optional[SimulationClock] = None,
+                    events: Optional[List[str]] = None) -> List[str]:
+    rng = rng or random
+    clock = clock or SimulationClock()
+    sink = sink if sink is not None else PrintSink()
+    events = events if events is not None else []
+    revolt_country = country if Revolts.Revolts_Enabled else None
+
+    def save(day: int) -> None:
+        sink.flush()
+        state = {"country": country, "events": events, "log": log}
+        checkpoint.save(Snapshot("unrest", day, days, state, rng.getstate()))
+
+    run_unrest(days, rng, clock, revolt_country, emitter(sink), country.rebellion_view, events, log,
+               checkpoint, save)
+    sink.flush()
+    return events
+
+# Continue a simulate_unrest run from its last checkpoint
+def resume_unrest(path: str, sink: Optional[EventSink] = None,
+                  checkpoint: Optional[Checkpointer] = None) -> Tuple[UnrestCountry, List[str]]:
+    snapshot = load_snapshot(path, "unrest")
+    rng = random.Random()
+    rng.setstate(snapshot.rng_state)
+    state = snapshot.state
+    events = simulate_unrest(state["country"], snapshot.days, rng, sink, state["log"], checkpoint,
+                             SimulationClock(snapshot.day), state["events"])
+    return state["country"], events
+
+# Example usage
+if __name__ == "__main__":
+    example_country = UnrestCountry("Exampleland", 10000000, 0.7, military_strength=80)
+    Revolts.initialize_revolt_system(example_country)
+    rebellion_events = simulate_unrest(example_country, 365)
+    for rebellion_event in rebellion_events:
+        print(rebellion_event)
+    print(f"\nFinal state of {example_country}")
+    print(f"Active rebellions: {len(example_country.active_rebellions)}")
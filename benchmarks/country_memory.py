@@ -0,0 +1,101 @@
+# Memory benchmark for countries
+# Compares bytes per country for the original dict-based layout and the slotted one, standalone
+# and as part of an economy.
+# Usage: python benchmarks/country_memory.py [country_count]
+
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "customs"))
+
+from CustomCountries import Country
+from Diplomacy import Diplomacy
+from Economy import Economy
+
+RESOURCES = ["oil", "gold", "iron", "grain", "timber", "uranium"]
+
+# Layout of the class before it was slotted, kept here as the baseline
+class LegacyCountry:
+    def __init__(self, name: str, capital: str, population: int, gdp: float, military_strength: int):
+        self.name = name
+        self.capital = capital
+        self.population = population
+        self.gdp = gdp
+        self.military_strength = military_strength
+        self.resources = {}
+        self.allies = []
+        self.enemies = []
+        self.technology_level = 1
+        self.happiness = 50.0
+
+def country_data(count: int) -> list:
+    rng = random.Random(0)
+    names = [f"Country {i}" for i in range(count)]
+    return [(name, f"{name} City", rng.randint(10000, 1000000000), rng.uniform(1, 20000), rng.randint(1, 100),
+             {resource: rng.randint(0, 10000) for resource in rng.sample(RESOURCES, 3)},
+             rng.sample(names, 2), [rng.choice(names)]) for name in names]
+
+def legacy_countries(data: list) -> list:
+    countries = []
+    for name, capital, population, gdp, military_strength, resources, allies, enemies in data:
+        country = LegacyCountry(name, capital, population, gdp, military_strength)
+        for resource, amount in resources.items():
+            country.resources[resource] = amount
+        country.allies.extend(allies)
+        country.enemies.extend(enemies)
+        countries.append(country)
+    return countries
+
+def compact_countries(data: list) -> list:
+    countries = []
+    for name, capital, population, gdp, military_strength, resources, allies, enemies in data:
+        country = Country(name, capital, population, gdp, military_strength)
+        for resource, amount in resources.items():
+            country.add_resource(resource, amount)
+        for ally in allies:
+            country.add_ally(ally)
+        for enemy in enemies:
+            country.add_enemy(enemy)
+        countries.append(country)
+    return countries
+
+def economy_countries(data: list) -> list:
+    """Slotted countries as a loaded world holds them: numbers in the economy's columns, no name lists."""
+    economy = Economy()
+    countries = []
+    for name, capital, population, gdp, military_strength, resources, _, _ in data:
+        country = Country(name, capital, population, gdp, military_strength)
+        country.resources = resources
+        economy.add(country)
+        countries.append(country)
+    return [countries, economy]
+
+def relation_graph(data: list) -> Diplomacy:
+    diplomacy = Diplomacy()
+    for name, _, _, _, _, _, allies, enemies in data:
+        diplomacy.add_country(name, allies, enemies)
+    return diplomacy
+
+def bytes_per_country(factory, data: list) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    countries = factory(data)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del countries
+    return (after - before) / len(data)
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data = country_data(count)
+    legacy = bytes_per_country(legacy_countries, data)
+    compact = bytes_per_country(compact_countries, data)
+    in_economy = bytes_per_country(economy_countries, data)
+    graph = bytes_per_country(relation_graph, data)
+    print(f"Country memory ({count:,} countries, 3 resources, 2 allies and 1 enemy each)")
+    print(f"  before (dict, resource dict, name lists):   {legacy:8.1f} bytes/country")
+    print(f"  after  (slots, resource array, name lists): {compact:8.1f} bytes/country")
+    print(f"  after, in an economy (numbers in columns):  {in_economy:8.1f} bytes/country")
+    print(f"  world relation graph, for reference:        {graph:8.1f} bytes/country")
@@ -0,0 +1,61 @@
+
+# Memory benchmark for revolutionary groups
+# Compares bytes per live group for the original dict-based layout and the slotted one.
+# Usage: python benchmarks/group_memory.py [group_count]
+
+import os
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "QUIX", "settings"))
+
+import Revolts
+
+# Layout of the classes before they were slotted, kept here as the baseline
+class LegacyIdeology:
+    def __init__(self, name: str, description: str, popularity: float):
+        self.name = name
+        self.description = description
+        self.popularity = popularity
+
+class LegacyRevolutionaryGroup:
+    def __init__(self, name: str, ideology: LegacyIdeology, strength: float):
+        self.name = name
+        self.ideology = ideology
+        self.strength = strength
+        self.members = random.randint(100, 10000)
+        self.founded_date = datetime.now() - timedelta(days=random.randint(30, 3650))
+
+def legacy_groups(count: int) -> list:
+    legacy_ideologies = [LegacyIdeology(i.name, i.description, i.popularity) for i in Revolts.ideologies]
+    groups = []
+    for _ in range(count):
+        ideology = random.choice(legacy_ideologies)
+        name = f"{ideology.name}ist {random.choice(Revolts.GROUP_NAME_SUFFIXES)}"
+        groups.append(LegacyRevolutionaryGroup(name, ideology, random.uniform(0.1, 0.5)))
+    return groups
+
+def compact_groups(count: int) -> list:
+    country = Revolts.Country("Benchmarkland", 10000000, 0.7)
+    return [Revolts.generate_revolutionary_group(country) for _ in range(count)]
+
+def bytes_per_group(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    groups = factory(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del groups
+    return (after - before) / count
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    random.seed(0)
+    legacy = bytes_per_group(legacy_groups, count)
+    compact = bytes_per_group(compact_groups, count)
+    print(f"Revolutionary group memory ({count:,} groups)")
+    print(f"  before (dict, datetime, name string): {legacy:8.1f} bytes/group")
+    print(f"  after  (slots, registry, int day):    {compact:8.1f} bytes/group")
+    print(f"  saving: {1 - compact / legacy:.0%}")
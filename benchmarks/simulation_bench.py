@@ -0,0 +1,291 @@
+
+# Benchmark suite for the Dynasty simulation modules
+# Sweeps simulated days, country count and group/rebellion count for the revolt and rebellion
+# simulations and for CustomCountriesMaker.conduct_war and wage_wars, recording throughput and peak memory.
+#
+# Usage:
+#   python benchmarks/simulation_bench.py                    # run and compare against the baseline
+#   python benchmarks/simulation_bench.py --update-baseline  # record cases missing from the baseline
+#   python benchmarks/simulation_bench.py --update-baseline --replace --filter war_engine
+#   python benchmarks/simulation_bench.py --filter revolts --full
+#
+# Throughput is also reported relative to a fixed pure-Python calibration loop, and that
+# normalized figure is what gets compared, so baselines stay meaningful across machines.
+# Timings are medians of repeated runs. A case that slows down by more than the threshold is
+# measured again, and only flagged when none of its measurements gets back within the threshold.
+# Recorded cases are only replaced on request, so a slowdown cannot be absorbed into the baseline
+# by re-recording it; replace a case when the case itself changes.
+
+import argparse
+import contextlib
+import gc
+import io
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "QUIX", "settings"))
+sys.path.insert(0, os.path.join(ROOT, "customs"))
+
+import Rebellions
+import Revolts
+from CustomCountries import CustomCountriesMaker
+from EventSinks import NullSink
+from RevoltEngine import RevoltEngine
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED = 20240601
+MEMORY_NOISE_BYTES = 256 * 1024
+MIN_TIMED_SECONDS = 0.5
+MAX_REPEAT = 50
+RECHECKS = 2  # Extra measurements of a case that looks slower than its baseline
+
+# A benchmark case prepares its state outside the timed region and returns
+# (run callable, number of work units the run performs)
+Case = Callable[[random.Random], Tuple[Callable[[], None], int]]
+
+def revolts_case(countries: int, groups: int, days: int, fast_forward: bool = False) -> Case:
+    def prepare(rng: random.Random):
+        nations = []
+        for i in range(countries):
+            country = Revolts.Country(f"Country {i}", 10000000, 0.7)
+            for _ in range(groups):
+                country.add_revolutionary_group(Revolts.generate_revolutionary_group(country, rng))
+            nations.append(country)
+        sink = NullSink()
+
+        def run():
+            for country in nations:
+                Revolts.simulate_revolts(country, days, rng, sink, fast_forward)
+        return run, countries * days
+    return prepare
+
+def revolt_engine_case(countries: int, groups: int, days: int) -> Case:
+    def prepare(rng: random.Random):
+        engine = RevoltEngine(seed=rng.getrandbits(32))
+        for i in range(countries):
+            engine.add_country(f"Country {i}", 10000000, 0.7)
+        engine._spawn_groups(engine.rng.integers(0, countries, size=countries * groups))
+
+        def run():
+            engine.run(days)
+        return run, countries * days
+    return prepare
+
+def update_rebellions_case(countries: int, rebellions: int, days: int) -> Case:
+    def prepare(rng: random.Random):
+        nations = []
+        for i in range(countries):
+            country = Rebellions.Country(f"Country {i}", stability=70, military_strength=80)
+            for _ in range(rebellions):
+                country.active_rebellions.append(Rebellions.create_rebellion(country, rng))
+            nations.append(country)
+
+        def run():
+            for _ in range(days):
+                for country in nations:
+                    Rebellions.update_rebellions(country, rng)
+        return run, countries * days
+    return prepare
+
+def simulate_country_case(countries: int, rebellions: int, days: int) -> Case:
+    def prepare(rng: random.Random):
+        nations = []
+        for i in range(countries):
+            country = Rebellions.Country(f"Country {i}", stability=70, military_strength=80)
+            for _ in range(rebellions):
+                country.active_rebellions.append(Rebellions.create_rebellion(country, rng))
+            nations.append(country)
+
+        def run():
+            for country in nations:
+                Rebellions.simulate_country(country, days, rng)
+        return run, countries * days
+    return prepare
+
+def war_world(rng: random.Random, countries: int) -> Tuple[CustomCountriesMaker, List[str]]:
+    # Countries join through add_country, so wars go through the economy, diplomacy and rankings
+    maker = CustomCountriesMaker()
+    names = [f"Country {i}" for i in range(countries)]
+    for name in names:
+        country = maker.add_country(name, f"{name} City", 1000000, 500.0, rng.randint(1, 100),
+                                    {"Oil": rng.randint(0, 1000), "Iron": rng.randint(0, 1000)})
+        country.technology_level = rng.randint(1, 10)
+    maker.rankings.top("military_strength", 10)  # Keeps the leaderboard live during the run
+    return maker, names
+
+def conduct_war_case(countries: int, wars: int) -> Case:
+    def prepare(rng: random.Random):
+        maker, names = war_world(rng, countries)
+        pairs = [tuple(rng.sample(names, 2)) for _ in range(wars)]
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                for attacker, defender in pairs:
+                    maker.conduct_war(attacker, defender)
+        return run, wars
+    return prepare
+
+def war_engine_case(countries: int, wars: int) -> Case:
+    def prepare(rng: random.Random):
+        maker, names = war_world(rng, countries)
+        pairs = [tuple(rng.sample(names, 2)) for _ in range(wars)]
+
+        def run():
+            maker.wage_wars(pairs)
+        return run, wars
+    return prepare
+
+def build_cases(full: bool) -> Dict[str, Case]:
+    days = [30, 365] if not full else [30, 365, 3650]
+    countries = [10, 100] if not full else [10, 100, 1000]
+    sizes = [2, 20] if not full else [2, 20, 200]
+
+    cases: Dict[str, Case] = {}
+    for d, c, g in itertools.product(days, countries, sizes):
+        cases[f"revolts/days={d}/countries={c}/groups={g}"] = revolts_case(c, g, d)
+        cases[f"revolts_fast_forward/days={d}/countries={c}/groups={g}"] = revolts_case(c, g, d, True)
+        cases[f"revolt_engine/days={d}/countries={c * 10}/groups={g}"] = revolt_engine_case(c * 10, g, d)
+        cases[f"update_rebellions/days={d}/countries={c}/rebellions={g}"] = update_rebellions_case(c, g, d)
+        cases[f"simulate_country/days={d}/countries={c}/rebellions={g}"] = simulate_country_case(c, g, d)
+    for c in countries:
+        cases[f"conduct_war/countries={c}/wars={c * 100}"] = conduct_war_case(c, c * 100)
+        cases[f"war_engine/countries={c * 100}/wars={c * 100}"] = war_engine_case(c * 100, c * 100)
+    return cases
+
+def calibrate(repeat: int = 25, operations: int = 40000) -> float:
+    # Operations per second of a fixed pure-Python workload, used to normalize throughput
+    timings = []
+    for _ in range(repeat):
+        rng = random.Random(SEED)
+        start = time.perf_counter()
+        total = 0.0
+        for _ in range(operations):
+            total += min(1.0, rng.random() + rng.randint(10, 500) / 10000)
+        timings.append(time.perf_counter() - start)
+    return operations / statistics.median(timings)
+
+def spread(timings: List[float]) -> float:
+    # Interquartile range relative to the median
+    if len(timings) < 4:
+        return 0.0
+    low, median, high = statistics.quantiles(timings, n=4)
+    return (high - low) / median
+
+def measure(case: Case, repeat: int) -> Dict[str, float]:
+    # Median of at least `repeat` runs; short cases keep repeating to get past timer noise
+    timings: List[float] = []
+    units = 0
+    while len(timings) < repeat or (sum(timings) < MIN_TIMED_SECONDS and len(timings) < MAX_REPEAT):
+        run, units = case(random.Random(SEED))
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    median = statistics.median(timings)
+
+    # Separate pass for memory, since tracing slows the run down
+    tracemalloc.start()
+    run, _ = case(random.Random(SEED))
+    tracemalloc.reset_peak()
+    baseline_memory = tracemalloc.get_traced_memory()[0]
+    run()
+    peak_memory = tracemalloc.get_traced_memory()[1] - baseline_memory
+    tracemalloc.stop()
+
+    return {"seconds": median, "throughput": units / median, "noise": spread(timings), "peak_bytes": peak_memory}
+
+def slower(result: Dict[str, float], reference: Dict[str, float], threshold: float) -> bool:
+    return result["normalized_throughput"] < (1 - threshold) * reference["normalized_throughput"]
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        speed = result["normalized_throughput"] / reference["normalized_throughput"]
+        if slower(result, reference, threshold):
+            regressions.append(f"{name}: throughput {speed:.0%} of baseline")
+        # Small peaks are dominated by allocator noise, so memory needs to grow by a real amount too
+        extra_memory = result["peak_bytes"] - reference["peak_bytes"]
+        if extra_memory > MEMORY_NOISE_BYTES and extra_memory > threshold * reference["peak_bytes"]:
+            regressions.append(f"{name}: peak memory +{extra_memory / 1024:,.0f} KiB over baseline")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Dynasty simulation modules")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="add results for new cases to the baseline")
+    parser.add_argument("--replace", action="store_true", help="with --update-baseline, also replace recorded cases")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions per case")
+    parser.add_argument("--full", action="store_true", help="run the large sweep")
+    args = parser.parse_args(argv)
+
+    calibration = calibrate()
+    cases = build_cases(args.full)
+    results: Dict[str, Dict[str, float]] = {}
+    for name, case in cases.items():
+        if args.filter not in name:
+            continue
+        result = measure(case, args.repeat)
+        results[name] = result
+        print(f"{name:60s} {result['throughput']:>14,.0f} units/s {result['noise']:>6.0%} spread "
+              f"{result['peak_bytes'] / 1024:>10,.0f} KiB peak")
+    # Calibrated on both sides of the run, so a machine that speeds up or slows down midway averages out
+    calibration = (calibration + calibrate()) / 2
+    print(f"Calibration: {calibration:,.0f} ops/s")
+    for result in results.values():
+        result["normalized_throughput"] = result["throughput"] / calibration
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        kept = [name for name in results if name in baseline and not args.replace]
+        baseline.update({name: result for name, result in results.items() if name not in kept})
+        for name in kept:
+            print(f"Kept the recorded baseline of {name}; pass --replace to overwrite it")
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to record one.")
+        return 0
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    # A single slow measurement may be a busy machine; keep the fastest of a few before flagging
+    for name, result in results.items():
+        reference = baseline.get(name)
+        for _ in range(RECHECKS):
+            if reference is None or not slower(result, reference, args.threshold):
+                break
+            retry = measure(cases[name], args.repeat)
+            retry["normalized_throughput"] = retry["throughput"] / calibration
+            print(f"{name:60s} {retry['throughput']:>14,.0f} units/s (recheck)")
+            if retry["normalized_throughput"] > result["normalized_throughput"]:
+                results[name] = result = retry
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
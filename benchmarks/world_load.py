@@ -0,0 +1,98 @@
+# Startup benchmark for saved worlds
+# Compares the time and memory needed to load a world and look up countries for the
+# countries.json save and the memory-mapped binary world file.
+# Usage: python benchmarks/world_load.py [country_count]
+
+import contextlib
+import gc
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "customs"))
+
+from CustomCountries import Country, CustomCountriesMaker
+
+RESOURCES = ["oil", "gold", "iron", "grain", "timber", "uranium"]
+LOOKUPS = 1000
+
+def build_world(count: int, rng: random.Random) -> CustomCountriesMaker:
+    maker = CustomCountriesMaker()
+    names = [f"Country {i}" for i in range(count)]
+    for name in names:
+        country = Country(name, f"{name} City", rng.randint(10000, 1000000000), rng.uniform(1, 20000),
+                          rng.randint(1, 100))
+        for resource in rng.sample(RESOURCES, 3):
+            country.add_resource(resource, rng.randint(0, 10000))
+        for _ in range(2):
+            country.add_ally(rng.choice(names))
+        country.add_enemy(rng.choice(names))
+        country.technology_level = rng.randint(1, 10)
+        country.happiness = rng.uniform(0, 100)
+        maker.countries[name] = country
+    return maker
+
+def measure_load(load, names) -> tuple:
+    """Time of loading a world, of a first and a repeated lookup of some countries, and peak traced memory.
+
+    Times come from an untraced run, since tracemalloc slows down every allocation; the peak memory
+    from a second, traced run.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    maker = CustomCountriesMaker()
+    with contextlib.redirect_stdout(io.StringIO()):
+        load(maker)
+    loaded = time.perf_counter()
+    for name in names:
+        maker.countries[name].gdp
+    first = time.perf_counter()
+    for name in names:
+        maker.countries[name].gdp
+    repeated = time.perf_counter()
+    del maker
+
+    gc.collect()
+    tracemalloc.start()
+    maker = CustomCountriesMaker()
+    with contextlib.redirect_stdout(io.StringIO()):
+        load(maker)
+    for name in names:
+        maker.countries[name].gdp
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return loaded - start, first - loaded, repeated - first, peak
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(0)
+    directory = tempfile.mkdtemp()
+    os.chdir(directory)
+
+    maker = build_world(count, rng)
+    names = rng.sample(list(maker.countries), min(LOOKUPS, count))
+    with contextlib.redirect_stdout(io.StringIO()):
+        maker.save_countries()
+        maker.save_world()
+    del maker
+
+    json_time, json_first, json_repeated, json_peak = measure_load(CustomCountriesMaker.load_countries, names)
+    world_time, world_first, world_repeated, world_peak = measure_load(CustomCountriesMaker.load_world, names)
+
+    print(f"World load ({count:,} countries, {len(names):,} lookups, first and repeated)")
+    print(f"  countries.json:  {os.path.getsize('countries.json') / 2 ** 20:8.1f} MiB on disk, "
+          f"load {json_time:7.3f}s, lookups {json_first * 1000:7.1f}ms {json_repeated * 1000:6.1f}ms, "
+          f"peak {json_peak / 2 ** 20:8.1f} MiB")
+    print(f"  countries.world: {os.path.getsize('countries.world') / 2 ** 20:8.1f} MiB on disk, "
+          f"load {world_time:7.3f}s, lookups {world_first * 1000:7.1f}ms {world_repeated * 1000:6.1f}ms, "
+          f"peak {world_peak / 2 ** 20:8.1f} MiB")
+    print(f"  startup speedup: {json_time / world_time:,.0f}x")
+    print("  (the world file is mapped, not read; its pages are shared page cache rather than heap;")
+    print("   a first lookup in it builds the country, which the JSON load did for every country up front)")
+    for path in ("countries.json", "countries.world"):
+        os.remove(path)
+    os.rmdir(directory)
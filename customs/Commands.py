@@ -0,0 +1,425 @@
+
+import json
+import random
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Type
+
+from Resources import resource_amount
+
+if TYPE_CHECKING:
+    from CustomCountries import Country, CustomCountriesMaker
+
+class CommandError(ValueError):
+    """A command that failed validation; nothing was changed."""
+
+def _country(maker: "CustomCountriesMaker", name: str) -> "Country":
+    country = maker.countries.get(name) if isinstance(name, str) else None
+    if country is None:
+        raise CommandError(f"Country '{name}' not found.")
+    return country
+
+def _number(field: str, value, convert: Type):
+    try:
+        return convert(value)
+    except (TypeError, ValueError, OverflowError):
+        raise CommandError(f"Invalid value for {field}: {value!r}.") from None
+
+def _amount(amount) -> int:
+    try:
+        return resource_amount(amount)
+    except ValueError as error:
+        raise CommandError(f"{error}.") from None
+
+def _other_country(maker: "CustomCountriesMaker", name: str, other: str) -> None:
+    if not isinstance(other, str) or other == name or other not in maker.countries:
+        raise CommandError("Invalid country name.")
+
+class Command:
+    """One game action. Fields are listed in __slots__, in the order of the constructor."""
+    __slots__ = ()
+    kind = ""
+
+    def apply(self, maker: "CustomCountriesMaker", rng) -> str:
+        """Validate and perform the action; return the message to show the player."""
+        raise NotImplementedError
+
+    def to_record(self) -> list:
+        return [self.kind] + [getattr(self, field) for field in self.__slots__]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(repr(getattr(self, field)) for field in self.__slots__)})"
+
+class CreateCountry(Command):
+    __slots__ = ("name", "capital", "population", "gdp", "military_strength", "resources")
+    kind = "create"
+
+    def __init__(self, name: str, capital: str, population: int, gdp: float, military_strength: int,
+                 resources: Optional[Dict[str, int]] = None):
+        self.name = name
+        self.capital = capital
+        self.population = population
+        self.gdp = gdp
+        self.military_strength = military_strength
+        self.resources = resources or {}
+
+    def apply(self, maker, rng) -> str:
+        if not self.name or not isinstance(self.name, str):
+            raise CommandError("A country needs a name.")
+        if self.name in maker.countries:
+            raise CommandError(f"Country '{self.name}' already exists.")
+        population = _number("population", self.population, int)
+        gdp = _number("gdp", self.gdp, float)
+        military_strength = _number("military_strength", self.military_strength, int)
+        if population < 0 or gdp < 0 or military_strength < 0:
+            raise CommandError("Population, GDP and military strength cannot be negative.")
+        if not isinstance(self.resources, dict) or not all(isinstance(name, str) and name for name in self.resources):
+            raise CommandError(f"Invalid resources: {self.resources!r}.")
+        resources = {resource: _amount(amount) for resource, amount in self.resources.items()}
+        maker.add_country(self.name, self.capital, population, gdp, military_strength, resources)
+        return f"{self.name} has been created successfully!"
+
+class DeleteCountry(Command):
+    __slots__ = ("name",)
+    kind = "delete"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def apply(self, maker, rng) -> str:
+        _country(maker, self.name)
+        maker.remove_country(self.name)
+        return f"{self.name} has been deleted successfully!"
+
+class SetAttribute(Command):
+    __slots__ = ("name", "field", "value")
+    kind = "set"
+    FIELDS = {"population": int, "gdp": float, "military_strength": int}
+
+    def __init__(self, name: str, field: str, value):
+        self.name = name
+        self.field = field
+        self.value = value
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        convert = self.FIELDS.get(self.field) if isinstance(self.field, str) else None
+        if convert is None:
+            raise CommandError(f"'{self.field}' cannot be set.")
+        setattr(country, self.field, _number(self.field, self.value, convert))
+        maker.country_changed(self.name, self.field)
+        return ""
+
+class SetResource(Command):
+    __slots__ = ("name", "resource", "amount")
+    kind = "resource"
+
+    def __init__(self, name: str, resource: str, amount: int):
+        self.name = name
+        self.resource = resource
+        self.amount = amount
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        if not self.resource or not isinstance(self.resource, str):
+            raise CommandError("A resource needs a name.")
+        country.add_resource(self.resource, _amount(self.amount))
+        maker.resource_changed(self.name, self.resource)
+        return ""
+
+class ChangeResource(Command):
+    """Increase a resource, or decrease it (with a negative amount) down to zero at most."""
+    __slots__ = ("name", "resource", "amount")
+    kind = "change_resource"
+
+    def __init__(self, name: str, resource: str, amount: int):
+        self.name = name
+        self.resource = resource
+        self.amount = amount
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        if self.resource not in country.resources:
+            raise CommandError(f"Resource '{self.resource}' not found.")
+        amount = _amount(self.amount)
+        country.add_resource(self.resource, max(0, country.resources[self.resource] + amount))
+        maker.resource_changed(self.name, self.resource)
+        if amount >= 0:
+            return f"{self.resource} increased by {amount}"
+        return f"{self.resource} decreased by {-amount}"
+
+class AddAlly(Command):
+    __slots__ = ("name", "other")
+    kind = "ally"
+
+    def __init__(self, name: str, other: str):
+        self.name = name
+        self.other = other
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        _other_country(maker, self.name, self.other)
+        country.add_ally(self.other)
+        maker.relation_added(self.name, "allies", self.other)
+        return ""
+
+class AddEnemy(Command):
+    __slots__ = ("name", "other")
+    kind = "enemy"
+
+    def __init__(self, name: str, other: str):
+        self.name = name
+        self.other = other
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        _other_country(maker, self.name, self.other)
+        country.add_enemy(self.other)
+        maker.relation_added(self.name, "enemies", self.other)
+        return ""
+
+class IncreaseTechnology(Command):
+    __slots__ = ("name",)
+    kind = "technology"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        country.increase_technology()
+        maker.country_changed(self.name, "technology_level")
+        return f"Technology level increased to {country.technology_level}"
+
+class AdjustHappiness(Command):
+    __slots__ = ("name", "amount")
+    kind = "happiness"
+
+    def __init__(self, name: str, amount: float):
+        self.name = name
+        self.amount = amount
+
+    def apply(self, maker, rng) -> str:
+        amount = _number("amount", self.amount, float)
+        if not -100 <= amount <= 100:
+            raise CommandError("Happiness adjustment must be between -100 and 100.")
+        _country(maker, self.name).adjust_happiness(amount)
+        maker.country_changed(self.name, "happiness")
+        return ""
+
+class ProposeAlliance(Command):
+    __slots__ = ("name", "other")
+    kind = "propose_alliance"
+    SUCCESS_CHANCE = 0.7
+
+    def __init__(self, name: str, other: str):
+        self.name = name
+        self.other = other
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        _other_country(maker, self.name, self.other)
+        if rng.random() >= self.SUCCESS_CHANCE:
+            return f"{self.other} rejected your alliance proposal."
+        country.add_ally(self.other)
+        maker.countries[self.other].add_ally(self.name)
+        maker.relation_added(self.name, "allies", self.other)
+        maker.relation_added(self.other, "allies", self.name)
+        return f"Alliance with {self.other} established!"
+
+class DeclareRivalry(Command):
+    __slots__ = ("name", "other")
+    kind = "declare_rivalry"
+
+    def __init__(self, name: str, other: str):
+        self.name = name
+        self.other = other
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        _other_country(maker, self.name, self.other)
+        country.add_enemy(self.other)
+        maker.countries[self.other].add_enemy(self.name)
+        maker.relation_added(self.name, "enemies", self.other)
+        maker.relation_added(self.other, "enemies", self.name)
+        return f"Rivalry with {self.other} declared!"
+
+class InvestInTechnology(Command):
+    __slots__ = ("name",)
+    kind = "invest"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @staticmethod
+    def cost(country: "Country") -> float:
+        return country.technology_level * 1000000000  # Cost increases with each level
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        cost = self.cost(country)
+        if country.gdp < cost:
+            raise CommandError("Insufficient funds for technology investment.")
+        country.gdp -= cost
+        country.increase_technology()
+        country.adjust_happiness(5)  # People are happy with technological progress
+        maker.country_changed(self.name, "gdp", "technology_level", "happiness")
+        return f"Technology level increased to {country.technology_level}!"
+
+class IncreaseMilitary(Command):
+    __slots__ = ("name",)
+    kind = "military"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @staticmethod
+    def cost(country: "Country") -> float:
+        return country.military_strength * 1000000000
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        cost = self.cost(country)
+        if country.gdp < cost:
+            raise CommandError("Insufficient funds to increase military strength.")
+        country.gdp -= cost
+        country.military_strength += 5
+        country.adjust_happiness(-2)  # People are slightly unhappy with military spending
+        maker.country_changed(self.name, "gdp", "military_strength", "happiness")
+        return f"Military strength increased to {country.military_strength}!"
+
+class MilitaryExercise(Command):
+    __slots__ = ("name",)
+    kind = "exercise"
+    SUCCESS_CHANCE = 0.8
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def apply(self, maker, rng) -> str:
+        country = _country(maker, self.name)
+        if rng.random() < self.SUCCESS_CHANCE:
+            country.military_strength += 2
+            country.adjust_happiness(1)
+            message = "Military exercise was successful!"
+        else:
+            country.military_strength -= 1
+            country.adjust_happiness(-1)
+            message = "Military exercise faced some challenges."
+        maker.country_changed(self.name, "military_strength", "happiness")
+        return message
+
+class DeclareWar(Command):
+    __slots__ = ("attacker", "defender")
+    kind = "war"
+
+    def __init__(self, attacker: str, defender: str):
+        self.attacker = attacker
+        self.defender = defender
+
+    def apply(self, maker, rng) -> str:
+        _country(maker, self.attacker)
+        if not isinstance(self.defender, str) or self.defender == self.attacker or self.defender not in maker.countries:
+            raise CommandError("Invalid target country.")
+        report = maker.wage_wars([(self.attacker, self.defender)])
+        winner = report.winner(0)
+        loser = self.defender if winner == self.attacker else self.attacker
+        lines = [f"\n=== War: {self.attacker} vs {self.defender} ===",
+                 f"{self.attacker} strength: {report.attacker_strength[0]:.1f}",
+                 f"{self.defender} strength: {report.defender_strength[0]:.1f}",
+                 f"{winner} won the war against {loser}!"]
+        for name in (winner, loser):
+            country = maker.countries[name]
+            lines.append(f"{name}: military strength {country.military_strength}, GDP ${country.gdp:.2f} billion, "
+                         f"happiness {country.happiness:.1f}%")
+        return "\n".join(lines)
+
+class EndTurn(Command):
+    __slots__ = ()
+    kind = "end_turn"
+
+    def apply(self, maker, rng) -> str:
+        maker.advance_year()
+        return f"Year {maker.game_year - 1} has ended."
+
+COMMANDS: Dict[str, Type[Command]] = {command.kind: command for command in (
+    CreateCountry, DeleteCountry, SetAttribute, SetResource, ChangeResource, AddAlly, AddEnemy,
+    IncreaseTechnology, AdjustHappiness, ProposeAlliance, DeclareRivalry, InvestInTechnology,
+    IncreaseMilitary, MilitaryExercise, DeclareWar, EndTurn)}
+
+def command_from_record(record: list) -> Command:
+    """Command of a recorded [kind, field, ...] list; raises CommandError for malformed records."""
+    if not isinstance(record, list) or not record or not isinstance(record[0], str):
+        raise CommandError(f"Malformed command record: {record!r}")
+    command_type = COMMANDS.get(record[0])
+    if command_type is None:
+        raise CommandError(f"Unknown command '{record[0]}'")
+    if len(record) - 1 != len(command_type.__slots__):
+        raise CommandError(f"'{record[0]}' takes {len(command_type.__slots__)} fields, not {len(record) - 1}")
+    return command_type(*record[1:])
+
+def read_commands(path: str) -> Iterator[Command]:
+    """Commands of a recorded session, one JSON record per line."""
+    with open(path, "r") as f:
+        for line in f:
+            yield command_from_record(json.loads(line))
+
+def write_commands(path: str, commands: Iterable[Command]) -> None:
+    with open(path, "w") as f:
+        for command in commands:
+            f.write(json.dumps(command.to_record(), separators=(",", ":")) + "\n")
+
+class BatchResult:
+    """Outcome of execute_batch: how many commands were applied and why the others were rejected."""
+
+    def __init__(self):
+        self.applied = 0
+        self.errors: List[Tuple[int, str]] = []  # (position in the batch, message)
+
+    def __str__(self):
+        return f"{self.applied} commands applied, {len(self.errors)} rejected"
+
+class CommandExecutor:
+    """Applies commands to a CustomCountriesMaker, optionally recording them for replay."""
+
+    def __init__(self, maker: "CustomCountriesMaker", rng=None, recording: Optional[TextIO] = None):
+        self.maker = maker
+        self.rng = rng or random
+        self.recording = recording
+
+    def execute(self, command: Command) -> str:
+        """Apply one command and return its message; raises CommandError if it is invalid."""
+        message = command.apply(self.maker, self.rng)
+        if self.recording is not None:  # Only applied commands, so a replay never sees rejected ones
+            self.recording.write(json.dumps(command.to_record(), separators=(",", ":")) + "\n")
+        return message
+
+    def execute_batch(self, commands: Iterable[Command], stop_on_error: bool = False) -> BatchResult:
+        """Apply commands in one pass. Invalid commands are skipped and reported, or end the batch."""
+        result = BatchResult()
+        for position, command in enumerate(commands):
+            if not self._apply(command, position, result) and stop_on_error:
+                break
+        return result
+
+    def _apply(self, command: Command, position: int, result: BatchResult) -> bool:
+        try:
+            command.apply(self.maker, self.rng)
+        except CommandError as error:
+            result.errors.append((position, str(error)))
+            return False
+        result.applied += 1
+        if self.recording is not None:
+            self.recording.write(json.dumps(command.to_record(), separators=(",", ":")) + "\n")
+        return True
+
+    def replay(self, path: str) -> BatchResult:
+        """Apply a recorded session. Unreadable or malformed lines are skipped and reported like invalid commands."""
+        result = BatchResult()
+        with open(path, "r") as f:
+            for position, line in enumerate(f):
+                try:
+                    command = command_from_record(json.loads(line))
+                except ValueError as error:  # Also covers CommandError and json.JSONDecodeError
+                    result.errors.append((position, str(error)))
+                else:
+                    self._apply(command, position, result)
+        return result
@@ -0,0 +1,161 @@
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from Economy import advance_country
+
+SNAPSHOT_FORMAT = "dynasty-countries"
+
+def read_snapshot(path: str) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """Read country data and the last journal sequence number folded into it."""
+    if not os.path.exists(path):
+        return {}, 0
+    with open(path, "r") as f:
+        data = json.load(f)
+    if data.get("format") == SNAPSHOT_FORMAT:
+        return data["countries"], data["seq"]
+    return data, 0  # Plain countries.json written by save_countries
+
+def write_snapshot(path: str, countries: Dict[str, Dict[str, Any]], seq: int) -> None:
+    """Write a snapshot atomically, so a crash never leaves a truncated file behind."""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as f:
+        json.dump({"format": SNAPSHOT_FORMAT, "seq": seq, "countries": countries}, f, separators=(",", ":"))
+    os.replace(temporary_path, path)
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a journal file, skipping a torn last line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                return
+
+def apply_record(countries: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+    """Apply one journal record to country data in to_dict form."""
+    op = record["op"]
+    name = record["name"]
+    if op == "create":
+        countries[name] = record["country"]
+    elif op == "delete":
+        countries.pop(name, None)
+        for country in countries.values():  # Relations are symmetric, so the others drop it too
+            for relations in (country["allies"], country["enemies"]):
+                if name in relations:
+                    relations.remove(name)
+    elif op == "set":
+        countries[name].update(record["fields"])
+    elif op == "resource":
+        countries[name]["resources"][record["resource"]] = record["amount"]
+    elif op == "turn":
+        for country in countries.values():
+            advance_country(country)
+    elif op in ("allies", "enemies"):
+        relations = countries[name][op]
+        if record["other"] not in relations:
+            relations.append(record["other"])
+    else:
+        raise ValueError(f"Unknown journal operation '{op}'")
+
+class CountryJournal:
+    """Append-only log of country mutations that is folded into a snapshot in the background."""
+
+    def __init__(self, path: str = "countries.journal", snapshot_path: str = "countries.json",
+                 compact_after: int = 100000):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.segment_path = f"{path}.compacting"  # Rotated part of the journal being folded
+        self.compact_after = compact_after
+        self.seq = self._last_seq()  # Continue numbering after the existing records, loaded or not
+        self.compaction_error: Optional[BaseException] = None
+        self._records = 0
+        self._file = None
+        self._compactor: Optional[threading.Thread] = None
+
+    def _last_seq(self) -> int:
+        _, seq = read_snapshot(self.snapshot_path)
+        for path in (self.segment_path, self.path):
+            for record in read_records(path):
+                seq = max(seq, record["seq"])
+        return seq
+
+    def append(self, op: str, name: str, **data: Any) -> int:
+        """Append one mutation record and return its sequence number."""
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self.seq += 1
+        record = {"seq": self.seq, "op": op, "name": name}
+        record.update(data)
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._records += 1
+        if self._records >= self.compact_after:
+            self.compact()
+        return self.seq
+
+    def flush(self) -> None:
+        """Make every record appended so far durable."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild country data from the snapshot plus the journal records after it."""
+        self.wait()
+        countries, snapshot_seq = read_snapshot(self.snapshot_path)
+        self.seq = snapshot_seq
+        for path in (self.segment_path, self.path):
+            for record in read_records(path):
+                if record["seq"] > snapshot_seq:
+                    apply_record(countries, record)
+                self.seq = max(self.seq, record["seq"])
+        return countries
+
+    def compact(self, background: bool = True) -> None:
+        """Rotate the journal and fold the rotated records into a new snapshot."""
+        self.wait()
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.segment_path):
+            self._fold()  # Left over from an interrupted compaction
+        if not os.path.exists(self.path):
+            return
+        os.replace(self.path, self.segment_path)
+        self._records = 0
+        if background:
+            self._compactor = threading.Thread(target=self._fold, daemon=True)
+            self._compactor.start()
+        else:
+            self._fold()
+
+    def _fold(self) -> None:
+        # Works on the files alone, so the game can keep appending to the new journal meanwhile
+        try:
+            countries, seq = read_snapshot(self.snapshot_path)
+            for record in read_records(self.segment_path):
+                if record["seq"] > seq:
+                    apply_record(countries, record)
+                    seq = record["seq"]
+            write_snapshot(self.snapshot_path, countries, seq)
+            os.remove(self.segment_path)
+        except Exception as error:
+            self.compaction_error = error
+
+    def wait(self) -> None:
+        """Wait for a running background compaction to finish."""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self) -> None:
+        self.wait()
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
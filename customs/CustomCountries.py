@@ -1,21 +1,107 @@
 
-import random
 import json
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from Commands import (AddAlly, AddEnemy, AdjustHappiness, ChangeResource, Command, CommandError, CommandExecutor,
+                      CreateCountry, DeclareRivalry, DeclareWar, DeleteCountry, EndTurn, IncreaseMilitary,
+                      IncreaseTechnology, InvestInTechnology, MilitaryExercise, ProposeAlliance, SetAttribute,
+                      SetResource)
+from CountryJournal import CountryJournal, read_snapshot
+from Diplomacy import Diplomacy
+from Economy import FIELDS, TURN_FIELDS, Economy
+from Rankings import Rankings
+from Resources import Resources, resource_array
+from WarEngine import WarReport, resolve_wars
+
+def _economy_field(name: str) -> property:
+    """Numeric attribute that lives in the economy's columns once the country has joined one."""
+    local_name = f"_{name}"
+    convert = FIELDS[name][1]
+
+    def get(self):
+        if self.economy is None:
+            return getattr(self, local_name)
+        return convert(self.economy.columns[name][self.row])
+
+    def set(self, value) -> None:
+        if self.economy is None:
+            setattr(self, local_name, value)
+        else:
+            self.economy.set(self.row, name, value)
+    return property(get, set)
 
 class Country:
+    # Slotted to keep world-scale country counts small; resources are a typed array behind a view
+    __slots__ = ("economy", "row", "name", "capital", "_resources", "diplomacy", "_allies", "_enemies",
+                 "_population", "_gdp", "_military_strength", "_technology_level", "_happiness")
+
+    population = _economy_field("population")
+    gdp = _economy_field("gdp")
+    military_strength = _economy_field("military_strength")
+    technology_level = _economy_field("technology_level")
+    happiness = _economy_field("happiness")
+
     def __init__(self, name: str, capital: str, population: int, gdp: float, military_strength: int):
+        self.economy: Optional[Economy] = None  # Holds the numeric attributes once the country has joined
+        self.row = -1
         self.name = name
         self.capital = capital
         self.population = population
         self.gdp = gdp
         self.military_strength = military_strength
-        self.resources: Dict[str, int] = {}
-        self.allies: List[str] = []
-        self.enemies: List[str] = []
-        self.technology_level: int = 1
-        self.happiness: float = 50.0  # Percentage
+        self._resources = resource_array()
+        self.diplomacy: Optional[Diplomacy] = None  # World relations, once the country has joined a world
+        self._allies: Optional[List[str]] = None  # Created when first needed, until the country joins a world
+        self._enemies: Optional[List[str]] = None
+        self.technology_level = 1
+        self.happiness = 50.0  # Percentage
+
+    @property
+    def resources(self) -> Resources:
+        return Resources(self)
+
+    @resources.setter
+    def resources(self, amounts: Dict[str, int]) -> None:
+        self._resources = resource_array(amounts)
+        if self.economy is not None:
+            self.economy.mark_dirty(self)
+
+    @property
+    def allies(self) -> List[str]:
+        if self.diplomacy is None:
+            if self._allies is None:
+                self._allies = []
+            return self._allies
+        return self.diplomacy.alliances.neighbours(self.name)
+
+    @allies.setter
+    def allies(self, names: List[str]) -> None:
+        if self.diplomacy is None:
+            self._allies = names
+        else:
+            self.diplomacy.alliances.set_neighbours(self.name, names)
+
+    @property
+    def enemies(self) -> List[str]:
+        if self.diplomacy is None:
+            if self._enemies is None:
+                self._enemies = []
+            return self._enemies
+        return self.diplomacy.rivalries.neighbours(self.name)
+
+    @enemies.setter
+    def enemies(self, names: List[str]) -> None:
+        if self.diplomacy is None:
+            self._enemies = names
+        else:
+            self.diplomacy.rivalries.set_neighbours(self.name, names)
+
+    def join(self, diplomacy: Diplomacy) -> None:
+        """Move the country's relations into the relation graph of its world."""
+        diplomacy.add_country(self.name, self._allies or (), self._enemies or ())
+        self.diplomacy = diplomacy
+        self._allies = self._enemies = None
 
     def add_resource(self, resource: str, amount: int) -> None:
         """Add a resource to the country."""
@@ -23,13 +109,31 @@ class Country:
 
     def add_ally(self, country_name: str) -> None:
         """Add an ally to the country."""
-        if country_name not in self.allies:
-            self.allies.append(country_name)
+        if self.diplomacy is not None:
+            self.diplomacy.alliances.add(self.name, country_name)
+        elif country_name not in self.allies:
+            self._allies.append(country_name)
 
     def add_enemy(self, country_name: str) -> None:
         """Add an enemy to the country."""
-        if country_name not in self.enemies:
-            self.enemies.append(country_name)
+        if self.diplomacy is not None:
+            self.diplomacy.rivalries.add(self.name, country_name)
+        elif country_name not in self.enemies:
+            self._enemies.append(country_name)
+
+    def remove_ally(self, country_name: str) -> None:
+        """Remove an ally from the country."""
+        if self.diplomacy is not None:
+            self.diplomacy.alliances.remove(self.name, country_name)
+        elif self._allies and country_name in self._allies:
+            self._allies.remove(country_name)
+
+    def remove_enemy(self, country_name: str) -> None:
+        """Remove an enemy from the country."""
+        if self.diplomacy is not None:
+            self.diplomacy.rivalries.remove(self.name, country_name)
+        elif self._enemies and country_name in self._enemies:
+            self._enemies.remove(country_name)
 
     def increase_technology(self) -> None:
         """Increase the technology level of the country."""
@@ -47,7 +151,7 @@ class Country:
             "population": self.population,
             "gdp": self.gdp,
             "military_strength": self.military_strength,
-            "resources": self.resources,
+            "resources": self.resources.copy(),
             "allies": self.allies,
             "enemies": self.enemies,
             "technology_level": self.technology_level,
@@ -72,10 +176,78 @@ class Country:
         return country
 
 class CustomCountriesMaker:
-    def __init__(self):
+    def __init__(self, journal: Optional[CountryJournal] = None):
         self.countries: Dict[str, Country] = {}
         self.game_year: int = 2023
         self.player_country: Optional[str] = None
+        self.journal = journal  # Every change is appended here instead of rewriting countries.json
+        self.relations = Diplomacy()  # Alliances and rivalries of the world
+        self.economy = Economy()
+        self.commands = CommandExecutor(self)  # Every menu action is carried out through a command
+        self.rankings = Rankings(self.economy)  # Leaderboards, kept up to date by the hooks below
+
+    def country_created(self, country: Country) -> None:
+        """Record a newly created country."""
+        self.rankings.added(country)
+        if self.journal:
+            self.journal.append("create", country.name, country=country.to_dict())
+
+    def country_deleted(self, name: str) -> None:
+        """Record the deletion of a country."""
+        self.rankings.removed(name)
+        if self.journal:
+            self.journal.append("delete", name)
+
+    def country_changed(self, name: str, *fields: str) -> None:
+        """Record the new values of changed country attributes."""
+        if self.rankings.active:
+            self.rankings.changed(self.countries[name], fields)
+        if self.journal:
+            country = self.countries[name]
+            self.journal.append("set", name, fields={field: getattr(country, field) for field in fields})
+
+    def resource_changed(self, name: str, resource: str) -> None:
+        """Record the new amount of a country's resource."""
+        if self.journal:
+            self.journal.append("resource", name, resource=resource,
+                                amount=self.countries[name].resources[resource])
+
+    def relation_added(self, name: str, relation: str, other: str) -> None:
+        """Record a new ally or enemy ('allies' or 'enemies') of a country."""
+        if self.journal:
+            self.journal.append(relation, name, other=other)
+
+    def run(self, command: Command) -> bool:
+        """Carry out a command from a menu and show its outcome; return whether it was applied."""
+        try:
+            message = self.commands.execute(command)
+        except CommandError as error:
+            print(error)
+            return False
+        if message:
+            print(message)
+        return True
+
+    def add_country(self, name: str, capital: str, population: int, gdp: float, military_strength: int,
+                    resources: Dict[str, int]) -> Country:
+        """Create a country and add it to the world."""
+        country = Country(name, capital, population, gdp, military_strength)
+        for resource, amount in resources.items():
+            country.add_resource(resource, amount)
+        self.countries[name] = country
+        country.join(self.relations)
+        self.economy.add(country)
+        self.country_created(country)
+        return country
+
+    def remove_country(self, name: str) -> None:
+        """Remove a country from the world."""
+        country = self.countries[name]
+        if country.economy is not None:
+            country.economy.remove(country)
+        del self.countries[name]
+        self.relations.remove_country(name)
+        self.country_deleted(name)
 
     def create_country(self) -> None:
         """Create a new country based on user input."""
@@ -86,18 +258,15 @@ class CustomCountriesMaker:
         gdp = float(input("Enter GDP (in billions): "))
         military_strength = int(input("Enter military strength (1-100): "))
 
-        country = Country(name, capital, population, gdp, military_strength)
-
         # Add resources
+        resources: Dict[str, int] = {}
         while True:
             resource = input("Enter a resource (or press Enter to finish): ")
             if not resource:
                 break
-            amount = int(input(f"Enter amount of {resource}: "))
-            country.add_resource(resource, amount)
+            resources[resource] = int(input(f"Enter amount of {resource}: "))
 
-        self.countries[name] = country
-        print(f"{name} has been created successfully!")
+        self.run(CreateCountry(name, capital, population, gdp, military_strength, resources))
 
     def list_countries(self) -> None:
         """List all created countries."""
@@ -128,8 +297,7 @@ class CustomCountriesMaker:
     def modify_country(self) -> None:
         """Modify an existing country's attributes."""
         name = input("Enter country name to modify: ")
-        country = self.countries.get(name)
-        if country:
+        if name in self.countries:
             print(f"\n=== Modifying {name} ===")
             print("1. Change population")
             print("2. Change GDP")
@@ -142,44 +310,41 @@ class CustomCountriesMaker:
 
             choice = input("Enter your choice (1-8): ")
             if choice == "1":
-                country.population = int(input("Enter new population: "))
+                command = SetAttribute(name, "population", int(input("Enter new population: ")))
             elif choice == "2":
-                country.gdp = float(input("Enter new GDP (in billions): "))
+                command = SetAttribute(name, "gdp", float(input("Enter new GDP (in billions): ")))
             elif choice == "3":
-                country.military_strength = int(input("Enter new military strength (1-100): "))
+                command = SetAttribute(name, "military_strength", int(input("Enter new military strength (1-100): ")))
             elif choice == "4":
                 resource = input("Enter resource name: ")
-                amount = int(input(f"Enter amount of {resource}: "))
-                country.add_resource(resource, amount)
+                command = SetResource(name, resource, int(input(f"Enter amount of {resource}: ")))
             elif choice == "5":
-                ally = input("Enter ally country name: ")
-                country.add_ally(ally)
+                command = AddAlly(name, input("Enter ally country name: "))
             elif choice == "6":
-                enemy = input("Enter enemy country name: ")
-                country.add_enemy(enemy)
+                command = AddEnemy(name, input("Enter enemy country name: "))
             elif choice == "7":
-                country.increase_technology()
-                print(f"Technology level increased to {country.technology_level}")
+                command = IncreaseTechnology(name)
             elif choice == "8":
-                amount = float(input("Enter happiness adjustment (-100 to 100): "))
-                country.adjust_happiness(amount)
+                command = AdjustHappiness(name, float(input("Enter happiness adjustment (-100 to 100): ")))
             else:
                 print("Invalid choice.")
-            print(f"{name} has been modified successfully!")
+                return
+            if self.run(command):
+                print(f"{name} has been modified successfully!")
         else:
             print(f"Country '{name}' not found.")
 
     def delete_country(self) -> None:
         """Delete an existing country."""
-        name = input("Enter country name to delete: ")
-        if name in self.countries:
-            del self.countries[name]
-            print(f"{name} has been deleted successfully!")
-        else:
-            print(f"Country '{name}' not found.")
+        self.run(DeleteCountry(input("Enter country name to delete: ")))
 
     def save_countries(self) -> None:
         """Save all countries to a JSON file."""
+        if self.journal:
+            # The journal already holds every change; the snapshot is rewritten by compaction
+            self.journal.flush()
+            print("Countries saved successfully!")
+            return
         data = {name: country.to_dict() for name, country in self.countries.items()}
         with open("countries.json", "w") as f:
             json.dump(data, f, indent=2)
@@ -187,13 +352,53 @@ class CustomCountriesMaker:
 
     def load_countries(self) -> None:
         """Load countries from a JSON file."""
-        if os.path.exists("countries.json"):
-            with open("countries.json", "r") as f:
-                data = json.load(f)
-            self.countries = {name: Country.from_dict(country_data) for name, country_data in data.items()}
-            print("Countries loaded successfully!")
+        if self.journal:
+            data = self.journal.load()
+        elif os.path.exists("countries.json"):
+            data, _ = read_snapshot("countries.json")  # Also reads snapshots written by compaction
         else:
             print("No saved countries found.")
+            return
+        self.countries = {name: Country.from_dict(country_data) for name, country_data in data.items()}
+        self.relations = Diplomacy()
+        self.economy = Economy(len(self.countries))
+        for country in self.countries.values():
+            country.join(self.relations)
+            self.economy.add(country)
+        self.rankings = Rankings(self.economy)
+        print("Countries loaded successfully!" if data else "No saved countries found.")
+
+    def save_world(self, path: str = "countries.world") -> None:
+        """Save all countries to a binary world file."""
+        from WorldFormat import save_world
+        save_world(path, self.countries)
+        print("World saved successfully!")
+
+    def load_world(self, path: str = "countries.world") -> None:
+        """Open a binary world file; countries are only read when they are accessed."""
+        if os.path.exists(path):
+            from WorldFormat import load_world
+            self.countries = load_world(path)
+            world = self.countries.world
+            diplomacy = self.relations = Diplomacy()
+
+            def load_relations():
+                for index in range(world.count):
+                    diplomacy.add_country(world.name(index), world.related_names("allies", index),
+                                          world.related_names("enemies", index))
+            # Relations are read from the file on first use; countries join the graph as they are built
+            diplomacy.defer(load_relations)
+            economy = self.economy = Economy.from_columns({name: world.column(name) for name in FIELDS},
+                                                          world.resource_totals, world.names)
+
+            def on_load(country: Country, row: int) -> None:
+                country.diplomacy = diplomacy
+                economy.attach(country, row)
+            self.countries.on_load = on_load
+            self.rankings = Rankings(economy)
+            print("World loaded successfully!")
+        else:
+            print("No saved world found.")
 
     def start_game(self) -> None:
         """Start the game with the created countries."""
@@ -243,6 +448,18 @@ class CustomCountriesMaker:
             else:
                 print("Invalid choice. Please try again.")
 
+    def end_turn(self) -> None:
+        """End the year and advance the economy of every country."""
+        self.run(EndTurn())
+
+    def advance_year(self) -> None:
+        """Advance the economy of every country by a year."""
+        self.economy.end_turn()
+        self.rankings.refresh(*TURN_FIELDS)
+        if self.journal:
+            self.journal.append("turn", "")
+        self.game_year += 1
+
     def manage_resources(self) -> None:
         """Manage country resources."""
         country = self.countries[self.player_country]
@@ -255,13 +472,9 @@ class CustomCountriesMaker:
         if resource in country.resources:
             action = input("Do you want to (I)ncrease or (D)ecrease the resource? ").lower()
             if action == 'i':
-                amount = int(input("Enter amount to increase: "))
-                country.resources[resource] += amount
-                print(f"{resource} increased by {amount}")
+                self.run(ChangeResource(self.player_country, resource, int(input("Enter amount to increase: "))))
             elif action == 'd':
-                amount = int(input("Enter amount to decrease: "))
-                country.resources[resource] = max(0, country.resources[resource] - amount)
-                print(f"{resource} decreased by {amount}")
+                self.run(ChangeResource(self.player_country, resource, -int(input("Enter amount to decrease: "))))
             else:
                 print("Invalid action.")
         elif resource:
@@ -280,31 +493,16 @@ class CustomCountriesMaker:
             print("Allies:", ", ".join(country.allies))
             print("Enemies:", ", ".join(country.enemies))
         elif choice == "2":
-            ally = input("Enter country name to propose alliance: ")
-            if ally in self.countries and ally != self.player_country:
-                if random.random() < 0.7:  # 70% chance of success
-                    country.add_ally(ally)
-                    self.countries[ally].add_ally(self.player_country)
-                    print(f"Alliance with {ally} established!")
-                else:
-                    print(f"{ally} rejected your alliance proposal.")
-            else:
-                print("Invalid country name.")
+            self.run(ProposeAlliance(self.player_country, input("Enter country name to propose alliance: ")))
         elif choice == "3":
-            enemy = input("Enter country name to declare rivalry: ")
-            if enemy in self.countries and enemy != self.player_country:
-                country.add_enemy(enemy)
-                self.countries[enemy].add_enemy(self.player_country)
-                print(f"Rivalry with {enemy} declared!")
-            else:
-                print("Invalid country name.")
+            self.run(DeclareRivalry(self.player_country, input("Enter country name to declare rivalry: ")))
         else:
             print("Invalid choice.")
 
     def invest_in_technology(self) -> None:
         """Invest in technology to increase the country's technology level."""
         country = self.countries[self.player_country]
-        cost = country.technology_level * 1000000000  # Cost increases with each level
+        cost = InvestInTechnology.cost(country)
         print(f"\n=== Invest in Technology ===")
         print(f"Current technology level: {country.technology_level}")
         print(f"Cost to upgrade: ${cost/1000000000:.2f} billion")
@@ -312,10 +510,7 @@ class CustomCountriesMaker:
         if country.gdp >= cost:
             choice = input("Do you want to invest in technology? (y/n): ").lower()
             if choice == 'y':
-                country.gdp -= cost
-                country.increase_technology()
-                print(f"Technology level increased to {country.technology_level}!")
-                country.adjust_happiness(5)  # People are happy with technological progress
+                self.run(InvestInTechnology(self.player_country))
             else:
                 print("Investment cancelled.")
         else:
@@ -331,30 +526,19 @@ class CustomCountriesMaker:
 
         choice = input("Enter your choice (1-3): ")
         if choice == "1":
-            cost = country.military_strength * 1000000000
+            cost = IncreaseMilitary.cost(country)
             print(f"Cost to increase military strength: ${cost/1000000000:.2f} billion")
             if country.gdp >= cost:
                 confirm = input("Do you want to increase military strength? (y/n): ").lower()
                 if confirm == 'y':
-                    country.gdp -= cost
-                    country.military_strength += 5
-                    print(f"Military strength increased to {country.military_strength}!")
-                    country.adjust_happiness(-2)  # People are slightly unhappy with military spending
+                    self.run(IncreaseMilitary(self.player_country))
                 else:
                     print("Action cancelled.")
             else:
                 print("Insufficient funds to increase military strength.")
         elif choice == "2":
             print("Conducting military exercise...")
-            success = random.random() < 0.8  # 80% chance of successful exercise
-            if success:
-                print("Military exercise was successful!")
-                country.military_strength += 2
-                country.adjust_happiness(1)
-            else:
-                print("Military exercise faced some challenges.")
-                country.military_strength -= 1
-                country.adjust_happiness(-1)
+            self.run(MilitaryExercise(self.player_country))
         elif choice == "3":
             target = input("Enter the name of the country to declare war on: ")
             if target in self.countries and target != self.player_country:
@@ -370,15 +554,16 @@ class CustomCountriesMaker:
 
     def conduct_war(self, attacker: str, defender: str) -> None:
         """Simulate a war between two countries."""
-        attacker_country = self.countries[attacker]
-        defender_country = self.countries[defender]
-
-        print(f"\n=== War: {attacker} vs {defender} ===")
-
-        attacker_strength = attacker_country.military_strength * (1 + 0.1 * attacker_country.technology_level)
-        defender_strength = defender_country.military_strength * (1 + 0.1 * defender_country.technology_level)
-
-        if attacker_strength > defender_strength:
-            winner = attacker
-            
-            winner.capitalize()
\ No newline at end of file
+        self.run(DeclareWar(attacker, defender))
+
+    def wage_wars(self, wars: List[Tuple[str, str]]) -> WarReport:
+        """Resolve many simultaneous (attacker, defender) wars in one batch."""
+        report = resolve_wars(self.countries, wars)
+        if self.journal or self.rankings.active:
+            for name in {name for war in wars for name in war}:
+                self.country_changed(name, "military_strength", "gdp", "happiness")
+        if self.journal:
+            for attacker, defender in wars:
+                self.relation_added(attacker, "enemies", defender)
+                self.relation_added(defender, "enemies", attacker)
+        return report
@@ -0,0 +1,195 @@
+
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+SMALL_DEGREE = 8  # Neighbours are kept in a tuple up to this many, in a set beyond
+
+class RelationGraph:
+    """Symmetric relation between countries, such as alliances, over integer country ids.
+
+    Most countries have only a few relations, so their neighbours are a small tuple rather than a
+    set; countries without relations share the empty tuple.
+    """
+
+    def __init__(self, ids: Dict[str, int], names: List[str]):
+        self._ids = ids  # Shared with the other graphs of the same Diplomacy
+        self._names = names
+        self._adjacency: List[Union[Tuple[int, ...], Set[int]]] = []
+        self._load: Optional[Callable[[], None]] = None  # Deferred loading, see Diplomacy.defer
+
+    def _id(self, name: str) -> int:
+        if self._load:
+            self._load()
+        country_id = self._ids.get(name)
+        if country_id is None:
+            country_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return country_id
+
+    def _neighbour_ids(self, name: str) -> Collection[int]:
+        if self._load:
+            self._load()
+        country_id = self._ids.get(name)
+        if country_id is None or country_id >= len(self._adjacency):
+            return ()
+        return self._adjacency[country_id]
+
+    def _link(self, country_id: int, other_id: int) -> None:
+        neighbours = self._adjacency[country_id]
+        if other_id in neighbours:
+            return
+        if isinstance(neighbours, set):
+            neighbours.add(other_id)
+        elif len(neighbours) < SMALL_DEGREE:
+            self._adjacency[country_id] = neighbours + (other_id,)
+        else:
+            self._adjacency[country_id] = {*neighbours, other_id}
+
+    def _unlink(self, country_id: Optional[int], other_id: Optional[int]) -> None:
+        if country_id is None or country_id >= len(self._adjacency):
+            return
+        neighbours = self._adjacency[country_id]
+        if other_id not in neighbours:
+            return
+        if isinstance(neighbours, set):
+            neighbours.discard(other_id)
+            if len(neighbours) <= SMALL_DEGREE // 2:
+                self._adjacency[country_id] = tuple(neighbours)
+        else:
+            self._adjacency[country_id] = tuple(neighbour for neighbour in neighbours if neighbour != other_id)
+
+    def _named(self, ids: Iterable[int]) -> List[str]:
+        return [self._names[country_id] for country_id in sorted(ids)]
+
+    def add(self, first: str, second: str) -> None:
+        """Relate two countries to each other."""
+        first_id, second_id = self._id(first), self._id(second)
+        if len(self._adjacency) < len(self._names):
+            self._adjacency.extend([()] * (len(self._names) - len(self._adjacency)))
+        self._link(first_id, second_id)
+        self._link(second_id, first_id)
+
+    def remove(self, first: str, second: str) -> None:
+        """Remove the relation between two countries, on both sides."""
+        if self._load:
+            self._load()
+        first_id, second_id = self._ids.get(first), self._ids.get(second)
+        self._unlink(first_id, second_id)
+        self._unlink(second_id, first_id)
+
+    def clear(self, name: str) -> None:
+        """Remove every relation of a country, on both sides."""
+        for other in self.neighbours(name):
+            self.remove(name, other)
+
+    def set_neighbours(self, name: str, others: Iterable[str]) -> None:
+        """Replace every relation of a country."""
+        self.clear(name)
+        for other in others:
+            self.add(name, other)
+
+    def related(self, first: str, second: str) -> bool:
+        neighbours = self._neighbour_ids(first)
+        return self._ids.get(second, -1) in neighbours
+
+    def neighbours(self, name: str) -> List[str]:
+        return self._named(self._neighbour_ids(name))
+
+    def degree(self, name: str) -> int:
+        return len(self._neighbour_ids(name))
+
+    def common(self, first: str, second: str) -> List[str]:
+        """Countries related to both countries."""
+        return self._named(set(self._neighbour_ids(first)).intersection(self._neighbour_ids(second)))
+
+    def shares_neighbour(self, first: str, second: str) -> bool:
+        """Whether any country is related to both countries."""
+        first_ids, second_ids = self._neighbour_ids(first), self._neighbour_ids(second)
+        if len(first_ids) > len(second_ids):
+            first_ids, second_ids = second_ids, first_ids
+        return any(country_id in second_ids for country_id in first_ids)
+
+    def second_degree(self, name: str) -> List[str]:
+        """Countries related to a neighbour of the country but not to the country itself."""
+        direct = self._neighbour_ids(name)
+        found: Set[int] = set()
+        for neighbour in direct:
+            found.update(self._adjacency[neighbour])
+        found.difference_update(direct)
+        found.discard(self._ids.get(name))
+        return self._named(found)
+
+    def component(self, name: str) -> List[str]:
+        """Every country reachable from the country through the relation, including itself."""
+        neighbours = self._neighbour_ids(name)
+        if not neighbours:
+            return [name]
+        start = self._ids[name]
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            country_id = frontier.pop()
+            for neighbour in self._adjacency[country_id]:
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    frontier.append(neighbour)
+        return self._named(seen)
+
+    def components(self) -> List[List[str]]:
+        """Every group of two or more connected countries."""
+        if self._load:
+            self._load()
+        seen: Set[int] = set()
+        groups = []
+        for country_id, neighbours in enumerate(self._adjacency):
+            if neighbours and country_id not in seen:
+                group = self.component(self._names[country_id])
+                seen.update(self._ids[member] for member in group)
+                groups.append(group)
+        return groups
+
+class Diplomacy:
+    """World-wide alliances and rivalries; both relations are symmetric."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self.alliances = RelationGraph(self._ids, self._names)
+        self.rivalries = RelationGraph(self._ids, self._names)
+
+    def add_country(self, name: str, allies: Iterable[str] = (), enemies: Iterable[str] = ()) -> None:
+        """Add the relations a country was saved with."""
+        for ally in allies:
+            self.alliances.add(name, ally)
+        for enemy in enemies:
+            self.rivalries.add(name, enemy)
+
+    def remove_country(self, name: str) -> None:
+        """Drop every alliance and rivalry of a deleted country, so no one keeps it as an ally or enemy."""
+        self.alliances.clear(name)
+        self.rivalries.clear(name)
+
+    def defer(self, load: Callable[[], None]) -> None:
+        """Postpone adding saved relations with `load` until the relations are first used."""
+        def run():
+            self.alliances._load = self.rivalries._load = None
+            load()
+        self.alliances._load = self.rivalries._load = run
+
+    def coalition(self, name: str) -> List[str]:
+        """The country's coalition: every country linked to it through a chain of alliances."""
+        return self.alliances.component(name)
+
+    def allied_with_both(self, first: str, second: str) -> bool:
+        """Whether any country is allied with both countries, for instance both sides of a war."""
+        return self.alliances.shares_neighbour(first, second)
+
+    def common_enemies(self, first: str, second: str) -> List[str]:
+        return self.rivalries.common(first, second)
+
+    def relation(self, first: str, second: str) -> Optional[str]:
+        """'ally', 'enemy' or None."""
+        if self.alliances.related(first, second):
+            return "ally"
+        if self.rivalries.related(first, second):
+            return "enemy"
+        return None
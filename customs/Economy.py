@@ -0,0 +1,170 @@
+
+import math
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from CustomCountries import Country
+
+# Numeric country attributes kept in the economy, with their column type and Python type
+FIELDS = {
+    "population": (np.int64, int),
+    "gdp": (np.float64, float),
+    "military_strength": (np.int64, int),
+    "technology_level": (np.int64, int),
+    "happiness": (np.float64, float),
+}
+# Attributes that end_turn changes for every country
+TURN_FIELDS = ("population", "gdp", "happiness")
+
+POPULATION_GROWTH = 0.01  # Yearly population growth at 50% happiness
+GDP_GROWTH = 0.02  # Yearly GDP growth, multiplied by the technology factor
+TECHNOLOGY_GROWTH = 0.1  # Technology factor gained per technology level
+RESOURCE_INCOME = 0.01  # GDP (in billions) earned per resource unit per year
+HAPPINESS_BASE = 50.0  # Happiness the population settles at without technology
+TECHNOLOGY_HAPPINESS = 2.0  # Settled happiness gained per technology level
+HAPPINESS_ADJUSTMENT = 0.2  # Share of the gap to the settled happiness closed per year
+
+def advance_country(data: Dict) -> None:
+    """Advance one country in to_dict form by a year, exactly as Economy.end_turn does."""
+    technology = 1 + TECHNOLOGY_GROWTH * data["technology_level"]
+    target = min(HAPPINESS_BASE + TECHNOLOGY_HAPPINESS * data["technology_level"], 100.0)
+    growth = POPULATION_GROWTH * (data["happiness"] / 50)
+    data["population"] += math.floor(data["population"] * growth)
+    data["gdp"] += data["gdp"] * (GDP_GROWTH * technology) + RESOURCE_INCOME * sum(data["resources"].values())
+    data["happiness"] += HAPPINESS_ADJUSTMENT * (target - data["happiness"])
+
+class Economy:
+    """Numeric state of every country in one column per attribute, advanced a year at a time.
+
+    A country that has joined the economy reads and writes its population, GDP, military strength,
+    technology level and happiness here through its row. Per-country Python work in end_turn is
+    limited to the dirty countries, whose resources changed since the last turn.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros(capacity, dtype) for name, (dtype, _) in FIELDS.items()}
+        self.resource_total = np.zeros(capacity, dtype=np.int64)
+        self.size = 0  # Rows in use, including free ones
+        self._free: List[int] = []
+        self._dirty: Dict[int, "Country"] = {}
+        self._owned = True  # False while the columns are views of a world file
+        self._load_resource_total: Optional[Callable[[], np.ndarray]] = None
+        self._names: List[Optional[str]] = []
+        self._load_names: Optional[Callable[[], List[str]]] = None
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], resource_total: Callable[[], np.ndarray],
+                     names: Callable[[], List[str]]) -> "Economy":
+        """Economy over existing columns, such as those of a world file; row i is country i.
+
+        The columns are only copied, and the resource totals only computed by calling
+        `resource_total`, when the economy first changes; `names` is only called when the
+        country names of the rows are first needed.
+        """
+        economy = cls(0)
+        economy.columns = dict(columns)
+        economy.size = len(next(iter(columns.values())))
+        economy.resource_total = None
+        economy._owned = False
+        economy._load_resource_total = resource_total
+        economy._load_names = names
+        return economy
+
+    @property
+    def names(self) -> List[Optional[str]]:
+        """Name of the country in each row, None for free rows."""
+        if self._load_names:
+            self._names = list(self._load_names())
+            self._load_names = None
+        return self._names
+
+    def _writable(self) -> None:
+        if not self._owned:
+            self.columns = {name: np.array(column, dtype=FIELDS[name][0]) for name, column in self.columns.items()}
+            self._owned = True
+        if self._load_resource_total:
+            self.resource_total = np.array(self._load_resource_total(), dtype=np.int64)
+            self._load_resource_total = None
+
+    def _grow(self) -> None:
+        capacity = max(2 * len(self.resource_total), 1024)
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+        grown = np.zeros(capacity, np.int64)
+        grown[:self.size] = self.resource_total[:self.size]
+        self.resource_total = grown
+
+    def add(self, country: "Country") -> int:
+        """Move a country's numeric attributes into the economy and return its row."""
+        self._writable()
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self.size == len(self.resource_total):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.names.append(None)
+        self.names[row] = country.name
+        for name in FIELDS:
+            self.columns[name][row] = getattr(country, name)
+        self.resource_total[row] = country.resources.total()
+        self.attach(country, row)
+        return row
+
+    def attach(self, country: "Country", row: int) -> None:
+        """Make a country a view of a row that already holds its values."""
+        country.economy = self
+        country.row = row
+
+    def remove(self, country: "Country") -> None:
+        """Take a country out of the economy; it keeps its values as plain attributes."""
+        row = country.row
+        values = {name: self.get(row, name) for name in FIELDS}
+        self._writable()
+        for column in self.columns.values():
+            column[row] = 0
+        self.resource_total[row] = 0
+        self.names[row] = None
+        self._free.append(row)
+        self._dirty.pop(row, None)
+        country.economy = None
+        country.row = -1
+        for name, value in values.items():
+            setattr(country, name, value)
+
+    def get(self, row: int, name: str):
+        return FIELDS[name][1](self.columns[name][row])
+
+    def set(self, row: int, name: str, value) -> None:
+        if not self._owned:
+            self._writable()
+        self.columns[name][row] = value
+
+    def mark_dirty(self, country: "Country") -> None:
+        """Note that the country's resources changed, so end_turn recomputes its resource income."""
+        self._dirty[country.row] = country
+
+    def end_turn(self) -> None:
+        """Advance every country by one year."""
+        self._writable()
+        for row, country in self._dirty.items():
+            self.resource_total[row] = country.resources.total()
+        self._dirty.clear()
+
+        size = self.size
+        population = self.columns["population"][:size]
+        gdp = self.columns["gdp"][:size]
+        happiness = self.columns["happiness"][:size]
+        technology_level = self.columns["technology_level"][:size]
+
+        technology = 1 + TECHNOLOGY_GROWTH * technology_level
+        target = np.minimum(HAPPINESS_BASE + TECHNOLOGY_HAPPINESS * technology_level, 100.0)
+        growth = POPULATION_GROWTH * (happiness / 50)
+        population += np.floor(population * growth).astype(np.int64)
+        gdp += gdp * (GDP_GROWTH * technology) + RESOURCE_INCOME * self.resource_total[:size]
+        happiness += HAPPINESS_ADJUSTMENT * (target - happiness)
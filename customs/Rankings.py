@@ -0,0 +1,320 @@
+
+import random
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from Economy import FIELDS, Economy
+
+if TYPE_CHECKING:
+    from CustomCountries import Country
+
+MAX_LEVEL = 32  # Enough for 2**32 keys
+REKEY_SHARE = 16  # Re-key a whole index when more than 1 in this many of its countries changed
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.next: List["_Node"] = [None] * level
+        self.width: List[int] = [0] * level  # Positions skipped by each link
+
+class IndexableSkipList:
+    """Sorted keys with positional access.
+
+    Insertion, removal, the position of a key and the key at a position all take expected
+    O(log n) time; every link records how many positions it skips.
+    """
+
+    def __init__(self, keys: Iterable = ()):
+        self._random = random.Random(0)  # Only shapes the list, never its contents
+        self.build(keys)
+
+    def _level(self) -> int:
+        bits = self._random.getrandbits(MAX_LEVEL - 1)
+        return (bits ^ (bits + 1)).bit_length()  # 1 + number of trailing one bits
+
+    def build(self, keys: Iterable) -> None:
+        """Replace the contents with keys that are already sorted, in O(n)."""
+        self._head = _Node(None, MAX_LEVEL)
+        self._tail = _Node(None, 0)
+        self._levels = 1
+        last = [self._head] * MAX_LEVEL
+        last_position = [0] * MAX_LEVEL
+        position = 0
+        for position, key in enumerate(keys, 1):
+            level = self._level()
+            node = _Node(key, level)
+            for i in range(level):
+                last[i].next[i] = node
+                last[i].width[i] = position - last_position[i]
+                last[i] = node
+                last_position[i] = position
+            if level > self._levels:
+                self._levels = level
+        self._size = position
+        for i in range(MAX_LEVEL):
+            last[i].next[i] = self._tail
+            last[i].width[i] = position + 1 - last_position[i]
+
+    def assign(self, keys: Sequence) -> None:
+        """Replace every key with sorted keys, as many as there are now, without relinking.
+
+        The links and their widths only depend on positions, so the nodes can take new keys in order.
+        """
+        if len(keys) != self._size:
+            raise ValueError(f"{len(keys)} keys for a skip list of {self._size}")
+        node = self._head.next[0]
+        for key in keys:
+            node.key = key
+            node = node.next[0]
+
+    def _path(self, key) -> Tuple[List[_Node], List[int]]:
+        """Last node before `key` on every level, with its position."""
+        chain = [self._head] * self._levels
+        positions = [0] * self._levels
+        node, position, tail = self._head, 0, self._tail
+        for i in range(self._levels - 1, -1, -1):
+            following = node.next[i]
+            while following is not tail and following.key < key:
+                position += node.width[i]
+                node = following
+                following = node.next[i]
+            chain[i] = node
+            positions[i] = position
+        return chain, positions
+
+    def insert(self, key) -> None:
+        level = self._level()
+        if level > self._levels:
+            for i in range(self._levels, level):
+                self._head.next[i] = self._tail
+                self._head.width[i] = self._size + 1
+            self._levels = level
+        chain, positions = self._path(key)
+        node = _Node(key, level)
+        position = positions[0] + 1
+        for i in range(level):
+            before = chain[i]
+            node.next[i] = before.next[i]
+            node.width[i] = positions[i] + before.width[i] + 1 - position
+            before.next[i] = node
+            before.width[i] = position - positions[i]
+        for i in range(level, self._levels):
+            chain[i].width[i] += 1
+        self._size += 1
+
+    def remove(self, key) -> None:
+        chain, _ = self._path(key)
+        node = chain[0].next[0]
+        if node is self._tail or node.key != key:
+            raise KeyError(key)
+        level = len(node.next)
+        for i in range(level):
+            chain[i].next[i] = node.next[i]
+            chain[i].width[i] += node.width[i] - 1
+        for i in range(level, self._levels):
+            chain[i].width[i] -= 1
+        self._size -= 1
+
+    def index(self, key) -> int:
+        """Position of a key; ValueError if it is not in the list."""
+        chain, positions = self._path(key)
+        node = chain[0].next[0]
+        if node is self._tail or node.key != key:
+            raise ValueError(f"{key!r} is not in the list")
+        return positions[0]
+
+    def count(self, before: Callable[[object], bool]) -> int:
+        """Number of leading keys for which `before` holds; it must hold for a prefix of the list."""
+        node, position, tail = self._head, 0, self._tail
+        for i in range(self._levels - 1, -1, -1):
+            following = node.next[i]
+            while following is not tail and before(following.key):
+                position += node.width[i]
+                node = following
+                following = node.next[i]
+        return position
+
+    def _node(self, index: int) -> _Node:
+        if not 0 <= index < self._size:
+            raise IndexError("skip list index out of range")
+        target = index + 1
+        node, position = self._head, 0
+        for i in range(self._levels - 1, -1, -1):
+            while position + node.width[i] <= target:
+                position += node.width[i]
+                node = node.next[i]
+        return node
+
+    def __getitem__(self, index: int):
+        return self._node(index).key
+
+    def slice(self, start: int, stop: int) -> Iterator:
+        """Keys from position start up to, not including, stop."""
+        stop = min(stop, self._size)
+        if start >= stop:
+            return
+        node = self._node(start)
+        for _ in range(stop - start):
+            yield node.key
+            node = node.next[0]
+
+    def __iter__(self) -> Iterator:
+        return self.slice(0, self._size)
+
+    def __len__(self) -> int:
+        return self._size
+
+class RankIndex:
+    """Countries ordered by one attribute, highest first; countries with equal values are ordered by name."""
+
+    def __init__(self, field: str, values: Iterable[Tuple[str, object]] = ()):
+        self.field = field
+        self._keys: Dict[str, Tuple[object, str]] = {}
+        self._order = IndexableSkipList()
+        self.rebuild(values)
+
+    def rebuild(self, values: Iterable[Tuple[str, object]]) -> None:
+        """Index (name, value) pairs from scratch in O(n log n)."""
+        self._keys = {name: (-value, name) for name, value in values}
+        self._order.build(sorted(self._keys.values()))
+
+    def rekey(self, values: Iterable[Tuple[str, object]]) -> None:
+        """Take new values for the same countries at once, reusing the skip list.
+
+        The new keys are sorted from the current order, which is nearly sorted after a turn.
+        """
+        keys = {name: (-value, name) for name, value in values}
+        if keys.keys() != self._keys.keys():
+            self._keys = keys
+            self._order.build(sorted(keys.values()))
+            return
+        ordered = sorted([keys[name] for _, name in self._order])
+        self._keys = keys
+        self._order.assign(ordered)
+
+    def update(self, name: str, value) -> None:
+        """Add a country or move it to its new value."""
+        key = (-value, name)
+        old = self._keys.get(name)
+        if old == key:
+            return
+        if old is not None:
+            self._order.remove(old)
+        self._order.insert(key)
+        self._keys[name] = key
+
+    def discard(self, name: str) -> None:
+        key = self._keys.pop(name, None)
+        if key is not None:
+            self._order.remove(key)
+
+    def top(self, count: int) -> List[Tuple[str, object]]:
+        """The `count` highest (name, value) pairs, highest first."""
+        return [(name, -value) for value, name in self._order.slice(0, count)]
+
+    def rank(self, name: str) -> int:
+        """1 for the country with the highest value."""
+        return self._order.index(self._keys[name]) + 1
+
+    def between(self, low, high) -> List[Tuple[str, object]]:
+        """(name, value) pairs with low <= value <= high, highest first."""
+        start = self._order.count(lambda key: key[0] < -high)
+        stop = self._order.count(lambda key: key[0] <= -low)
+        return [(name, -value) for value, name in self._order.slice(start, stop)]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+class Rankings:
+    """Rank indexes over the numeric attributes of the countries of an economy.
+
+    An index is built from the economy's columns the first time its attribute is queried, without
+    building Country objects. It is then kept up to date through added, removed and changed, and
+    by refresh after changes to many countries at once, such as the end of a turn.
+    """
+
+    def __init__(self, economy: Economy):
+        self.economy = economy
+        self._indexes: Dict[str, RankIndex] = {}
+        self._synced: Dict[str, np.ndarray] = {}  # Column values each index last took from the economy
+
+    @property
+    def active(self) -> bool:
+        """Whether any index has been built and needs to be kept up to date."""
+        return bool(self._indexes)
+
+    def _column_values(self, field: str) -> List[Tuple[str, object]]:
+        economy = self.economy
+        values = economy.columns[field][:economy.size].tolist()
+        return [(name, value) for name, value in zip(economy.names, values) if name is not None]
+
+    def index(self, field: str) -> RankIndex:
+        index = self._indexes.get(field)
+        if index is None:
+            if field not in FIELDS:
+                raise ValueError(f"Countries cannot be ranked by {field!r}")
+            index = self._indexes[field] = RankIndex(field, self._column_values(field))
+            self._synced[field] = self.economy.columns[field][:self.economy.size].copy()
+        return index
+
+    def top(self, field: str, count: int) -> List[Tuple[str, object]]:
+        """The `count` countries with the highest value of an attribute, as (name, value) pairs."""
+        return self.index(field).top(count)
+
+    def rank(self, field: str, name: str) -> int:
+        """Position of a country by an attribute, 1 being the highest."""
+        return self.index(field).rank(name)
+
+    def between(self, field: str, low, high) -> List[Tuple[str, object]]:
+        """Countries whose attribute lies between low and high inclusive, highest first."""
+        return self.index(field).between(low, high)
+
+    def added(self, country: "Country") -> None:
+        for field, index in self._indexes.items():
+            index.update(country.name, getattr(country, field))
+
+    def removed(self, name: str) -> None:
+        for index in self._indexes.values():
+            index.discard(name)
+
+    def changed(self, country: "Country", fields: Iterable[str]) -> None:
+        for field in fields:
+            index = self._indexes.get(field)
+            if index is not None:
+                index.update(country.name, getattr(country, field))
+
+    def refresh(self, *fields: str) -> None:
+        """Catch up with changes made directly to the economy's columns, such as end_turn.
+
+        Only rows whose value changed are moved; when most of them did, the index is re-keyed in
+        one pass instead.
+        """
+        economy = self.economy
+        for field in fields:
+            index = self._indexes.get(field)
+            if index is None:
+                continue
+            column = economy.columns[field][:economy.size]
+            synced = self._synced[field]
+            common = min(len(column), len(synced))
+            rows = np.flatnonzero(column[:common] != synced[:common])
+            if len(rows) * REKEY_SHARE > len(index):
+                index.rekey(self._column_values(field))
+            else:
+                names = economy.names
+                for row, value in zip(rows.tolist(), column[rows].tolist()):
+                    if names[row] is not None:
+                        index.update(names[row], value)
+            self._synced[field] = column.copy()
+
+    def invalidate(self, *fields: str) -> None:
+        """Drop the indexes of some attributes, or of all of them, to be rebuilt when next queried."""
+        for field in fields or list(self._indexes):
+            self._indexes.pop(field, None)
+            self._synced.pop(field, None)
@@ -0,0 +1,115 @@
+
+import numbers
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from CustomCountries import Country
+
+# World-wide resource registry: every resource name seen so far by id, and the id of each name
+RESOURCE_NAMES: List[str] = []
+RESOURCE_IDS: Dict[str, int] = {}
+
+MAX_AMOUNT = 2 ** 63 - 1  # Amounts are stored as signed 64-bit integers
+
+def resource_id(name: str) -> int:
+    """Id of a resource name, registering the name the first time it is seen."""
+    resource = RESOURCE_IDS.get(name)
+    if resource is None:
+        resource = RESOURCE_IDS[name] = len(RESOURCE_NAMES)
+        RESOURCE_NAMES.append(sys.intern(name))
+    return resource
+
+def resource_amount(amount) -> int:
+    """An amount as stored; whole numbers such as 4 or 4.0 are kept exactly, anything else is a ValueError."""
+    if isinstance(amount, numbers.Integral):
+        value = int(amount)
+    elif isinstance(amount, numbers.Real) and float(amount).is_integer():
+        value = int(amount)
+    else:
+        raise ValueError(f"Resource amounts must be whole numbers, not {amount!r}")
+    if not -MAX_AMOUNT - 1 <= value <= MAX_AMOUNT:
+        raise ValueError(f"Resource amount out of range: {amount!r}")
+    return value
+
+def resource_array(amounts: Optional[Dict[str, int]] = None) -> array:
+    """Typed array of (resource id, amount) pairs, the storage behind a Resources view."""
+    pairs = []
+    if amounts:
+        for name, amount in amounts.items():
+            pairs.append(resource_id(name))
+            pairs.append(resource_amount(amount))
+    return array("q", pairs)
+
+class Resources(MutableMapping):
+    """A country's resources by name, stored as a flat typed array of (resource id, amount) pairs.
+
+    The pairs keep insertion order like the dict they replace. Changing an amount through the view
+    tells the country's economy to recompute its resource income.
+    """
+
+    __slots__ = ("_country",)
+
+    def __init__(self, country: "Country"):
+        self._country = country
+
+    def _position(self, name: str) -> int:
+        resource = RESOURCE_IDS.get(name)
+        if resource is not None:
+            items = self._country._resources
+            for position in range(0, len(items), 2):
+                if items[position] == resource:
+                    return position
+        return -1
+
+    def __getitem__(self, name: str) -> int:
+        position = self._position(name)
+        if position < 0:
+            raise KeyError(name)
+        return self._country._resources[position + 1]
+
+    def __setitem__(self, name: str, amount: int) -> None:
+        amount = resource_amount(amount)
+        position = self._position(name)
+        if position < 0:
+            # A new array rather than an append, which would over-allocate
+            self._country._resources = self._country._resources + array("q", (resource_id(name), amount))
+        else:
+            self._country._resources[position + 1] = amount
+        self._changed()
+
+    def __delitem__(self, name: str) -> None:
+        position = self._position(name)
+        if position < 0:
+            raise KeyError(name)
+        del self._country._resources[position:position + 2]
+        self._changed()
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._position(name) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        items = self._country._resources
+        return (RESOURCE_NAMES[resource] for resource in items[::2])
+
+    def __len__(self) -> int:
+        return len(self._country._resources) // 2
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+    def _changed(self) -> None:
+        economy = self._country.economy
+        if economy is not None:
+            economy.mark_dirty(self._country)
+
+    def copy(self) -> Dict[str, int]:
+        """The resources as a plain dict."""
+        items = self._country._resources
+        return dict(zip([RESOURCE_NAMES[resource] for resource in items[::2]], items[1::2]))
+
+    def total(self) -> int:
+        """Sum of all amounts, the basis of the country's resource income."""
+        return sum(self._country._resources[1::2])
@@ -0,0 +1,97 @@
+
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from CustomCountries import Country
+
+TECHNOLOGY_BONUS = 0.1  # Military strength multiplier per technology level
+WINNER_LOSSES = 0.1  # Share of military strength the winner loses in an even fight
+LOSER_LOSSES = 0.3  # Share of military strength the loser loses
+LOSER_GDP_LOSS = 0.2  # Share of GDP the loser loses
+SPOILS = 0.1  # Share of the loser's GDP the winner gains
+WINNER_HAPPINESS = 5.0
+LOSER_HAPPINESS = -10.0
+
+class WarReport:
+    """Outcome of a batch of wars."""
+
+    def __init__(self, wars: Sequence[Tuple[str, str]], attacker_strength: np.ndarray,
+                 defender_strength: np.ndarray, attacker_won: np.ndarray):
+        self.wars = wars
+        self.attacker_strength = attacker_strength
+        self.defender_strength = defender_strength
+        self.attacker_won = attacker_won
+
+    def winner(self, index: int) -> str:
+        attacker, defender = self.wars[index]
+        return attacker if self.attacker_won[index] else defender
+
+    def winners(self) -> List[str]:
+        return [self.winner(index) for index in range(len(self.wars))]
+
+    def __len__(self) -> int:
+        return len(self.wars)
+
+def war_strength(military_strength: np.ndarray, technology_level: np.ndarray) -> np.ndarray:
+    """Effective strength in war; technology multiplies the military strength."""
+    return military_strength * (1 + TECHNOLOGY_BONUS * technology_level)
+
+def resolve_wars(countries: Mapping[str, "Country"], wars: Sequence[Tuple[str, str]]) -> WarReport:
+    """Resolve many (attacker, defender) wars at once and apply their effects to the countries.
+
+    The wars are simultaneous: every outcome is decided from the countries as they were before the
+    batch, and a country fighting several wars takes the effects of all of them. The defender wins
+    ties. Attacker and defender become enemies.
+    """
+    index: Dict[str, int] = {}
+    participants: List["Country"] = []
+    attacker_index = np.empty(len(wars), dtype=np.intp)
+    defender_index = np.empty(len(wars), dtype=np.intp)
+    for war, (attacker, defender) in enumerate(wars):
+        if attacker == defender:
+            raise ValueError(f"{attacker} cannot go to war with itself")
+        for name, side in ((attacker, attacker_index), (defender, defender_index)):
+            position = index.get(name)
+            if position is None:
+                position = index[name] = len(participants)
+                participants.append(countries[name])
+            side[war] = position
+
+    military = np.array([country.military_strength for country in participants], dtype=np.int64)
+    technology = np.array([country.technology_level for country in participants], dtype=np.int64)
+    gdp = np.array([country.gdp for country in participants], dtype=float)
+    happiness = np.array([country.happiness for country in participants], dtype=float)
+
+    strength = war_strength(military, technology)
+    attacker_strength = strength[attacker_index]
+    defender_strength = strength[defender_index]
+    attacker_won = attacker_strength > defender_strength
+    winner = np.where(attacker_won, attacker_index, defender_index)
+    loser = np.where(attacker_won, defender_index, attacker_index)
+
+    # A close fight costs the winner more; a one-sided one costs it almost nothing
+    closeness = np.minimum(attacker_strength, defender_strength) / np.maximum(
+        np.maximum(attacker_strength, defender_strength), 1e-9)
+    count = len(participants)
+    # Effects of all wars summed per country
+    military_loss = (np.bincount(winner, np.floor(military[winner] * WINNER_LOSSES * closeness), count) +
+                     np.bincount(loser, np.floor(military[loser] * LOSER_LOSSES), count))
+    gdp_change = np.bincount(winner, gdp[loser] * SPOILS, count) - np.bincount(loser, gdp[loser] * LOSER_GDP_LOSS, count)
+    happiness_change = (np.bincount(winner, minlength=count) * WINNER_HAPPINESS +
+                        np.bincount(loser, minlength=count) * LOSER_HAPPINESS)
+
+    military = np.maximum(military - military_loss.astype(np.int64), 0).tolist()
+    gdp = np.maximum(gdp + gdp_change, 0).tolist()
+    happiness = np.clip(happiness + happiness_change, 0, 100).tolist()
+    for position, country in enumerate(participants):
+        country.military_strength = military[position]
+        country.gdp = gdp[position]
+        country.happiness = happiness[position]
+    for (attacker, defender), attacking, defending in zip(wars, [participants[i] for i in attacker_index.tolist()],
+                                                         [participants[i] for i in defender_index.tolist()]):
+        attacking.add_enemy(defender)
+        if defending.diplomacy is None or defending.diplomacy is not attacking.diplomacy:
+            defending.add_enemy(attacker)  # Not already done by the symmetric world graph
+    return WarReport(wars, attacker_strength, defender_strength, attacker_won)
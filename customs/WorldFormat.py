@@ -0,0 +1,272 @@
+
+import mmap
+import os
+import struct
+import sys
+from typing import Callable, Dict, Iterator, List, Mapping, MutableMapping, Optional, Set
+
+import numpy as np
+
+from CountryJournal import read_snapshot
+from CustomCountries import Country
+
+MAGIC = b"DYNW"
+VERSION = 1
+
+# Fixed-width numeric columns, one value per country
+COLUMNS = [
+    ("population", "<i8"),
+    ("gdp", "<f8"),
+    ("military_strength", "<i8"),
+    ("technology_level", "<i8"),
+    ("happiness", "<f8"),
+]
+
+# Every section of the file in order. Strings live once in the string table and are referred to
+# by id; allies, enemies and resources are stored as one flat array with per-country start offsets.
+SECTIONS = COLUMNS + [
+    ("name", "<i4"),
+    ("capital", "<i4"),
+    ("name_order", "<i4"),  # Country indexes sorted by name, for lookups by binary search
+    ("allies_start", "<i8"),
+    ("allies", "<i4"),
+    ("enemies_start", "<i8"),
+    ("enemies", "<i4"),
+    ("resources_start", "<i8"),
+    ("resource_name", "<i4"),
+    ("resource_amount", "<i8"),
+    ("string_start", "<i8"),
+    ("string_data", "u1"),
+]
+
+HEADER = struct.Struct(f"<4sIQ{2 * len(SECTIONS)}Q")
+
+class _StringTable:
+    """Deduplicating table of the strings written to a world file."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def add(self, text: str) -> int:
+        """Return the id of a string, adding it to the table if needed."""
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.encoded)
+            self.encoded.append(text.encode("utf-8"))
+        return string_id
+
+    def arrays(self):
+        """Return the start offsets and the concatenated bytes of all strings."""
+        lengths = np.fromiter(map(len, self.encoded), dtype="<i8", count=len(self.encoded))
+        start = np.zeros(len(self.encoded) + 1, dtype="<i8")
+        np.cumsum(lengths, out=start[1:])
+        return start, np.frombuffer(b"".join(self.encoded), dtype="u1")
+
+def save_world(path: str, countries: Mapping[str, Country]) -> None:
+    """Write countries to a binary world file."""
+    strings = _StringTable()
+    count = len(countries)
+    values = {name: [] for name, _ in COLUMNS}
+    name_ids, capital_ids = [], []
+    lists = {"allies": [], "enemies": [], "resource_name": [], "resource_amount": []}
+    starts = {"allies_start": [0], "enemies_start": [0], "resources_start": [0]}
+
+    for name, country in countries.items():
+        for column, _ in COLUMNS:
+            values[column].append(getattr(country, column))
+        name_ids.append(strings.add(name))
+        capital_ids.append(strings.add(country.capital))
+        lists["allies"].extend(map(strings.add, country.allies))
+        starts["allies_start"].append(len(lists["allies"]))
+        lists["enemies"].extend(map(strings.add, country.enemies))
+        starts["enemies_start"].append(len(lists["enemies"]))
+        for resource, amount in country.resources.items():
+            lists["resource_name"].append(strings.add(resource))
+            lists["resource_amount"].append(amount)
+        starts["resources_start"].append(len(lists["resource_name"]))
+
+    dtypes = dict(SECTIONS)
+    arrays = {name: np.array(column, dtype=dtypes[name]) for name, column in values.items()}
+    arrays["name"] = np.array(name_ids, dtype="<i4")
+    arrays["capital"] = np.array(capital_ids, dtype="<i4")
+    arrays["name_order"] = np.array(sorted(range(count), key=lambda i: strings.encoded[name_ids[i]]), dtype="<i4")
+    for name, column in list(lists.items()) + list(starts.items()):
+        arrays[name] = np.array(column, dtype=dtypes[name])
+    arrays["string_start"], arrays["string_data"] = strings.arrays()
+
+    # Sections are 8-byte aligned so every column can be viewed in place
+    layout = []
+    offset = HEADER.size
+    for name, _ in SECTIONS:
+        offset += -offset % 8
+        layout += [offset, len(arrays[name])]
+        offset += arrays[name].nbytes
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, count, *layout))
+        for index, (name, _) in enumerate(SECTIONS):
+            f.write(b"\0" * (layout[2 * index] - f.tell()))
+            f.write(arrays[name].tobytes())
+    os.replace(temporary_path, path)
+
+def _element_view(array: np.ndarray):
+    if sys.byteorder != "little":
+        return array
+    return memoryview(array).cast("B").cast(array.dtype.char)
+
+class WorldFile:
+    """Read-only view of a world file; every section is a NumPy array over the memory map."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, *layout = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a world file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported world file version {version}")
+        self.sections: Dict[str, np.ndarray] = {}
+        for index, (name, dtype) in enumerate(SECTIONS):
+            offset, length = layout[2 * index], layout[2 * index + 1]
+            self.sections[name] = np.frombuffer(self._map, dtype=dtype, count=length, offset=offset)
+        self._string_offset = layout[2 * SECTIONS.index(("string_data", "u1"))]
+        # Lookups index single elements, which is much faster through memoryviews than NumPy scalars
+        self._names = _element_view(self.sections["name"])
+        self._name_order = _element_view(self.sections["name_order"])
+        self._string_start = _element_view(self.sections["string_start"])
+        self._found: Dict[str, int] = {}  # Names already looked up, with their index or -1
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a numeric column without copying it."""
+        return self.sections[name]
+
+    def string_bytes(self, string_id: int) -> bytes:
+        return self._map[self._string_offset + self._string_start[string_id]:
+                         self._string_offset + self._string_start[string_id + 1]]
+
+    def string(self, string_id: int) -> str:
+        return self.string_bytes(string_id).decode("utf-8")
+
+    def name(self, index: int) -> str:
+        return self.string(self._names[index])
+
+    def names(self) -> List[str]:
+        """Every country name, by index."""
+        return [self.name(index) for index in range(self.count)]
+
+    def find(self, name: str) -> int:
+        """Return the index of a country by name, or -1 if it is not in the file."""
+        index = self._found.get(name)
+        if index is None:
+            index = self._found[name] = self._search(name)
+        return index
+
+    def _search(self, name: str) -> int:
+        # Binary search of the names in sorted order; only names that are looked up are decoded
+        target = name.encode("utf-8")
+        names = self._names
+        order = self._name_order
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.string_bytes(names[order[middle]]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.string_bytes(names[order[low]]) == target:
+            return order[low]
+        return -1
+
+    def resource_totals(self) -> np.ndarray:
+        """Total resource amount of every country."""
+        start = self.sections["resources_start"]
+        running_total = np.concatenate(([0], np.cumsum(self.sections["resource_amount"], dtype=np.int64)))
+        return running_total[start[1:]] - running_total[start[:-1]]
+
+    def related_names(self, list_name: str, index: int) -> List[str]:
+        """Names in the 'allies' or 'enemies' list of a country."""
+        start = self.sections[f"{list_name}_start"]
+        ids = self.sections[list_name][start[index]:start[index + 1]]
+        return [self.string(int(string_id)) for string_id in ids]
+
+    def country(self, index: int) -> Country:
+        """Build the Country object stored at an index."""
+        s = self.sections
+        country = Country(self.name(index), self.string(int(s["capital"][index])), int(s["population"][index]),
+                          float(s["gdp"][index]), int(s["military_strength"][index]))
+        start, end = s["resources_start"][index], s["resources_start"][index + 1]
+        country.resources = {self.string(int(resource)): int(amount)
+                             for resource, amount in zip(s["resource_name"][start:end], s["resource_amount"][start:end])}
+        country.allies = self.related_names("allies", index)
+        country.enemies = self.related_names("enemies", index)
+        country.technology_level = int(s["technology_level"][index])
+        country.happiness = float(s["happiness"][index])
+        return country
+
+class WorldCountries(MutableMapping):
+    """Countries of a world file by name, built only when first accessed.
+
+    Accessed, added and deleted countries are kept on top of the file, so the mapping can be
+    used like CustomCountriesMaker.countries.
+    """
+
+    def __init__(self, world: WorldFile):
+        self.world = world
+        self._loaded: Dict[str, Country] = {}
+        self._added: Set[str] = set()  # Names that are not in the file
+        self._deleted: Set[str] = set()
+        self.on_load: Optional[Callable[[Country, int], None]] = None  # Called with each country built and its index
+
+    def __getitem__(self, name: str) -> Country:
+        country = self._loaded.get(name)
+        if country is not None:
+            return country
+        index = self.world.find(name) if name not in self._deleted else -1
+        if index < 0:
+            raise KeyError(name)
+        country = self._loaded[name] = self.world.country(index)
+        if self.on_load:
+            self.on_load(country, index)
+        return country
+
+    def __setitem__(self, name: str, country: Country) -> None:
+        if name in self._deleted:
+            self._deleted.discard(name)
+        elif name not in self._loaded and self.world.find(name) < 0:
+            self._added.add(name)
+        self._loaded[name] = country
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self._loaded.pop(name, None)
+        if name in self._added:
+            self._added.discard(name)
+        else:
+            self._deleted.add(name)
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._loaded:
+            return True
+        return isinstance(name, str) and name not in self._deleted and self.world.find(name) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self.world.count):
+            name = self.world.name(index)
+            if name not in self._deleted:
+                yield name
+        yield from [name for name in self._loaded if name in self._added]
+
+    def __len__(self) -> int:
+        return self.world.count - len(self._deleted) + len(self._added)
+
+def load_world(path: str) -> WorldCountries:
+    """Open a world file; countries are read from it on demand."""
+    return WorldCountries(WorldFile(path))
+
+def convert_json_world(json_path: str, world_path: str) -> None:
+    """Convert a countries.json save into a world file."""
+    data, _ = read_snapshot(json_path)
+    save_world(world_path, {name: Country.from_dict(country) for name, country in data.items()})
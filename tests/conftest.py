@@ -0,0 +1,6 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("customs", os.path.join("QUIX", "settings")):
+    sys.path.insert(0, os.path.join(ROOT, directory))
@@ -0,0 +1,13 @@
+import math
+from typing import Sequence
+
+def assert_same_mean(sample: Sequence[float], reference: Sequence[float], sigmas: float = 4.0) -> None:
+    """Fail if two independent samples' means differ by more than `sigmas` standard errors."""
+    def mean_and_variance(values):
+        mean = sum(values) / len(values)
+        return mean, sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+    mean, variance = mean_and_variance(sample)
+    reference_mean, reference_variance = mean_and_variance(reference)
+    error = math.sqrt(variance / len(sample) + reference_variance / len(reference))
+    assert abs(mean - reference_mean) <= sigmas * error + 1e-9, (mean, reference_mean, error)
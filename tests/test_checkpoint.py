@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+import Revolts
+from Checkpoint import Checkpointer
+from EventSinks import EventSink
+from RebellionLog import RebellionLog
+from Rebellions import Country as RebellionCountry, resume_country, simulate_country
+from Unrest import UnrestCountry, resume_unrest, simulate_unrest
+
+DAYS = 3000
+INTERVAL = 1000
+
+class Interrupted(Exception):
+    pass
+
+# Stops the run right after its first snapshot, as if the process had been killed there
+class InterruptingCheckpointer(Checkpointer):
+    def save(self, snapshot):
+        super().save(snapshot)
+        raise Interrupted
+
+class ListSink(EventSink):
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append((event.kind, event.day, event.group, event.group_strength, event.government_strength))
+
+def revolt_state(country):
+    groups = [(group.name, group.strength, group.members, group.founded_day) for group in country.groups]
+    return country.stability, country.government_type, groups
+
+def rebellion_state(country):
+    rebellions = [(rebellion.ideology, rebellion.leader.name, rebellion.strength, rebellion.start_day)
+                  for rebellion in country.active_rebellions]
+    return country.stability, rebellions
+
+def revolt_country(seed):
+    rng = random.Random(seed)
+    country = Revolts.Country("Test", 1000000, 0.7)
+    Revolts.initialize_revolt_system(country, rng)
+    return country, rng
+
+@pytest.mark.parametrize("fast_forward", [False, True])
+def test_resumed_revolts_match_an_uninterrupted_run(tmp_path, fast_forward):
+    country, rng = revolt_country(5)
+    sink = ListSink()
+    Revolts.simulate_revolts(country, DAYS, rng, sink, fast_forward)
+
+    path = str(tmp_path / "revolts.gz")
+    interrupted, interrupted_rng = revolt_country(5)
+    resumed_sink = ListSink()
+    with pytest.raises(Interrupted):
+        Revolts.simulate_revolts(interrupted, DAYS, interrupted_rng, resumed_sink, fast_forward,
+                                 InterruptingCheckpointer(path, INTERVAL))
+    assert 0 < len(resumed_sink.events) < len(sink.events)
+    resumed = Revolts.resume_revolts(path, resumed_sink, Checkpointer(path, INTERVAL))
+    assert resumed_sink.events == sink.events
+    assert revolt_state(resumed) == revolt_state(country)
+
+@pytest.mark.parametrize("event_driven", [False, True])
+@pytest.mark.parametrize("with_log", [False, True])
+def test_resumed_rebellions_match_an_uninterrupted_run(tmp_path, event_driven, with_log):
+    country = RebellionCountry("Test", stability=60, military_strength=70)
+    log = RebellionLog() if with_log else None
+    events = simulate_country(country, DAYS, random.Random(5), log=log, event_driven=event_driven)
+
+    path = str(tmp_path / "rebellions.gz")
+    interrupted = RebellionCountry("Test", stability=60, military_strength=70)
+    with pytest.raises(Interrupted):
+        simulate_country(interrupted, DAYS, random.Random(5), InterruptingCheckpointer(path, INTERVAL),
+                         log=RebellionLog() if with_log else None, event_driven=event_driven)
+    resumed, resumed_events, resumed_log = resume_country(path, Checkpointer(path, INTERVAL))
+    assert resumed_events == events
+    if with_log:
+        assert len(log) > 0
+        assert list(resumed_log.messages()) == list(log.messages())
+    else:
+        assert len(events) > 0
+    assert rebellion_state(resumed) == rebellion_state(country)
+
+def unrest_country(seed):
+    rng = random.Random(seed)
+    country = UnrestCountry("Test", 1000000, 0.7, military_strength=70)
+    Revolts.initialize_revolt_system(country, rng)
+    return country, rng
+
+def test_resumed_unrest_matches_an_uninterrupted_run(tmp_path):
+    country, rng = unrest_country(5)
+    sink = ListSink()
+    events = simulate_unrest(country, DAYS, rng, sink)
+
+    path = str(tmp_path / "unrest.gz")
+    interrupted, interrupted_rng = unrest_country(5)
+    resumed_sink = ListSink()
+    with pytest.raises(Interrupted):
+        simulate_unrest(interrupted, DAYS, interrupted_rng, resumed_sink,
+                        checkpoint=InterruptingCheckpointer(path, INTERVAL))
+    assert 0 < len(resumed_sink.events) < len(sink.events)
+    resumed, resumed_events = resume_unrest(path, resumed_sink, Checkpointer(path, INTERVAL))
+    assert len(events) > 0
+    assert resumed_events == events
+    assert resumed_sink.events == sink.events
+    assert revolt_state(resumed) == revolt_state(country)
+    assert rebellion_state(resumed.rebellion_view) == rebellion_state(country.rebellion_view)
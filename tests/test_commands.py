@@ -0,0 +1,67 @@
+import io
+import json
+
+from Commands import AddAlly, AddEnemy, AdjustHappiness, CommandExecutor, CreateCountry, SetAttribute
+from CustomCountries import CustomCountriesMaker
+
+def world() -> CustomCountriesMaker:
+    maker = CustomCountriesMaker()
+    for name in ("A", "B"):
+        maker.add_country(name, "Capital", 1000, 10.0, 10, {})
+    return maker
+
+def test_bad_attribute_value_is_rejected_not_raised():
+    maker = world()
+    result = maker.commands.execute_batch([SetAttribute("A", "population", "many"),
+                                           SetAttribute("A", "gdp", None),
+                                           SetAttribute("A", "population", 5000)])
+    assert result.applied == 1
+    assert [position for position, _ in result.errors] == [0, 1]
+    assert maker.countries["A"].population == 5000
+
+def test_relations_need_an_existing_other_country():
+    maker = world()
+    result = maker.commands.execute_batch([AddAlly("A", "Atlantis"), AddEnemy("A", "A"), AddAlly("A", "B")])
+    assert result.applied == 1
+    assert maker.relations.coalition("A") == ["A", "B"]
+    assert maker.countries["A"].enemies == []
+
+def test_only_applied_commands_are_recorded():
+    maker = CustomCountriesMaker()
+    recording = io.StringIO()
+    executor = CommandExecutor(maker, recording=recording)
+    executor.execute_batch([CreateCountry("A", "Capital", 1000, 10.0, 10), CreateCountry("A", "Capital", 1, 1.0, 1),
+                            AddAlly("A", "Nowhere")])
+    records = [json.loads(line) for line in recording.getvalue().splitlines()]
+    assert [record[0] for record in records] == ["create"]
+
+def test_malformed_fields_are_rejected_in_a_batch():
+    maker = world()
+    result = maker.commands.execute_batch([CreateCountry("C", "Capital", "lots", 10.0, 10),
+                                           CreateCountry("D", "Capital", 1000, None, 10),
+                                           AdjustHappiness("A", "up"),
+                                           CreateCountry("E", "Capital", 1000, 10.0, 10),
+                                           AdjustHappiness("A", 5)])
+    assert result.applied == 2
+    assert [position for position, _ in result.errors] == [0, 1, 2]
+    assert "C" not in maker.countries and "D" not in maker.countries
+    assert "E" in maker.countries
+
+def test_replay_skips_malformed_records(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_text("\n".join([
+        '["create","A","Capital",1000,10.0,10,{}]',
+        '["create","B","Capital",null,10.0,10,{}]',
+        '["set","A","population"]',
+        '["teleport","A"]',
+        '{"kind":"end_turn"}',
+        'not json',
+        '["happiness","A",[1]]',
+        '["set","A","population",5000]',
+    ]) + "\n")
+    maker = CustomCountriesMaker()
+    result = CommandExecutor(maker).replay(str(path))
+    assert result.applied == 2
+    assert [position for position, _ in result.errors] == [1, 2, 3, 4, 5, 6]
+    assert list(maker.countries) == ["A"]
+    assert maker.countries["A"].population == 5000
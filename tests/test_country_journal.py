@@ -0,0 +1,26 @@
+from CountryJournal import CountryJournal, read_records
+
+def journal(tmp_path) -> CountryJournal:
+    return CountryJournal(str(tmp_path / "countries.journal"), str(tmp_path / "countries.json"))
+
+def country(name: str) -> dict:
+    return {"name": name, "capital": "Capital", "population": 1000, "gdp": 1.0, "military_strength": 10,
+            "resources": {}, "allies": [], "enemies": [], "technology_level": 1, "happiness": 50.0}
+
+def test_append_before_load_continues_sequence(tmp_path):
+    first = journal(tmp_path)
+    first.append("create", "A", country=country("A"))
+    first.compact(background=False)
+    first.append("create", "B", country=country("B"))
+    first.close()
+
+    second = journal(tmp_path)
+    seq = second.append("create", "C", country=country("C"))
+    second.close()
+    assert seq == 3
+
+    assert sorted(journal(tmp_path).load()) == ["A", "B", "C"]
+    third = journal(tmp_path)
+    third.compact(background=False)
+    assert sorted(third.load()) == ["A", "B", "C"]
+    assert [record["seq"] for record in read_records(str(tmp_path / "countries.journal"))] == []
@@ -0,0 +1,40 @@
+from CountryJournal import apply_record
+from CustomCountries import CustomCountriesMaker
+from Diplomacy import Diplomacy
+
+def test_remove_country_clears_both_sides():
+    diplomacy = Diplomacy()
+    diplomacy.add_country("A", allies=["B", "C"], enemies=["D"])
+    diplomacy.remove_country("A")
+    assert diplomacy.alliances.neighbours("B") == []
+    assert diplomacy.rivalries.neighbours("D") == []
+    assert diplomacy.coalition("B") == ["B"]
+
+def test_deleted_country_leaves_no_relations_behind():
+    maker = CustomCountriesMaker()
+    for name in ("A", "B", "C"):
+        maker.add_country(name, "Capital", 1000, 10.0, 10, {})
+    maker.countries["A"].add_ally("B")
+    maker.countries["A"].add_enemy("C")
+    maker.remove_country("A")
+    assert maker.countries["B"].allies == []
+    assert maker.countries["C"].enemies == []
+
+    reborn = maker.add_country("A", "Capital", 1000, 10.0, 10, {})
+    assert reborn.allies == [] and reborn.enemies == []
+    assert maker.relations.relation("A", "B") is None
+
+def test_journal_delete_drops_relations():
+    countries = {"A": {"allies": ["B"], "enemies": []}, "B": {"allies": ["A"], "enemies": ["A"]}}
+    apply_record(countries, {"seq": 1, "op": "delete", "name": "A"})
+    assert countries == {"B": {"allies": [], "enemies": []}}
+
+def test_relations_survive_growing_past_small_degree():
+    diplomacy = Diplomacy()
+    others = [f"C{i}" for i in range(20)]
+    diplomacy.add_country("A", allies=others)
+    assert diplomacy.alliances.neighbours("A") == others
+    for other in others[5:]:
+        diplomacy.alliances.remove("A", other)
+    assert diplomacy.alliances.neighbours("A") == others[:5]
+    assert diplomacy.alliances.related("C0", "A") and not diplomacy.alliances.related("C10", "A")
@@ -0,0 +1,34 @@
+from Commands import EndTurn, SetAttribute
+from CustomCountries import CustomCountriesMaker
+
+def ranked(maker: CustomCountriesMaker, field: str):
+    values = sorted(((getattr(country, field), name) for name, country in maker.countries.items()),
+                    key=lambda pair: (-pair[0], pair[1]))
+    return [(name, value) for value, name in values]
+
+def test_rankings_follow_the_end_of_turn():
+    maker = CustomCountriesMaker()
+    for index in range(40):
+        maker.add_country(f"C{index}", "Capital", 1000 + 37 * index % 101, float(index % 7), 10, {})
+    assert maker.rankings.top("gdp", 3)
+    index = maker.rankings.index("gdp")
+    for turn in range(3):
+        maker.commands.execute_batch([SetAttribute("C3", "gdp", 50 + turn), EndTurn()])
+        assert maker.rankings.index("gdp") is index
+        assert maker.rankings.top("gdp", 40) == ranked(maker, "gdp")
+        assert maker.rankings.top("population", 40) == ranked(maker, "population")
+    maker.economy.columns["gdp"][5] = 1e9
+    maker.rankings.refresh("gdp")
+    assert maker.rankings.rank("gdp", "C5") == 1
+
+def test_world_rankings_do_not_load_countries(tmp_path):
+    maker = CustomCountriesMaker()
+    for index in range(100):
+        maker.add_country(f"C{index}", "Capital", 1000 + index, float(index), 10, {})
+    path = str(tmp_path / "countries.world")
+    maker.save_world(path)
+    maker.load_world(path)
+    assert maker.rankings.top("population", 2) == [("C99", 1099), ("C98", 1098)]
+    maker.advance_year()
+    assert maker.rankings.rank("gdp", "C0") == 100
+    assert not maker.countries._loaded
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from RebellionSweep import sweep
+from Rebellions import Country, simulate_country
+from sampling import assert_same_mean
+
+DAYS = 365
+RUNS = 600
+
+def daily_runs():
+    started, succeeded, crushed, stability = [], [], [], []
+    for run in range(RUNS):
+        country = Country("Test", stability=70, military_strength=80)
+        events = simulate_country(country, DAYS, random.Random(run))
+        started.append(sum(event.startswith("A new") for event in events))
+        succeeded.append(sum(event.endswith("overthrown.") for event in events))
+        crushed.append(sum(event.endswith("crushed.") for event in events))
+        stability.append(country.stability)
+    return started, succeeded, crushed, stability
+
+def test_sweep_matches_the_daily_loop():
+    result = sweep({"base_chance": [0.01]}, days=DAYS, runs=RUNS, seed=5)
+    for swept, daily in zip((result.started, result.succeeded, result.crushed, result.final_stability),
+                            daily_runs()):
+        assert_same_mean(swept[0].tolist(), daily)
+
+def test_zero_resolution_chance_never_resolves():
+    result = sweep({"resolution_chance": [0.0, 0.1]}, days=200, runs=50, seed=2)
+    assert result.started[0].sum() > 0
+    assert result.succeeded[0].sum() == 0 and result.crushed[0].sum() == 0
+    assert (result.final_stability[0] == 70).all()
+    assert result.crushed[1].sum() > 0
+    with pytest.raises(ValueError):
+        sweep({"resolution_chance": [1.5]}, days=10, runs=2)
@@ -0,0 +1,39 @@
+import random
+
+from RebellionWorld import RebellionWorld
+from Rebellions import Country
+
+def world_countries():
+    rng = random.Random(3)
+    return [Country(f"Country {i}", rng.randint(30, 90), rng.randint(40, 100)) for i in range(60)]
+
+def state(world: RebellionWorld):
+    return [(country.name, country.stability, len(country.active_rebellions)) for country in world.countries()]
+
+def run(processes: bool, sync_interval: int, split: bool = False):
+    world = RebellionWorld(world_countries(), shards=3, seed=11, processes=processes)
+    if split:  # Stopping and restarting the workers midway
+        events = world.run(100, sync_interval)
+        world.close()
+        events += world.run(100, sync_interval)
+    else:
+        events = world.run(200, sync_interval)
+    world.close()
+    return events, world.stability, world.active_rebellions, state(world)
+
+def test_results_do_not_depend_on_processes_or_sync_interval():
+    expected = run(processes=False, sync_interval=30)
+    assert expected[0]
+    assert run(processes=True, sync_interval=30) == expected
+    assert run(processes=False, sync_interval=7) == expected
+    assert run(processes=True, sync_interval=1, split=True) == expected
+
+def test_workers_start_with_the_first_run_and_stop_on_close():
+    world = RebellionWorld(world_countries(), shards=2, seed=1)
+    assert not world._workers
+    world.run(10)
+    workers = list(world._workers)
+    assert len(workers) == 2 and all(worker.is_alive() for worker in workers)
+    world.close()
+    world.close()
+    assert not any(worker.is_alive() for worker in workers)
@@ -0,0 +1,33 @@
+import random
+
+import numpy as np
+
+from RebellionLog import CRUSHED, RESOLVED, STARTED, SUCCEEDED, RebellionLog
+from Rebellions import Country, daily_rebellion_chance, rebellion_chance, simulate_country
+from sampling import assert_same_mean
+
+def test_batch_and_scalar_rebellion_chances_agree():
+    stabilities = [0, 25, 50, 70, 100]
+    batch = daily_rebellion_chance(np.array(stabilities, dtype=float))
+    scalar = [rebellion_chance(Country("Test", stability, 50)) for stability in stabilities]
+    assert batch.tolist() == scalar
+
+def outcomes(event_driven: bool, runs: int = 3000, days: int = 365):
+    started, succeeded, crushed, stability, rebellion_days = [], [], [], [], []
+    for run in range(runs):
+        country = Country("Test", stability=60, military_strength=70)
+        log = RebellionLog()
+        simulate_country(country, days, random.Random(run), log=log, event_driven=event_driven)
+        start_days = [log.day[row] for row in log.select(kind=STARTED)]
+        resolution_days = [log.day[row] for row in log.select(kind=RESOLVED)]
+        started.append(len(start_days))
+        succeeded.append(log.count(outcome=SUCCEEDED))
+        crushed.append(log.count(outcome=CRUSHED))
+        stability.append(country.stability)
+        # Days spent by all rebellions before coming to a head, which depends on the resolution chance
+        rebellion_days.append(sum(resolution_days) - sum(start_days) + days * len(country.active_rebellions))
+    return started, succeeded, crushed, stability, rebellion_days
+
+def test_event_driven_mode_matches_the_daily_loop():
+    for event_driven, daily in zip(outcomes(True), outcomes(False)):
+        assert_same_mean(event_driven, daily)
@@ -0,0 +1,38 @@
+import pytest
+
+from Commands import CreateCountry, SetResource
+from CustomCountries import Country, CustomCountriesMaker
+
+def country_data(resources) -> dict:
+    return {"name": "A", "capital": "Capital", "population": 1000, "gdp": 10.0, "military_strength": 10,
+            "resources": resources, "allies": [], "enemies": [], "technology_level": 1, "happiness": 50.0}
+
+def test_resource_amounts_are_whole_numbers():
+    maker = CustomCountriesMaker()
+    maker.add_country("A", "Capital", 1000, 10.0, 10, {"Oil": 3})
+    country = maker.countries["A"]
+    country.resources["Iron"] = 4.0
+    assert country.resources.copy() == {"Oil": 3, "Iron": 4}
+    assert country.resources.total() == 7
+    for amount in (2.5, "lots", float("nan"), float("inf")):
+        with pytest.raises(ValueError, match="whole numbers"):
+            country.resources["Gold"] = amount
+    with pytest.raises(ValueError, match="whole numbers"):
+        maker.add_country("B", "Capital", 1000, 10.0, 10, {"Oil": 2.5})
+    assert "B" not in maker.countries
+
+def test_from_dict_keeps_whole_float_amounts_and_rejects_fractions():
+    assert Country.from_dict(country_data({"Oil": 2.0, "Iron": 7})).resources.copy() == {"Oil": 2, "Iron": 7}
+    with pytest.raises(ValueError, match="whole numbers"):
+        Country.from_dict(country_data({"Oil": 2.5}))
+
+def test_bad_resource_amounts_are_rejected_by_commands():
+    maker = CustomCountriesMaker()
+    result = maker.commands.execute_batch([CreateCountry("A", "Capital", 1000, 10.0, 10, {"Oil": None}),
+                                           CreateCountry("B", "Capital", 1000, 10.0, 10),
+                                           SetResource("B", "Oil", "many"), SetResource("B", "Oil", 1.5),
+                                           SetResource("B", "Oil", 2.0)])
+    assert result.applied == 2
+    assert [position for position, _ in result.errors] == [0, 2, 3]
+    assert "A" not in maker.countries
+    assert maker.countries["B"].resources.copy() == {"Oil": 2}
@@ -0,0 +1,11 @@
+from RevoltEnsemble import run_revolt_ensemble
+
+def test_worker_count_does_not_change_the_aggregates():
+    single = run_revolt_ensemble("Test", 1000000, 0.7, 365, runs=24, seed=2024, workers=1)
+    pooled = run_revolt_ensemble("Test", 1000000, 0.7, 365, runs=24, seed=2024, workers=3)
+    assert pooled.first_revolution_days == single.first_revolution_days
+    assert pooled.government_counts == single.government_counts
+    assert pooled.final_stabilities.tolist() == single.final_stabilities.tolist()
+    assert pooled.revolution_probability() == single.revolution_probability()
+    assert pooled.time_to_first_revolution() == single.time_to_first_revolution()
+    assert pooled.stability_percentiles() == single.stability_percentiles()
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from Revolts import (GROUP_FORMED, REVOLT, REVOLUTION, SUPPRESSION, Country, RevolutionaryGroup, ideologies,
+                     initialize_revolt_system, iter_revolt_events)
+from sampling import assert_same_mean
+
+def group(strength: float) -> RevolutionaryGroup:
+    return RevolutionaryGroup(None, ideologies[0], strength, members=100, founded_day=0)
+
+def test_revolutionary_groups_mutations_reach_the_store():
+    country = Country("Test", 1000, 0.5)
+    weak, strong = group(0.2), group(0.6)
+    country.revolutionary_groups.append(weak)
+    country.revolutionary_groups.append(strong)
+    assert country.revolutionary_groups == [weak, strong]
+    assert country.strongest_group() is strong
+    assert country.calculate_revolt_risk() == pytest.approx(0.4)
+
+    country.revolutionary_groups.remove(strong)
+    assert len(country.revolutionary_groups) == 1
+    assert strong not in country.revolutionary_groups
+    assert country.strongest_group() is weak
+    with pytest.raises(AttributeError):
+        country.revolutionary_groups.insert(0, strong)
+
+def outcomes(fast_forward: bool, runs: int = 2000, days: int = 365):
+    kinds = (GROUP_FORMED, REVOLT, REVOLUTION, SUPPRESSION)
+    counts = {kind: [] for kind in kinds}
+    stability, groups, strength = [], [], []
+    for run in range(runs):
+        rng = random.Random(run)
+        country = Country("Test", 1000000, 0.7)
+        initialize_revolt_system(country, rng)
+        events = [event.kind for event in iter_revolt_events(country, days, rng, fast_forward)]
+        for kind in kinds:
+            counts[kind].append(events.count(kind))
+        stability.append(country.stability)
+        groups.append(len(country.groups))
+        strength.append(country.groups.total_strength)
+    return [*counts.values(), stability, groups, strength]
+
+def test_fast_forward_matches_the_daily_loop():
+    for fast_forward, daily in zip(outcomes(True), outcomes(False)):
+        assert_same_mean(fast_forward, daily)
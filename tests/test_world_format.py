@@ -0,0 +1,20 @@
+from CustomCountries import CustomCountriesMaker
+from WorldFormat import WorldFile
+
+def test_world_lookups_resolve_each_name_once(tmp_path, monkeypatch):
+    maker = CustomCountriesMaker()
+    for index in range(50):
+        maker.add_country(f"C{index}", "Capital", 1000 + index, 1.0, 10, {})
+    path = str(tmp_path / "countries.world")
+    maker.save_world(path)
+
+    searches = []
+    search = WorldFile._search
+    monkeypatch.setattr(WorldFile, "_search", lambda world, name: searches.append(name) or search(world, name))
+    maker.load_world(path)
+    for _ in range(3):
+        assert "C7" in maker.countries
+        assert "Atlantis" not in maker.countries
+    assert maker.countries["C7"].population == 1007
+    assert maker.countries.world.find("C49") == 49
+    assert sorted(searches) == ["Atlantis", "C49", "C7"]